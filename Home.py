@@ -1,6 +1,7 @@
 import streamlit as st
 from datetime import datetime
-from utils import leitor_de_texto, get_anon_user_id, log_acesso_google, log_interacao_google, safe_log_interacao
+from utils import leitor_de_texto, get_anon_user_id, log_acesso_google, log_interacao_google, safe_log_interacao, estado_quiz
+from quiz import CERTA
 
 # Registra o acesso
 #log_acesso_google(nome_usuario, pagina_atual, f"acessou_{pagina_atual}") 
@@ -17,12 +18,6 @@ nome_usuario = get_anon_user_id()
 pagina_atual = "Página de Abertura"
 
 
-if "quiz_choice" not in st.session_state:
-    st.session_state.quiz_choice = None
-    
-if "quiz_done" not in st.session_state:
-    st.session_state.quiz_done = False
-
 if 'home_acessada' not in st.session_state:
     log_acesso_google(nome_usuario, pagina_atual, f"acessou_{pagina_atual}")
     st.session_state.home_acessada = True
@@ -113,24 +108,20 @@ videos = {
 for nome, link in videos.items():
     if st.button(f"▶️ Assistir: {nome}", key=f"btn_{nome}"):
         st.video(link)
-        safe_log_interacao(nome_usuario, pagina_atual, f"assistiu_video_{nome}")
+        safe_log_interacao(nome_usuario, pagina_atual, "assistiu_video", video=nome)
 
 # === QUIZ RÁPIDO (para engajar desde o início) ===
 st.markdown("#### 🤔 Você entende de custos?")
 
 with st.expander("🎯 Teste rápido", expanded=False):
     
-    # --- questão (estrutura solicitada) ---
-    q = [{   "question": "Se uma empresa vende mais, mas lucra menos, o problema provavelmente é:",
-            "options": [ "A) Falta de marketing", "B) Preço baixo demais", "C) Custo mal calculado ou mal alocado",
-                "D) Crise econômica"],
-            "answer": 2,  # índice correto
-            "explanation": "O núcleo da Gestão de Custos está em entender e alocar corretamente os custos."
-            }]
+    # --- questão (banco de questões: "home") ---
+    quiz, estado = estado_quiz("home")
+    q = quiz.questoes[0]
                     
     # --- formulário simples ---
     with st.form("quiz_form"):
-        choices = ["-- Selecione --"] + q[0]["options"]
+        choices = ["-- Selecione --", *q.opcoes]
         escolha = st.radio( "Escolha uma opção:", choices, index=None, key="quiz_0")
         enviar = st.form_submit_button("✅ Verificar resposta")
     
@@ -139,17 +130,15 @@ with st.expander("🎯 Teste rápido", expanded=False):
             st.warning("⚠️ Por favor, selecione uma opção antes de verificar!")
             safe_log_interacao(nome_usuario, pagina_atual, "quiz_sem_resposta")
         else:
-            idx = q[0]["options"].index(escolha)
-            quiz_choice = idx
-            quiz_done = True
+            quiz.responder(estado, 0, q.opcoes.index(escolha))
     
-            if idx == q[0]["answer"]:
-                st.success("🔥 Acertou! " + q[0].get("explanation", ""))
+            if quiz.corrigir(estado)[0] == CERTA:
+                st.success("🔥 Acertou! " + q.explicacao)
                 st.balloons()
                 safe_log_interacao(nome_usuario, pagina_atual, "quiz_acertou")
             else:
-                st.warning(f"💡 Quase! Resposta correta: {q[0]['options'][q[0]['answer']]}.")
-                st.info(q[0].get("explanation", ""))
+                st.warning(f"💡 Quase! Resposta correta: {q.texto_resposta}.")
+                st.info(q.explicacao)
                 safe_log_interacao(nome_usuario, pagina_atual, "quiz_errou")
 
 st.markdown("""💡✨Entender custos pode transformar sua forma de ver qualquer negócio. 🚀
@@ -174,8 +163,8 @@ caminho = st.radio(
 
 if st.button("➡️ Iniciar minha jornada", key="btn_inicio"):
     if caminho is not None:
-        safe_log_interacao(nome_usuario, pagina_atual, 
-            f"escolheu_caminho_{caminho.split('–')[0].strip()}")
+        safe_log_interacao(nome_usuario, pagina_atual, "escolheu_caminho",
+                           caminho=caminho.split('–')[0].strip())
         st.session_state['caminho_escolhido'] = caminho
         st.switch_page("pages/1_🏠_Inicio.py")
     else:
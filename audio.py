@@ -0,0 +1,790 @@
+"""Cache do áudio de narração (texto para fala).
+
+O áudio é endereçado pelo conteúdo: a chave é o hash de (idioma, texto).
+Os áudios (MP3, ou WAV do espeak) ficam em disco, sobrevivendo a
+reinícios e sendo compartilhados por todas as sessões, com um LRU em
+memória na frente. O espaço em disco é limitado; ao ultrapassá-lo, os
+arquivos usados há mais tempo são removidos primeiro.
+
+As narrações fixas das páginas podem ser geradas antes do deploy em um
+pacote de áudio (pasta com manifesto), consultado antes de tudo:
+
+    python audio.py                # gera o que falta e remove o obsoleto
+    python audio.py --verificar    # só confere; sai com erro se desatualizado
+"""
+import argparse
+import ast
+import glob
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import wave
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from io import BytesIO
+
+from planilha import Disjuntor
+
+logger = logging.getLogger(__name__)
+
+PASTA_CACHE_AUDIO = os.environ.get("GESTAO_AUDIO_CACHE", os.path.join("cache", "audio"))
+LIMITE_DISCO_MB = float(os.environ.get("GESTAO_AUDIO_CACHE_MB", "200"))
+LIMITE_MEMORIA_MB = float(os.environ.get("GESTAO_AUDIO_MEMORIA_MB", "32"))
+PASTA_PACOTE_AUDIO = os.environ.get("GESTAO_AUDIO_PACOTE", os.path.join("static", "audio"))
+PAGINAS = ["Home.py", os.path.join("pages", "*.py")]
+# Textos maiores que isto são narrados por trechos (frases agrupadas)
+TAMANHO_TRECHO = int(os.environ.get("GESTAO_AUDIO_TRECHO", "280"))
+# Sínteses simultâneas feitas em segundo plano durante o uso do app
+TRABALHADORES_AUDIO = int(os.environ.get("GESTAO_AUDIO_TRABALHADORES", "4"))
+# Motores de voz em ordem de preferência; os seguintes são reserva do primeiro
+BACKENDS_TTS = os.environ.get("GESTAO_TTS", "gtts,espeak")
+TIMEOUT_TTS = float(os.environ.get("GESTAO_TTS_TIMEOUT", "8"))
+
+
+def chave_audio(texto, lang="pt-br"):
+    """Identificador do áudio de um texto: SHA-256 de (idioma, texto)."""
+    return hashlib.sha256(f"{lang}\0{texto}".encode("utf-8")).hexdigest()
+
+
+class BackendTTS:
+    """Motor de texto para fala: ``sintetizar(texto, lang)`` devolve os bytes do áudio."""
+
+    nome = None
+
+    def disponivel(self):
+        return True
+
+    def sintetizar(self, texto, lang="pt-br"):
+        raise NotImplementedError
+
+
+class GttsBackend(BackendTTS):
+    """Voz do Google Tradutor via gTTS (MP3; requer acesso à rede)."""
+
+    nome = "gtts"
+
+    def __init__(self, timeout=TIMEOUT_TTS):
+        self.timeout = timeout
+
+    def sintetizar(self, texto, lang="pt-br"):
+        import gtts
+        buffer = BytesIO()
+        gtts.gTTS(texto, lang=lang, timeout=self.timeout).write_to_fp(buffer)
+        return buffer.getvalue()
+
+
+class EspeakBackend(BackendTTS):
+    """Motor local espeak-ng, sem rede.
+
+    Gera WAV e o converte para MP3 quando há ``lame`` ou ``ffmpeg`` no
+    sistema; sem codificador, o áudio fica em WAV.
+    """
+
+    nome = "espeak"
+
+    def __init__(self, executavel=None, velocidade=165, timeout=60):
+        self.executavel = executavel or shutil.which("espeak-ng") or shutil.which("espeak")
+        self.codificador = shutil.which("lame") or shutil.which("ffmpeg")
+        self.velocidade = velocidade
+        self.timeout = timeout
+
+    def disponivel(self):
+        return self.executavel is not None
+
+    def sintetizar(self, texto, lang="pt-br"):
+        if not self.executavel:
+            raise RuntimeError("espeak-ng não encontrado no PATH")
+        wav = subprocess.run(
+            [self.executavel, "-v", lang.lower(), "-s", str(self.velocidade), "--stdout", "--stdin"],
+            input=texto.encode("utf-8"), capture_output=True, check=True, timeout=self.timeout).stdout
+        return self._para_mp3(wav)
+
+    def _para_mp3(self, wav):
+        if not self.codificador:
+            return wav
+        if os.path.basename(self.codificador).startswith("lame"):
+            comando = [self.codificador, "--quiet", "-V", "6", "-", "-"]
+        else:
+            comando = [self.codificador, "-loglevel", "error", "-i", "pipe:0",
+                       "-f", "mp3", "-q:a", "6", "pipe:1"]
+        try:
+            return subprocess.run(comando, input=wav, capture_output=True, check=True,
+                                  timeout=self.timeout).stdout
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.warning("Falha ao converter o áudio do espeak para MP3: %s", e)
+            return wav
+
+
+class AudioReserva(bytes):
+    """Áudio gerado por um backend de reserva: não é gravado em disco, para que
+    a voz principal o substitua quando voltar."""
+
+
+class CadeiaTTS(BackendTTS):
+    """Tenta os backends em ordem e cai para o seguinte em caso de erro ou timeout.
+
+    Um backend que falha é evitado por um tempo crescente (Disjuntor),
+    para que as narrações seguintes não esperem outro timeout.
+    """
+
+    def __init__(self, backends, espera_inicial=30, espera_maxima=600):
+        self.backends = []
+        for backend in backends:
+            if backend.disponivel():
+                self.backends.append(backend)
+            else:
+                logger.info("Backend de voz %s indisponível neste servidor", backend.nome)
+        self.nome = "+".join(b.nome for b in self.backends)
+        self.disjuntores = {b.nome: Disjuntor(falhas_para_abrir=1, espera_inicial=espera_inicial,
+                                              espera_maxima=espera_maxima)
+                            for b in self.backends}
+        self._lock = threading.Lock()
+        self.estatisticas = {b.nome: {"sinteses": 0, "falhas": 0, "segundos": 0.0}
+                             for b in self.backends}
+
+    def disponivel(self):
+        return bool(self.backends)
+
+    def sintetizar(self, texto, lang="pt-br"):
+        erros = []
+        for i, backend in enumerate(self.backends):
+            ultimo = i == len(self.backends) - 1
+            disjuntor = self.disjuntores[backend.nome]
+            if not disjuntor.permitir() and not ultimo:
+                continue
+            inicio = time.perf_counter()
+            try:
+                dados = backend.sintetizar(texto, lang)
+            except Exception as e:
+                disjuntor.registrar_falha()
+                with self._lock:
+                    self.estatisticas[backend.nome]["falhas"] += 1
+                erros.append(f"{backend.nome}: {e}")
+                logger.warning("Backend de voz %s falhou: %s", backend.nome, e)
+                continue
+            disjuntor.registrar_sucesso()
+            with self._lock:
+                self.estatisticas[backend.nome]["sinteses"] += 1
+                self.estatisticas[backend.nome]["segundos"] += time.perf_counter() - inicio
+            return dados if i == 0 else AudioReserva(dados)
+        raise RuntimeError("Nenhum backend de voz conseguiu gerar o áudio: " + "; ".join(erros))
+
+    def situacao(self):
+        with self._lock:
+            estatisticas = {nome: dict(valores) for nome, valores in self.estatisticas.items()}
+        return {nome: dict(estatisticas[nome], disjuntor=self.disjuntores[nome].situacao()["estado"])
+                for nome in estatisticas}
+
+
+TIPOS_BACKEND = {
+    "gtts": GttsBackend,
+    "espeak": EspeakBackend,
+}
+
+
+def criar_backend_tts(config=BACKENDS_TTS):
+    """Cria o motor de voz a partir de uma lista de nomes, ex.: "gtts,espeak"."""
+    nomes = [nome.strip().lower() for nome in config.split(",") if nome.strip()]
+    desconhecidos = [nome for nome in nomes if nome not in TIPOS_BACKEND]
+    if desconhecidos:
+        raise ValueError(f"Backend de voz desconhecido: {', '.join(desconhecidos)}")
+    return CadeiaTTS([TIPOS_BACKEND[nome]() for nome in nomes])
+
+
+def tipo_audio(dados):
+    """Tipo MIME do áudio (MP3 ou WAV) pelo cabeçalho dos bytes."""
+    return "audio/wav" if dados[:4] == b"RIFF" else "audio/mpeg"
+
+
+def extensao_audio(dados):
+    """Extensão de arquivo (".mp3" ou ".wav") que corresponde ao formato real dos bytes."""
+    return ".wav" if tipo_audio(dados) == "audio/wav" else ".mp3"
+
+
+def juntar_audios(partes):
+    """Concatena trechos de áudio do mesmo formato; None se os formatos diferirem."""
+    tipos = {tipo_audio(parte) for parte in partes}
+    if tipos == {"audio/mpeg"}:
+        # MP3 pode ser concatenado quadro a quadro
+        return b"".join(partes)
+    if tipos != {"audio/wav"}:
+        return None
+    saida = BytesIO()
+    with wave.open(saida, "wb") as destino:
+        for i, parte in enumerate(partes):
+            with wave.open(BytesIO(parte)) as origem:
+                if i == 0:
+                    destino.setparams(origem.getparams())
+                destino.writeframes(origem.readframes(origem.getnframes()))
+    return saida.getvalue()
+
+
+def dividir_em_trechos(texto, limite=TAMANHO_TRECHO):
+    """Divide o texto em trechos de até ``limite`` caracteres, sem quebrar frases.
+
+    Frases mais longas que o limite são quebradas em vírgulas ou, em último
+    caso, entre palavras.
+    """
+    texto = " ".join(texto.split())
+    if len(texto) <= limite:
+        return [texto] if texto else []
+    pedacos = []
+    for frase in re.split(r"(?<=[.!?;:])\s+", texto):
+        while len(frase) > limite:
+            corte = frase.rfind(", ", limite // 2, limite)
+            if corte < 0:
+                corte = frase.rfind(" ", 0, limite)
+            corte = corte + 1 if corte > 0 else limite
+            pedacos.append(frase[:corte].strip())
+            frase = frase[corte:].strip()
+        if frase:
+            pedacos.append(frase)
+    trechos = [pedacos[0]]
+    for pedaco in pedacos[1:]:
+        if len(trechos[-1]) + 1 + len(pedaco) <= limite:
+            trechos[-1] += " " + pedaco
+        else:
+            trechos.append(pedaco)
+    return trechos
+
+
+class CacheAudio:
+    """Cache de áudio (MP3 ou WAV) em níveis: LRU em memória, pacote pré-gerado (somente
+    leitura) e pasta em disco com limite de tamanho.
+
+    As faltas podem ser resolvidas em segundo plano (``agendar``) por um
+    pool limitado de threads, sem bloquear a execução da página.
+    """
+
+    def __init__(self, pasta=PASTA_CACHE_AUDIO, limite_disco=LIMITE_DISCO_MB * 2**20,
+                 limite_memoria=LIMITE_MEMORIA_MB * 2**20, sintetizar=None,
+                 pacote=PASTA_PACOTE_AUDIO, trabalhadores=TRABALHADORES_AUDIO):
+        self.pasta = pasta
+        self.trabalhadores = trabalhadores
+        self._executor = None
+        self._em_andamento = {}  # chave -> Future da síntese em curso
+        self.pacote = carregar_pacote(pacote) if pacote else {}
+        self.limite_disco = limite_disco
+        self.limite_memoria = limite_memoria
+        self.backend = None if sintetizar else criar_backend_tts()
+        self.sintetizar = sintetizar or self.backend.sintetizar
+        self._lock = threading.Lock()
+        self._memoria = OrderedDict()  # chave -> bytes, do menos ao mais recente
+        self._bytes_memoria = 0
+        self._disco = OrderedDict()    # chave -> tamanho, do menos ao mais recente
+        self._extensoes = {}           # chave -> extensão do arquivo em disco (.mp3 ou .wav)
+        self._bytes_disco = 0
+        self.estatisticas = {"acertos_memoria": 0, "acertos_pacote": 0, "acertos_disco": 0,
+                             "faltas": 0, "removidos_disco": 0, "segundos_sintese": 0.0,
+                             "agendadas": 0, "coalescidas": 0, "sinteses_reserva": 0}
+        os.makedirs(pasta, exist_ok=True)
+        self._indexar_disco()
+
+    def _caminho(self, chave, extensao):
+        return os.path.join(self.pasta, f"{chave}{extensao}")
+
+    def _indexar_disco(self):
+        arquivos = []
+        for entrada in os.scandir(self.pasta):
+            chave, extensao = os.path.splitext(entrada.name)
+            if entrada.is_file() and extensao in (".mp3", ".wav"):
+                info = entrada.stat()
+                arquivos.append((info.st_mtime, chave, extensao, info.st_size))
+        # A data de modificação marca o último uso (atualizada a cada acerto)
+        for _, chave, extensao, tamanho in sorted(arquivos):
+            self._bytes_disco += tamanho - self._disco.get(chave, 0)
+            self._disco[chave] = tamanho
+            self._disco.move_to_end(chave)
+            self._extensoes[chave] = extensao
+
+    def pronto(self, texto, lang="pt-br"):
+        """MP3 já disponível (memória, pacote ou disco), ou None; nunca sintetiza."""
+        chave = chave_audio(texto, lang)
+        with self._lock:
+            dados = self._memoria.get(chave)
+            if dados is not None:
+                self._memoria.move_to_end(chave)
+                self.estatisticas["acertos_memoria"] += 1
+                return dados
+        dados = self._ler_pacote(chave)
+        if dados is not None:
+            with self._lock:
+                self.estatisticas["acertos_pacote"] += 1
+                self._guardar_memoria(chave, dados)
+            return dados
+        dados = self._ler_disco(chave)
+        if dados is not None:
+            with self._lock:
+                self.estatisticas["acertos_disco"] += 1
+                self._guardar_memoria(chave, dados)
+        return dados
+
+    def obter(self, texto, lang="pt-br"):
+        """Retorna o MP3 do texto, sintetizando-o apenas na primeira vez."""
+        dados = self.pronto(texto, lang)
+        if dados is not None:
+            return dados
+
+        inicio = time.perf_counter()
+        dados = self.sintetizar(texto, lang)
+        reserva = isinstance(dados, AudioReserva)
+        with self._lock:
+            self.estatisticas["faltas"] += 1
+            self.estatisticas["sinteses_reserva"] += reserva
+            self.estatisticas["segundos_sintese"] += time.perf_counter() - inicio
+        self.guardar(texto, lang, dados, persistir=not reserva)
+        return dados
+
+    def agendar(self, texto, lang="pt-br"):
+        """Future com o MP3 do texto, obtido no pool de threads do cache.
+
+        Pedidos simultâneos do mesmo texto compartilham o mesmo Future,
+        então cada texto é sintetizado uma única vez.
+        """
+        chave = chave_audio(texto, lang)
+        with self._lock:
+            futuro = self._em_andamento.get(chave)
+            if futuro is not None:
+                self.estatisticas["coalescidas"] += 1
+                return futuro
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.trabalhadores,
+                                                    thread_name_prefix="tts")
+            futuro = self._executor.submit(self.obter, texto, lang)
+            self._em_andamento[chave] = futuro
+            self.estatisticas["agendadas"] += 1
+        futuro.add_done_callback(lambda _: self._concluir(chave))
+        return futuro
+
+    def _concluir(self, chave):
+        with self._lock:
+            self._em_andamento.pop(chave, None)
+
+    def narracao_pronta(self, texto, lang="pt-br"):
+        """Áudio do texto já disponível, como lista de partes, ou None; nunca sintetiza.
+
+        O texto inteiro é procurado primeiro (pacote ou textos curtos); um
+        texto longo narrado em trechos é montado na hora a partir deles,
+        que ficam no cache uma única vez, sem uma cópia do áudio completo.
+        A lista tem um item, salvo quando os trechos não podem ser juntados
+        (ex.: MP3 da voz principal e WAV do espeak): aí vêm os trechos, para
+        serem tocados em sequência.
+        """
+        dados = self.pronto(texto, lang)
+        if dados is not None:
+            return [dados]
+        trechos = dividir_em_trechos(texto)
+        if len(trechos) <= 1 or not all(self.contem(trecho, lang) for trecho in trechos):
+            return None
+        partes = []
+        for trecho in trechos:
+            parte = self.pronto(trecho, lang)
+            if parte is None:
+                return None
+            partes.append(parte)
+        completo = juntar_audios(partes)
+        return partes if completo is None else [completo]
+
+    def agendar_narracao(self, texto, lang="pt-br"):
+        """Agenda o texto em trechos sintetizados em paralelo.
+
+        Retorna os Futures na ordem do texto, para tocar cada trecho assim
+        que ficar pronto. Concluídos todos, ``narracao_pronta`` passa a
+        devolver o áudio a partir dos trechos em cache.
+        """
+        trechos = dividir_em_trechos(texto)
+        if len(trechos) <= 1:
+            return [self.agendar(texto, lang)]
+        return [self.agendar(trecho, lang) for trecho in trechos]
+
+    def guardar(self, texto, lang, dados, persistir=True):
+        """Coloca no cache um áudio já pronto.
+
+        Com ``persistir=False`` (áudio de reserva), fica apenas na memória.
+        """
+        chave = chave_audio(texto, lang)
+        if persistir:
+            self._gravar_disco(chave, bytes(dados))
+        with self._lock:
+            self._guardar_memoria(chave, dados)
+
+    def contem(self, texto, lang="pt-br"):
+        chave = chave_audio(texto, lang)
+        with self._lock:
+            return chave in self._memoria or chave in self.pacote or chave in self._disco
+
+    def _guardar_memoria(self, chave, dados):
+        if len(dados) > self.limite_memoria:
+            return
+        if chave not in self._memoria:
+            self._memoria[chave] = dados
+            self._bytes_memoria += len(dados)
+        self._memoria.move_to_end(chave)
+        while self._bytes_memoria > self.limite_memoria:
+            _, antigo = self._memoria.popitem(last=False)
+            self._bytes_memoria -= len(antigo)
+
+    def _ler_pacote(self, chave):
+        caminho = self.pacote.get(chave)
+        if caminho is None:
+            return None
+        try:
+            with open(caminho, "rb") as f:
+                return f.read()
+        except OSError as e:
+            logger.warning("Áudio do pacote indisponível (%s): %s", caminho, e)
+            return None
+
+    def _ler_disco(self, chave):
+        with self._lock:
+            if chave not in self._disco:
+                return None
+            self._disco.move_to_end(chave)
+            caminho = self._caminho(chave, self._extensoes[chave])
+        try:
+            with open(caminho, "rb") as f:
+                dados = f.read()
+            os.utime(caminho)
+            return dados
+        except OSError:
+            # Removido por fora (ou por outro processo): volta a ser uma falta
+            with self._lock:
+                self._bytes_disco -= self._disco.pop(chave, 0)
+                self._extensoes.pop(chave, None)
+            return None
+
+    def _gravar_disco(self, chave, dados):
+        extensao = extensao_audio(dados)
+        caminho = self._caminho(chave, extensao)
+        temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temporario, "wb") as f:
+                f.write(dados)
+            os.replace(temporario, caminho)
+        except OSError as e:
+            logger.warning("Não foi possível gravar o áudio em cache (%s): %s", caminho, e)
+            return
+        with self._lock:
+            self._bytes_disco += len(dados) - self._disco.get(chave, 0)
+            self._disco[chave] = len(dados)
+            self._disco.move_to_end(chave)
+            anterior = self._extensoes.get(chave)
+            self._extensoes[chave] = extensao
+            removidos = self._despejar()
+        if anterior not in (None, extensao):
+            # Mesmo texto gravado antes em outro formato (ex.: WAV do espeak)
+            removidos.append((chave, anterior))
+        for antigo, extensao_antiga in removidos:
+            try:
+                os.remove(self._caminho(antigo, extensao_antiga))
+            except OSError:
+                pass
+
+    def _despejar(self):
+        removidos = []
+        while self._bytes_disco > self.limite_disco and len(self._disco) > 1:
+            chave, tamanho = self._disco.popitem(last=False)
+            self._bytes_disco -= tamanho
+            removidos.append((chave, self._extensoes.pop(chave)))
+        self.estatisticas["removidos_disco"] += len(removidos)
+        return removidos
+
+    def situacao(self):
+        """Acertos, faltas e ocupação do cache."""
+        with self._lock:
+            estatisticas = dict(self.estatisticas)
+            consultas = (estatisticas["acertos_memoria"] + estatisticas["acertos_pacote"]
+                         + estatisticas["acertos_disco"] + estatisticas["faltas"])
+            return {"estatisticas": estatisticas,
+                    "taxa_acerto": (consultas - estatisticas["faltas"]) / consultas if consultas else 0.0,
+                    "em_andamento": len(self._em_andamento),
+                    "backends": self.backend.situacao() if self.backend else {},
+                    "itens_pacote": len(self.pacote),
+                    "itens_memoria": len(self._memoria),
+                    "mb_memoria": round(self._bytes_memoria / 2**20, 2),
+                    "itens_disco": len(self._disco),
+                    "mb_disco": round(self._bytes_disco / 2**20, 2)}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def obter_cache_audio():
+    """Retorna o cache de áudio compartilhado pelo processo."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = CacheAudio()
+        return _cache
+
+
+def situacao_audio():
+    """Estatísticas de acerto e ocupação do cache de áudio."""
+    return obter_cache_audio().situacao()
+
+
+# --- Pacote de áudio pré-gerado -------------------------------------------
+
+def carregar_pacote(pasta=PASTA_PACOTE_AUDIO):
+    """Índice chave -> caminho do áudio a partir do manifesto do pacote (vazio se não houver)."""
+    try:
+        with open(os.path.join(pasta, "manifesto.json"), encoding="utf-8") as f:
+            manifesto = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning("Manifesto do pacote de áudio ilegível (%s): %s", pasta, e)
+        return {}
+    return {chave: os.path.join(pasta, item["arquivo"])
+            for chave, item in manifesto.get("itens", {}).items()}
+
+
+def _texto_constante(no):
+    """Valor de uma expressão de texto fixo (literal ou concatenação de literais)."""
+    if isinstance(no, ast.Constant) and isinstance(no.value, str):
+        return no.value
+    if isinstance(no, ast.BinOp) and isinstance(no.op, ast.Add):
+        esquerda, direita = _texto_constante(no.left), _texto_constante(no.right)
+        if esquerda is not None and direita is not None:
+            return esquerda + direita
+    return None
+
+
+class _ExtratorNarracoes(ast.NodeVisitor):
+    """Encontra as chamadas a leitor_de_texto e resolve o texto de cada uma.
+
+    O texto pode ser um literal ou uma variável atribuída com texto fixo
+    antes da chamada, no mesmo escopo (a atribuição mais próxima vale).
+    """
+
+    def __init__(self, origem):
+        self.origem = origem
+        self.escopos = [{}]
+        self.textos = []
+        self.ignorados = []
+
+    def _visitar_escopo(self, no):
+        self.escopos.append({})
+        self.generic_visit(no)
+        self.escopos.pop()
+
+    visit_FunctionDef = visit_AsyncFunctionDef = visit_Lambda = _visitar_escopo
+
+    def visit_Assign(self, no):
+        valor = _texto_constante(no.value)
+        for alvo in no.targets:
+            if isinstance(alvo, ast.Name):
+                self.escopos[-1][alvo.id] = valor
+        self.generic_visit(no)
+
+    def _resolver(self, no):
+        if isinstance(no, ast.Name):
+            for escopo in reversed(self.escopos):
+                if no.id in escopo:
+                    return escopo[no.id]
+            return None
+        return _texto_constante(no)
+
+    def visit_Call(self, no):
+        self.generic_visit(no)
+        funcao = no.func
+        nome = funcao.id if isinstance(funcao, ast.Name) else getattr(funcao, "attr", None)
+        if nome != "leitor_de_texto":
+            return
+        argumentos = {k.arg: k.value for k in no.keywords}
+        texto_no = no.args[0] if no.args else argumentos.get("texto")
+        lang_no = no.args[1] if len(no.args) > 1 else argumentos.get("lang")
+        texto = self._resolver(texto_no) if texto_no is not None else None
+        lang = "pt-br" if lang_no is None else self._resolver(lang_no)
+        local = f"{self.origem}:{no.lineno}"
+        if texto is None or lang is None:
+            self.ignorados.append(local)
+        else:
+            self.textos.append({"texto": texto, "lang": lang, "origem": local})
+
+
+def extrair_narracoes(padroes=PAGINAS):
+    """Textos fixos de narração das páginas: (lista de textos, chamadas com texto dinâmico)."""
+    textos, ignorados = [], []
+    for padrao in padroes:
+        for caminho in sorted(glob.glob(padrao)):
+            with open(caminho, encoding="utf-8") as f:
+                arvore = ast.parse(f.read(), filename=caminho)
+            extrator = _ExtratorNarracoes(caminho)
+            extrator.visit(arvore)
+            textos.extend(extrator.textos)
+            ignorados.extend(extrator.ignorados)
+    return textos, ignorados
+
+
+def _ler_manifesto(pasta):
+    try:
+        with open(os.path.join(pasta, "manifesto.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"versao": 1, "itens": {}}
+
+
+def _arquivo_valido(caminho):
+    """O arquivo existe e a extensão corresponde ao formato real do áudio."""
+    try:
+        with open(caminho, "rb") as f:
+            cabecalho = f.read(4)
+    except OSError:
+        return False
+    return os.path.splitext(caminho)[1] == extensao_audio(cabecalho)
+
+
+def verificar_pacote(narracoes, pasta=PASTA_PACOTE_AUDIO, voz="gtts"):
+    """Compara o pacote com os textos atuais das páginas.
+
+    Retorna as chaves que faltam (texto novo ou alterado), as obsoletas
+    (texto que não existe mais nas páginas) e as de ``reserva``: áudios
+    que não foram gerados pela voz ``voz`` (ou sem registro de origem,
+    de pacotes antigos) e precisam ser gerados de novo.
+    """
+    itens = _ler_manifesto(pasta)["itens"]
+    esperadas = {chave_audio(n["texto"], n["lang"]) for n in narracoes}
+    faltando = sorted(c for c in esperadas
+                      if c not in itens or not _arquivo_valido(os.path.join(pasta, itens[c]["arquivo"])))
+    reserva = sorted(c for c in esperadas.difference(faltando)
+                     if itens[c].get("backend") != voz)
+    obsoletas = sorted(set(itens) - esperadas)
+    return {"faltando": faltando, "reserva": reserva, "obsoletas": obsoletas}
+
+
+def _sintetizar_com_tentativas(sintetizar, texto, lang, tentativas=3):
+    for tentativa in range(tentativas):
+        try:
+            return sintetizar(texto, lang)
+        except Exception:
+            if tentativa == tentativas - 1:
+                raise
+            time.sleep(2 ** tentativa)
+
+
+def construir_pacote(narracoes, pasta=PASTA_PACOTE_AUDIO, backend=None,
+                     trabalhadores=8, podar=True):
+    """Gera em paralelo os áudios que faltam no pacote e atualiza o manifesto.
+
+    Áudios já presentes são reaproveitados; com ``podar``, os obsoletos
+    são removidos do manifesto e da pasta. Só a voz principal de
+    ``backend`` entra no pacote: o áudio de uma voz de reserva
+    (``AudioReserva``) conta como falha e o texto fica para a próxima
+    geração, e os itens gerados antes por outra voz são refeitos.
+    """
+    backend = backend or GttsBackend()
+    voz = backend.backends[0].nome if isinstance(backend, CadeiaTTS) else backend.nome
+    os.makedirs(pasta, exist_ok=True)
+    manifesto = _ler_manifesto(pasta)
+    itens = manifesto["itens"]
+    por_chave = {}
+    for narracao in narracoes:
+        chave = chave_audio(narracao["texto"], narracao["lang"])
+        por_chave.setdefault(chave, dict(narracao, origens=[]))["origens"].append(narracao["origem"])
+    situacao = verificar_pacote(narracoes, pasta, voz)
+    refazer = situacao["faltando"] + situacao["reserva"]
+    relatorio = {"gerados": 0, "reaproveitados": len(por_chave) - len(refazer),
+                 "removidos": 0, "falhas": []}
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=trabalhadores) as executor:
+        tarefas = {executor.submit(_sintetizar_com_tentativas, backend.sintetizar,
+                                   por_chave[chave]["texto"], por_chave[chave]["lang"]): chave
+                   for chave in refazer}
+        for tarefa in as_completed(tarefas):
+            chave = tarefas[tarefa]
+            try:
+                dados = tarefa.result()
+            except Exception as e:
+                relatorio["falhas"].append((chave, str(e)))
+                logger.warning("Falha ao gerar o áudio de %s: %s", por_chave[chave]["origens"], e)
+                continue
+            if isinstance(dados, AudioReserva):
+                relatorio["falhas"].append((chave, "gerado pela voz de reserva"))
+                logger.warning("Áudio de %s gerado pela voz de reserva; fora do pacote",
+                               por_chave[chave]["origens"])
+                continue
+            arquivo = f"{chave}{extensao_audio(dados)}"
+            temporario = os.path.join(pasta, arquivo + ".tmp")
+            with open(temporario, "wb") as f:
+                f.write(dados)
+            os.replace(temporario, os.path.join(pasta, arquivo))
+            anterior = itens.get(chave, {}).get("arquivo")
+            if anterior and anterior != arquivo:
+                # Gerado antes com a extensão errada (ex.: WAV gravado como .mp3)
+                try:
+                    os.remove(os.path.join(pasta, anterior))
+                except OSError:
+                    pass
+            itens[chave] = {"arquivo": arquivo, "bytes": len(dados), "backend": voz}
+            relatorio["gerados"] += 1
+    relatorio["segundos"] = round(time.perf_counter() - inicio, 2)
+
+    for chave, narracao in por_chave.items():
+        if chave in itens:
+            itens[chave].update(lang=narracao["lang"], texto=narracao["texto"][:80],
+                                origens=narracao["origens"])
+    if podar:
+        for chave in situacao["obsoletas"]:
+            item = itens.pop(chave)
+            try:
+                os.remove(os.path.join(pasta, item["arquivo"]))
+            except OSError:
+                pass
+            relatorio["removidos"] += 1
+    manifesto["gerado_em"] = datetime.now().isoformat(timespec="seconds")
+    temporario = os.path.join(pasta, "manifesto.json.tmp")
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(manifesto, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(temporario, os.path.join(pasta, "manifesto.json"))
+    return relatorio
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera o pacote de áudio das narrações das páginas.")
+    parser.add_argument("--pacote", default=PASTA_PACOTE_AUDIO, help="pasta do pacote de áudio")
+    parser.add_argument("--paginas", nargs="+", default=PAGINAS, help="arquivos ou padrões glob")
+    parser.add_argument("--trabalhadores", type=int, default=8, help="sínteses simultâneas")
+    parser.add_argument("--backend", default="gtts",
+                        help="motores de voz em ordem de preferência, ex.: gtts,espeak; "
+                             "só o áudio do primeiro entra no pacote")
+    parser.add_argument("--verificar", action="store_true",
+                        help="apenas confere o pacote; código de saída 1 se estiver desatualizado")
+    parser.add_argument("--manter-obsoletos", action="store_true")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    narracoes, ignorados = extrair_narracoes(args.paginas)
+    for local in ignorados:
+        print(f"aviso: texto dinâmico em {local}; será gerado sob demanda")
+    print(f"{len(narracoes)} narração(ões) fixa(s) encontrada(s)")
+    if args.verificar:
+        voz = args.backend.split(",")[0].strip().lower()
+        situacao = verificar_pacote(narracoes, args.pacote, voz)
+        for rotulo, chaves in (("faltando", situacao["faltando"]), ("reserva", situacao["reserva"])):
+            for chave in chaves:
+                origens = [n["origem"] for n in narracoes if chave_audio(n["texto"], n["lang"]) == chave]
+                print(f"{rotulo:<9} {chave[:12]}  {', '.join(origens)}")
+        for chave in situacao["obsoletas"]:
+            print(f"obsoleto  {chave[:12]}")
+        return 1 if any(situacao.values()) else 0
+    relatorio = construir_pacote(narracoes, args.pacote, backend=criar_backend_tts(args.backend),
+                                 trabalhadores=args.trabalhadores, podar=not args.manter_obsoletos)
+    print(f"gerados: {relatorio['gerados']} | reaproveitados: {relatorio['reaproveitados']} | "
+          f"removidos: {relatorio['removidos']} | falhas: {len(relatorio['falhas'])} | "
+          f"{relatorio['segundos']} s")
+    return 1 if relatorio["falhas"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""Compara o armazenamento dos eventos em CSV e em Parquet.
+
+Uso (a partir da raiz do projeto):
+
+    python benchmarks/bench_armazenamento.py [--eventos 200000]
+
+Gera eventos sintéticos com a distribuição típica do app (poucas
+páginas e ações, muitos usuários em sessões curtas), grava-os com o
+CsvSink e com o ParquetSink e mede o tamanho em disco e o tempo de
+uma consulta analítica comum: contagem de interações por página e
+ação. O pyarrow é importado antes da medição e cada consulta vale o
+melhor de ``--repeticoes`` execuções, para que a importação e o cache
+frio do sistema de arquivos não entrem na comparação.
+"""
+import argparse
+import collections
+import csv
+import glob
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import registro  # noqa: E402
+
+try:
+    import pyarrow.dataset as ds
+except ImportError:
+    sys.exit("Este benchmark requer o pacote pyarrow (pip install pyarrow)")
+
+PAGINAS = ["Página de Abertura", "Início", "Introdução a Custos", "Custeio por Absorção I",
+           "Custeio por Absorção II", "Simulado", "Custeio Variável"]
+ACOES = ["viu_objetivos_introducao", "viu_intro_contexto", "viu_intro_terminologia",
+         "viu_tipos_gastos_introducao", "viu_classificacao_introducao", "fez_quiz_introducao",
+         "clicou_unidade", "assistiu_video", "quiz_acertou", "quiz_errou"]
+
+
+def gerar_eventos(n, semente=42, sessoes_simultaneas=8):
+    """Eventos em sessões: cada usuário navega por algumas dezenas de ações
+    enquanto outros poucos usuários estão ativos ao mesmo tempo."""
+    aleatorio = random.Random(semente)
+    ts = registro.agora_us()
+
+    def nova_sessao():
+        return [f"anon_{aleatorio.getrandbits(32):08x}", aleatorio.randint(5, 80)]
+
+    ativas = [nova_sessao() for _ in range(sessoes_simultaneas)]
+    for _ in range(n):
+        i = aleatorio.randrange(len(ativas))
+        usuario, restantes = ativas[i]
+        ativas[i][1] -= 1
+        if restantes <= 1:
+            ativas[i] = nova_sessao()
+        ts += aleatorio.randint(10_000, 5_000_000)
+        acao = aleatorio.choice(ACOES)
+        parametros = {"unidade": aleatorio.randint(1, 6)} if acao == "clicou_unidade" else {}
+        yield registro.Evento.criar("interacao", usuario, aleatorio.choice(PAGINAS), acao,
+                                    permanencia=aleatorio.expovariate(1 / 20), ts_us=ts,
+                                    **parametros)
+
+
+def tamanho(arquivos):
+    return sum(os.path.getsize(a) for a in arquivos)
+
+
+def gravar(sink, eventos):
+    inicio = time.perf_counter()
+    for evento in eventos:
+        sink.emitir(evento)
+    sink.fechar()
+    return time.perf_counter() - inicio
+
+
+def consultar_csv(arquivos):
+    contagem = collections.Counter()
+    for arquivo in arquivos:
+        with open(arquivo, newline="", encoding="utf-8") as f:
+            leitor = csv.reader(f)
+            next(leitor)
+            for linha in leitor:
+                contagem[(linha[1], linha[2])] += 1
+    return contagem
+
+
+def consultar_parquet(arquivos):
+    tabela = ds.dataset(arquivos, format="parquet").to_table(columns=["pagina", "acao"])
+    # Cada row group traz seu próprio dicionário
+    tabela = tabela.unify_dictionaries()
+    return tabela.group_by(["pagina", "acao"]).aggregate([([], "count_all")])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--eventos", type=int, default=200_000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        eventos = list(gerar_eventos(args.eventos))
+        manifesto = registro.Manifesto(os.path.join(pasta, "manifesto.json"))
+        pasta_csv = os.path.join(pasta, "csv")
+        pasta_parquet = os.path.join(pasta, "parquet")
+        t_csv = gravar(registro.CsvSink(pasta=pasta_csv, tamanho_buffer=1000, manifesto=manifesto),
+                       eventos)
+        t_parquet = gravar(registro.ParquetSink(pasta=pasta_parquet, manifesto=manifesto), eventos)
+        arquivos_csv = glob.glob(os.path.join(pasta_csv, "*.csv"))
+        arquivos_parquet = glob.glob(os.path.join(pasta_parquet, "**", "*.parquet"), recursive=True)
+
+        resultados = {}
+        for nome, consulta, arquivos in (("csv", consultar_csv, arquivos_csv),
+                                         ("parquet", consultar_parquet, arquivos_parquet)):
+            tempos = []
+            for _ in range(args.repeticoes):
+                inicio = time.perf_counter()
+                consulta(arquivos)
+                tempos.append(time.perf_counter() - inicio)
+            resultados[nome] = min(tempos)
+
+        b_csv, b_parquet = tamanho(arquivos_csv), tamanho(arquivos_parquet)
+        print(f"{args.eventos} eventos")
+        print(f"{'formato':<8} {'disco (KiB)':>12} {'gravar (s)':>11} {'consulta (ms)':>14}")
+        print(f"{'csv':<8} {b_csv / 1024:>12.1f} {t_csv:>11.2f} {resultados['csv'] * 1e3:>14.1f}")
+        print(f"{'parquet':<8} {b_parquet / 1024:>12.1f} {t_parquet:>11.2f} "
+              f"{resultados['parquet'] * 1e3:>14.1f}")
+        print(f"redução em disco: {b_csv / b_parquet:.1f}x | "
+              f"consulta: {resultados['csv'] / resultados['parquet']:.1f}x mais rápida")
+
+
+if __name__ == "__main__":
+    main()
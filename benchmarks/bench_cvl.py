@@ -0,0 +1,110 @@
+"""Gráfico CVL: PNG do Matplotlib x séries numéricas desenhadas pelo navegador.
+
+Uso (a partir da raiz do projeto):
+
+    python benchmarks/bench_cvl.py [--repeticoes 50]
+
+Compara, para valores sorteados de preço e custo fixo, o tempo de
+servidor para construir e serializar o gráfico de ponto de equilíbrio e
+o tamanho do que é enviado ao navegador: o PNG que o ``st.pyplot``
+gerava (200 pontos por série), a especificação Plotly com as mesmas 200
+amostras e a especificação Plotly atual, só com os extremos das retas.
+"""
+import argparse
+import importlib.util
+import io
+import os
+import random
+import statistics
+import sys
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import plotly.graph_objects as go  # noqa: E402
+import plotly.io as pio  # noqa: E402
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import graficos  # noqa: E402
+
+
+def carregar_pagina(arquivo):
+    spec = importlib.util.spec_from_file_location(arquivo, os.path.join(RAIZ, "pages", arquivo))
+    pagina = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(pagina)
+    return pagina
+
+
+def series(preco_pe, cvu_pe, cf_pe):
+    pe_qtde = cf_pe / (preco_pe - cvu_pe)
+    q_range = np.linspace(0, pe_qtde * 2, 200)
+    return pe_qtde, q_range, preco_pe * q_range, cf_pe + cvu_pe * q_range
+
+
+def png_matplotlib(preco_pe, cvu_pe, cf_pe):
+    # Gráfico como era antes, renderizado como o st.pyplot faz
+    pe_qtde, q_range, rt, ct = series(preco_pe, cvu_pe, cf_pe)
+    fig, ax = plt.subplots(figsize=(8, 5))
+    ax.plot(q_range, rt, label="Receita Total", color="green")
+    ax.plot(q_range, ct, label="Custo Total", color="red")
+    ax.plot(q_range, rt - ct, label="Lucro", color="blue", linestyle="--")
+    ax.axvline(x=pe_qtde, color="purple", linestyle=":", label="Ponto de Equilíbrio")
+    ax.axhline(y=0, color="black", linewidth=0.8)
+    ax.set_xlabel("Quantidade")
+    ax.set_ylabel("R$")
+    ax.legend()
+    ax.grid(alpha=0.3)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, **graficos.OPCOES_PNG)
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def plotly_amostrado(preco_pe, cvu_pe, cf_pe):
+    pe_qtde, q_range, rt, ct = series(preco_pe, cvu_pe, cf_pe)
+    fig = go.Figure([go.Scatter(x=q_range, y=rt, mode="lines", name="Receita Total"),
+                     go.Scatter(x=q_range, y=ct, mode="lines", name="Custo Total"),
+                     go.Scatter(x=q_range, y=rt - ct, mode="lines", name="Lucro")])
+    fig.add_vline(x=pe_qtde)
+    return pio.to_json(fig, validate=False).encode("utf-8")
+
+
+def medir(gerar, entradas):
+    tempos, tamanhos = [], []
+    for valores in entradas:
+        inicio = time.perf_counter()
+        dados = gerar(**valores)
+        tempos.append(time.perf_counter() - inicio)
+        tamanhos.append(len(dados))
+    return statistics.median(tempos), statistics.median(tamanhos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticoes", type=int, default=50)
+    args = parser.parse_args()
+
+    variavel = carregar_pagina("4_📈_Custeio_Variavel.py")
+    aleatorio = random.Random(0)
+    entradas = [dict(preco_pe=float(aleatorio.randrange(35, 201)), cvu_pe=30.0,
+                     cf_pe=aleatorio.randrange(1000, 50001, 1000)) for _ in range(args.repeticoes)]
+
+    def plotly_extremos(**valores):
+        return pio.to_json(variavel.figura_cvl(**valores), validate=False).encode("utf-8")
+
+    for gerar in (png_matplotlib, plotly_amostrado, plotly_extremos):
+        gerar(**entradas[0])  # aquece imports e fontes
+    print(f"{'formato':<32} {'servidor':>10} {'enviado':>10}")
+    for rotulo, gerar in [("Matplotlib PNG (antes)", png_matplotlib),
+                          ("Plotly, 200 pontos por série", plotly_amostrado),
+                          ("Plotly, extremos das retas", plotly_extremos)]:
+        tempo, tamanho = medir(gerar, entradas)
+        print(f"{rotulo:<32} {tempo * 1e3:8.1f}ms {tamanho / 1024:8.1f}KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Cache de figuras: construção a cada rerun x figura reaproveitada.
+
+Uso (a partir da raiz do projeto):
+
+    python benchmarks/bench_figuras.py [--reruns 300] [--limite-mb 64]
+
+Simula reruns de várias sessões sobre as figuras das páginas. A maior
+parte dos alunos deixa os controles nos valores padrão ou em poucos
+valores vizinhos, e alguns exploram valores aleatórios. Mede o tempo
+total construindo toda vez e usando ``CacheFiguras``, e mostra a taxa de
+acerto por figura.
+"""
+import argparse
+import importlib.util
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import graficos  # noqa: E402
+
+
+def carregar_pagina(arquivo):
+    spec = importlib.util.spec_from_file_location(arquivo, os.path.join(RAIZ, "pages", arquivo))
+    pagina = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(pagina)
+    return pagina
+
+
+def perto(aleatorio, padrao, passo, faixa):
+    # 60% no padrão, 30% a poucos passos dele, 10% em qualquer ponto da faixa
+    sorteio = aleatorio.random()
+    if sorteio < 0.6:
+        return padrao
+    if sorteio < 0.9:
+        return padrao + passo * aleatorio.randint(-3, 3)
+    return aleatorio.randrange(faixa[0], faixa[1] + 1, passo)
+
+
+def figuras(aleatorio):
+    introducao = carregar_pagina("2_📚_Introducao.py")
+    variavel = carregar_pagina("4_📈_Custeio_Variavel.py")
+    absorcao2 = carregar_pagina("3_📊_Custeio_por_Absorcao_II.py")
+    deptos = pd.DataFrame({"Departamento": ["Montagem", "Acabamento", "Administração"],
+                           "CIF Rateado": [75000.0, 50000.0, 25000.0]})
+    return [
+        ("introducao_comportamento", introducao.figura_comportamento, lambda: dict(
+            custo_fixo=perto(aleatorio, 15000, 1000, (1000, 50000)),
+            custo_variavel_unit=perto(aleatorio, 50, 5, (5, 200)),
+            producao_min=0, producao_max=2000)),
+        ("introducao_sensibilidade", introducao.figura_sensibilidade, lambda: dict(
+            cf=perto(aleatorio, 10000, 500, (1000, 50000)), cv=15, q=perto(aleatorio, 200, 10, (10, 1000)))),
+        ("introducao_composicao", introducao.figura_composicao, lambda: dict(
+            produto=aleatorio.choice(list(introducao.CONTEUDO["dados_produtos"])))),
+        ("variavel_cvl", variavel.figura_cvl, lambda: dict(
+            preco_pe=float(perto(aleatorio, 50, 5, (35, 200))), cvu_pe=30.0,
+            cf_pe=perto(aleatorio, 20000, 1000, (1000, 50000)))),
+        ("absorcao_cif_departamentos", absorcao2.figura_cif_departamentos, lambda: dict(deptos=deptos)),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=300)
+    parser.add_argument("--limite-mb", type=float, default=graficos.LIMITE_FIGURAS_MB)
+    args = parser.parse_args()
+
+    aleatorio = random.Random(0)
+    lista = figuras(aleatorio)
+    carga = [(nome, construir, entradas()) for _ in range(args.reruns) for nome, construir, entradas in lista]
+
+    inicio = time.perf_counter()
+    for _, construir, entradas in carga:
+        graficos.preparar(construir(**entradas))
+    sem_cache = time.perf_counter() - inicio
+
+    cache = graficos.CacheFiguras(limite_bytes=args.limite_mb * 2**20)
+    inicio = time.perf_counter()
+    for nome, construir, entradas in carga:
+        cache.obter(nome, construir, entradas)
+    com_cache = time.perf_counter() - inicio
+
+    situacao = cache.situacao()
+    print(f"{len(carga)} figuras em {args.reruns} reruns")
+    print(f"sem cache: {sem_cache:6.2f} s   com cache: {com_cache:6.2f} s   ({sem_cache / com_cache:.1f}x)")
+    print(f"cache: {situacao['itens']} itens, {situacao['mb']:.2f} MB, taxa de acerto {situacao['taxa_acerto']:.0%}")
+    print(pd.DataFrame.from_dict(situacao["por_figura"], orient="index").to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Rerun da página inteira x rerun só do fragmento de cada simulador.
+
+Uso (a partir da raiz do projeto):
+
+    python benchmarks/bench_fragmentos.py [--repeticoes 10]
+
+Para cada simulador, move um dos seus controles e mede a execução com
+``AppTest``: primeiro a página completa (o que acontecia antes dos
+fragmentos), depois só a função do fragmento, carregada do módulo da
+página (o que o Streamlit reexecuta agora). As abas e expanders
+preguiçosos em volta do simulador são marcados como já abertos, senão
+os controles nem seriam gerados. Logs e sessões vão para uma pasta
+temporária.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPORARIA = tempfile.mkdtemp(prefix="bench_fragmentos_")
+os.environ.setdefault("GESTAO_LOG_SINKS", "csv")
+os.environ.setdefault("GESTAO_LOG_PASTA", os.path.join(TEMPORARIA, "logs"))
+os.environ.setdefault("GESTAO_SESSOES", os.path.join(TEMPORARIA, "sessoes.db"))
+sys.path.insert(0, RAIZ)
+os.chdir(RAIZ)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+# (página, função do fragmento, seções abertas, tipo do controle, rótulo, valores alternados)
+SIMULADORES = [
+    ("2_📚_Introducao.py", "simulador_comportamento", ["intro_abas/2", "intro_classificacao/1"],
+     "slider", "Custo Fixo Mensal (R$)", (20000, 15000)),
+    ("2_📚_Introducao.py", "analise_impacto_custos", ["intro_abas/3"],
+     "slider", "Custos Fixos (R$):", (20000, 10000)),
+    ("3_📊_Custeio_por_Absorcao_I.py", "simulador_custeio", ["abs_simulador"],
+     "number_input", "Compras MP (R$):", (9000, 8000)),
+    ("4_📈_Custeio_Variavel.py", "analise_cvl", ["cv_cvl"],
+     "number_input", "Preço Unitário (R$)", (60.0, 50.0)),
+]
+
+SCRIPT_FRAGMENTO = """
+import importlib.util
+spec = importlib.util.spec_from_file_location("pagina", {caminho!r})
+pagina = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(pagina)
+pagina.{funcao}()
+"""
+
+
+def medir(app, abertas, tipo, rotulo, valores, repeticoes):
+    app.session_state["secoes_abertas"] = set(abertas)
+    app.run(timeout=60)
+    if app.exception:
+        raise RuntimeError(app.exception[0].message)
+    controle = next(w for w in getattr(app, tipo) if w.label == rotulo)
+    tempos = []
+    for i in range(repeticoes):
+        controle.set_value(valores[i % 2])
+        inicio = time.perf_counter()
+        app.run(timeout=60)
+        tempos.append(time.perf_counter() - inicio)
+        if app.exception:
+            raise RuntimeError(app.exception[0].message)
+        controle = next(w for w in getattr(app, tipo) if w.label == rotulo)
+    return statistics.median(tempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticoes", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'simulador':<48} {'página':>10} {'fragmento':>10}")
+    for arquivo, funcao, abertas, tipo, rotulo, valores in SIMULADORES:
+        caminho = os.path.join(RAIZ, "pages", arquivo)
+        pagina = medir(AppTest.from_file(caminho), abertas, tipo, rotulo, valores, args.repeticoes)
+        fragmento = medir(AppTest.from_string(SCRIPT_FRAGMENTO.format(caminho=caminho, funcao=funcao)),
+                          abertas, tipo, rotulo, valores, args.repeticoes)
+        print(f"{arquivo[:-3] + ':' + funcao:<48} {pagina * 1e3:8.1f}ms {fragmento * 1e3:8.1f}ms"
+              f"  ({pagina / fragmento:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Correção em lote de uma turma sintética x correção aluno a aluno.
+
+Uso (a partir da raiz do projeto):
+
+    python benchmarks/bench_quiz.py [--alunos 20000] [--quiz simulado_absorcao]
+
+Gera respostas aleatórias (letras, índices, V/F, valores numéricos e
+questões em branco), grava em CSV e mede leitura, correção vetorizada
+(``corrigir_turma``) e o laço equivalente com ``Quiz.corrigir`` por
+aluno, conferindo que as notas coincidem.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import quiz as motor  # noqa: E402
+
+
+def turma_sintetica(quiz, alunos, semente=0):
+    aleatorio = np.random.default_rng(semente)
+    colunas = {"aluno": [f"anon_{i:06d}" for i in range(alunos)]}
+    for q in quiz.questoes:
+        if q.numerica:
+            acerto = aleatorio.random(alunos) < 0.6
+            valores = np.where(acerto, q.resposta, q.resposta * aleatorio.uniform(0.5, 1.5, alunos)).round(2)
+            coluna = pd.Series(valores).astype(str)
+        else:
+            escolhas = np.where(aleatorio.random(alunos) < 0.65, int(q.resposta),
+                                aleatorio.integers(0, len(q.opcoes), alunos))
+            # Metade em letras, metade em índice, como viria de formulários diferentes
+            letras = np.array([chr(ord("A") + j) for j in range(len(q.opcoes))])[escolhas]
+            coluna = pd.Series(np.where(aleatorio.random(alunos) < 0.5, letras, escolhas.astype(str)))
+        coluna[aleatorio.random(alunos) < 0.05] = ""
+        colunas[q.id] = coluna
+    return pd.DataFrame(colunas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--alunos", type=int, default=20000)
+    parser.add_argument("--quiz", nargs="+", default=["simulado_absorcao"])
+    args = parser.parse_args()
+
+    quiz = motor.obter_banco().quiz(*args.quiz)
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "respostas.csv")
+        turma_sintetica(quiz, args.alunos).to_csv(caminho, index=False)
+        inicio = time.perf_counter()
+        submissoes = motor.ler_submissoes(caminho)
+        leitura = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    resultado = motor.corrigir_turma(quiz, submissoes)
+    lote = time.perf_counter() - inicio
+
+    escolhas, valores, _, _ = motor.matrizes_respostas(quiz, submissoes)
+    inicio = time.perf_counter()
+    quiz.corrigir_lote(escolhas, valores)
+    so_correcao = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    notas_laco = np.empty_like(resultado["notas"])
+    for a in range(len(submissoes)):
+        estado = quiz.novo_estado()
+        for i in range(len(quiz)):
+            resposta = valores[a, i] if quiz.numericas[i] else escolhas[a, i]
+            if resposta >= 0 or (quiz.numericas[i] and not np.isnan(resposta)):
+                quiz.responder(estado, i, resposta)
+        notas_laco[a] = quiz.corrigir(estado)
+    laco = time.perf_counter() - inicio
+
+    print(f"{args.alunos} alunos x {len(quiz)} questões ({quiz.nome})")
+    print(f"leitura do CSV:         {leitura * 1e3:8.1f} ms")
+    print(f"corrigir_turma (lote):  {lote * 1e3:8.1f} ms  (inclui conversão das respostas e resumos)")
+    print(f"só corrigir_lote:       {so_correcao * 1e3:8.1f} ms")
+    print(f"laço por aluno:         {laco * 1e3:8.1f} ms  ({laco / so_correcao:.0f}x o corrigir_lote)")
+    print(f"notas idênticas: {np.array_equal(notas_laco, resultado['notas'])}")
+    print(resultado["por_tema"].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Primeira pintura das páginas longas com seções preguiçosas x tudo gerado.
+
+Uso (a partir da raiz do projeto):
+
+    python benchmarks/bench_secoes.py [--repeticoes 5]
+
+Para cada página, mede a primeira execução de uma sessão nova com
+``AppTest`` (só o que está aberto é gerado) e a mesma execução com todas
+as seções marcadas como já abertas, que equivale ao comportamento
+anterior, em que todo expander e toda aba eram gerados. Também conta os
+elementos enviados ao navegador. Em seguida executa a página com cada
+seção aberta sozinha, que é como o aluno costuma chegar a ela e revela
+seções que dependem de variáveis de outra seção ainda fechada. Logs e
+sessões vão para uma pasta temporária.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPORARIA = tempfile.mkdtemp(prefix="bench_secoes_")
+os.environ.setdefault("GESTAO_LOG_SINKS", "csv")
+os.environ.setdefault("GESTAO_LOG_PASTA", os.path.join(TEMPORARIA, "logs"))
+os.environ.setdefault("GESTAO_SESSOES", os.path.join(TEMPORARIA, "sessoes.db"))
+sys.path.insert(0, RAIZ)
+os.chdir(RAIZ)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+# Página -> chaves das seções preguiçosas (abas como "<chave>/<índice>")
+PAGINAS = {
+    "2_📚_Introducao.py": [f"intro_abas/{i}" for i in range(5)] + ["intro_classificacao/0", "intro_classificacao/1"]
+    + ["intro_quiz_vf", "intro_desafio", "intro_compreensao", "intro_teste", "intro_explicacao",
+       "intro_quiz_parte1", "intro_quiz_parte2"],
+    "3_📊_Custeio_por_Absorcao_I.py": ["abs_simulador", "abs_exemplos"],
+    "3_📊_Custeio_por_Absorcao_II.py": [f"abs2_abas/{i}" for i in range(3)],
+    "4_📈_Custeio_Variavel.py": ["cv_metodo", "cv_margem", "cv_dre", "cv_cvl", "cv_seguranca", "cv_decisao",
+                                "cv_deficiencias", "cv_quiz_intermediario", "cv_quiz_avancado"],
+}
+
+
+def elementos(no):
+    return 1 + sum(elementos(filho) for filho in getattr(no, "children", {}).values())
+
+
+def primeira_execucao(caminho, abertas, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        app = AppTest.from_file(caminho, default_timeout=60)
+        if abertas:
+            app.session_state["secoes_abertas"] = set(abertas)
+        inicio = time.perf_counter()
+        app.run()
+        tempos.append(time.perf_counter() - inicio)
+        if app.exception:
+            raise RuntimeError(f"{os.path.basename(caminho)} com {sorted(abertas)} abertas: "
+                               f"{app.exception[0].message}")
+    return statistics.median(tempos), elementos(app.main)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'página':<34} {'tudo gerado':>20} {'preguiçoso':>20}")
+    for arquivo, secoes in PAGINAS.items():
+        caminho = os.path.join(RAIZ, "pages", arquivo)
+        primeira_execucao(caminho, secoes, 1)  # aquece imports e caches do processo
+        tudo, n_tudo = primeira_execucao(caminho, secoes, args.repeticoes)
+        preguicoso, n_preguicoso = primeira_execucao(caminho, [], args.repeticoes)
+        print(f"{arquivo[:-3]:<34} {tudo * 1e3:7.1f}ms {n_tudo:5d} elem {preguicoso * 1e3:7.1f}ms "
+              f"{n_preguicoso:5d} elem  ({tudo / preguicoso:.1f}x)")
+
+    print(f"\n{'página / seção aberta sozinha':<52} {'tempo':>9}")
+    for arquivo, secoes in PAGINAS.items():
+        caminho = os.path.join(RAIZ, "pages", arquivo)
+        for secao in secoes:
+            tempo, _ = primeira_execucao(caminho, [secao], 1)
+            print(f"{arquivo[:-3] + ' / ' + secao:<52} {tempo * 1e3:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
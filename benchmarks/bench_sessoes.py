@@ -0,0 +1,111 @@
+"""Carga concorrente no armazenamento de sessões.
+
+Uso (a partir da raiz do projeto):
+
+    python benchmarks/bench_sessoes.py [--sessoes 300] [--operacoes 20] [--linhas 20000]
+
+Cada thread simula um aluno que alterna gravações e leituras do próprio
+estado. Ao final, confere que nenhum usuário recebeu o estado de outro
+e mostra latências e vazão. Em seguida compara gravação completa e
+incremental de uma sessão com DataFrames grandes em que só ``dados``
+muda a cada salvamento (bytes gravados e latência por salvamento).
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sessao  # noqa: E402
+
+
+def aluno(armazem, usuario, operacoes, tempos, erros, largada):
+    aleatorio = random.Random(usuario)
+    largada.wait()
+    for i in range(operacoes):
+        estado = {"dados": {"usuario": usuario, "passo": i,
+                            "respostas": [aleatorio.randint(0, 3) for _ in range(40)]}}
+        inicio = time.perf_counter()
+        armazem.salvar(usuario, estado)
+        lido = armazem.carregar(usuario)
+        tempos.append(time.perf_counter() - inicio)
+        if lido["dados"]["usuario"] != usuario or lido["dados"]["passo"] != i:
+            erros.append(usuario)
+
+
+def amplificacao(pasta, linhas, salvamentos=50):
+    import numpy as np
+    import pandas as pd
+
+    aleatorio = np.random.default_rng(0)
+    estado = {
+        "iv_df": pd.DataFrame(aleatorio.random((linhas, 6)), columns=list("abcdef")),
+        "ks_df": pd.DataFrame(aleatorio.random((linhas, 4)), columns=list("wxyz")),
+        "modelo": {"coeficientes": aleatorio.random(200).tolist()},
+        "dados": {"passo": 0, "respostas": []},
+    }
+    resultados = {}
+    for modo in ("salvar", "salvar_incremental"):
+        armazem = sessao.ArmazemSessoes(os.path.join(pasta, f"{modo}.db"))
+        gravar = getattr(armazem, modo)
+        gravar("anon_bench", estado)
+        inicial = armazem.estatisticas["bytes_gravados"]
+        tempos = []
+        for i in range(salvamentos):
+            estado["dados"] = {"passo": i, "respostas": list(range(i % 40))}
+            inicio = time.perf_counter()
+            gravar("anon_bench", estado)
+            tempos.append(time.perf_counter() - inicio)
+        lido = armazem.carregar("anon_bench")
+        assert lido["dados"]["passo"] == salvamentos - 1 and lido["iv_df"].equals(estado["iv_df"])
+        resultados[modo] = ((armazem.estatisticas["bytes_gravados"] - inicial) / salvamentos,
+                            statistics.median(tempos))
+        armazem.fechar()
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessoes", type=int, default=300)
+    parser.add_argument("--operacoes", type=int, default=20)
+    parser.add_argument("--linhas", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        armazem = sessao.ArmazemSessoes(os.path.join(pasta, "sessoes.db"))
+        tempos, erros = [], []
+        largada = threading.Event()
+        threads = [threading.Thread(target=aluno, args=(armazem, f"anon_{i:05d}", args.operacoes,
+                                                        tempos, erros, largada))
+                   for i in range(args.sessoes)]
+        for t in threads:
+            t.start()
+        inicio = time.perf_counter()
+        largada.set()
+        for t in threads:
+            t.join()
+        duracao = time.perf_counter() - inicio
+        armazem.fechar()
+        comparacao = amplificacao(pasta, args.linhas)
+
+    tempos.sort()
+    total = len(tempos)
+    print(f"{args.sessoes} sessões x {args.operacoes} ciclos (gravar + ler)")
+    print(f"vazão: {total / duracao:.0f} ciclos/s | p50: {tempos[total // 2] * 1e3:.2f} ms | "
+          f"p99: {tempos[int(total * 0.99)] * 1e3:.2f} ms | média: {statistics.fmean(tempos) * 1e3:.2f} ms")
+    print(f"estados trocados entre usuários: {len(erros)}")
+    print(f"\nsessão com DataFrames de {args.linhas} linhas, só 'dados' alterado a cada salvamento")
+    for modo, (bytes_, mediana) in comparacao.items():
+        print(f"{modo:<19} {bytes_ / 1024:>10.1f} KiB/salvamento | p50: {mediana * 1e3:.2f} ms")
+    (bytes_completo, p50_completo), (bytes_incremental, p50_incremental) = comparacao.values()
+    print(f"incremental: {bytes_completo / max(bytes_incremental, 1):.0f}x menos bytes, "
+          f"{p50_completo / p50_incremental:.1f}x mais rápido (p50)")
+
+
+if __name__ == "__main__":
+    main()
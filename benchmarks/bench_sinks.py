@@ -0,0 +1,78 @@
+"""Micro-benchmark do custo por evento de cada destino de log.
+
+Uso (a partir da raiz do projeto):
+
+    python benchmarks/bench_sinks.py [--eventos 20000]
+
+Mede o tempo gasto na chamada ``emitir`` — o que a página paga — e o
+tempo de ``fechar``, que inclui a gravação do que ficou em buffer. O
+Google Sheets é substituído pela PlanilhaFalsa, então o número do
+destino "sheets" corresponde ao custo local (diário SQLite).
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import registro  # noqa: E402
+from planilha_falsa import PlanilhaFalsa  # noqa: E402
+
+
+def _criar_sinks(pasta):
+    manifesto = registro.Manifesto(os.path.join(pasta, "manifesto.json"))
+    escritor = registro.EscritorEmLote(
+        recursos=PlanilhaFalsa(),
+        diario=registro.DiarioLocal(os.path.join(pasta, "diario.db")),
+        manifesto=manifesto)
+    return {
+        "csv": registro.CsvSink(pasta=os.path.join(pasta, "csv"), manifesto=manifesto),
+        "sqlite": registro.SqliteSink(caminho=os.path.join(pasta, "eventos.db")),
+        "stdout": registro.StdoutSink(saida=io.StringIO()),
+        "sheets": registro.SheetsSink(escritor=escritor),
+        "parquet": registro.ParquetSink(pasta=os.path.join(pasta, "parquet"), manifesto=manifesto),
+    }
+
+
+def medir(sink, eventos):
+    evento = registro.Evento.criar("interacao", "anon_1a2b3c4d", "Introdução a Custos",
+                                   "viu_objetivos_introducao", permanencia=12.4)
+    tempos = []
+    relogio = time.perf_counter
+    for _ in range(eventos):
+        inicio = relogio()
+        sink.emitir(evento)
+        tempos.append(relogio() - inicio)
+    inicio = relogio()
+    sink.fechar()
+    fechamento = relogio() - inicio
+    tempos.sort()
+    return {
+        "media_us": statistics.fmean(tempos) * 1e6,
+        "p50_us": tempos[len(tempos) // 2] * 1e6,
+        "p99_us": tempos[int(len(tempos) * 0.99)] * 1e6,
+        "fechar_ms": fechamento * 1e3,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--eventos", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        print(f"{'destino':<8} {'média (µs)':>11} {'p50 (µs)':>10} {'p99 (µs)':>10} {'fechar (ms)':>12}")
+        for nome, sink in _criar_sinks(pasta).items():
+            r = medir(sink, args.eventos)
+            print(f"{nome:<8} {r['media_us']:>11.2f} {r['p50_us']:>10.2f} "
+                  f"{r['p99_us']:>10.2f} {r['fechar_ms']:>12.2f}")
+            if isinstance(sink, registro.SheetsSink):
+                sink.escritor.encerrar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Compara latência e vazão dos motores de voz (gTTS x espeak-ng).
+
+Uso (a partir da raiz do projeto):
+
+    python benchmarks/bench_tts.py [--backends gtts,espeak] [--repeticoes 3] [--trabalhadores 4]
+
+A latência é medida com sínteses em sequência, sem cache; a vazão, com
+todas as frases enviadas a um pool de threads. Backends indisponíveis
+(sem rede, espeak-ng não instalado) são informados e pulados.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import audio  # noqa: E402
+
+FRASES = [
+    "Terminologia: Custo é o gasto relativo à produção, Despesa é o gasto com administração",
+    "Custos fixos não variam com o volume produzido dentro da capacidade instalada.",
+    "A margem de contribuição unitária é o preço de venda menos os custos e despesas variáveis.",
+    "No custeio por absorção, todos os custos de produção são apropriados aos produtos.",
+    "O ponto de equilíbrio é o volume em que a receita total iguala os custos totais.",
+]
+
+
+def medir(backend, frases, repeticoes, trabalhadores):
+    tempos, falhas = [], 0
+    for _ in range(repeticoes):
+        for frase in frases:
+            inicio = time.perf_counter()
+            try:
+                backend.sintetizar(frase, "pt-br")
+            except Exception:
+                falhas += 1
+                continue
+            tempos.append(time.perf_counter() - inicio)
+
+    lote = frases * repeticoes
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=trabalhadores) as executor:
+        resultados = list(executor.map(lambda f: _tentar(backend, f), lote))
+    duracao = time.perf_counter() - inicio
+    ok = [r for r in resultados if r is not None]
+    tempos.sort()
+    return {
+        "p50_ms": tempos[len(tempos) // 2] * 1e3 if tempos else float("nan"),
+        "p95_ms": tempos[int(len(tempos) * 0.95)] * 1e3 if tempos else float("nan"),
+        "media_ms": statistics.fmean(tempos) * 1e3 if tempos else float("nan"),
+        "clipes_s": len(ok) / duracao,
+        "kb_medio": statistics.fmean(len(r) for r in ok) / 1024 if ok else float("nan"),
+        "falhas": falhas + len(resultados) - len(ok),
+    }
+
+
+def _tentar(backend, frase):
+    try:
+        return backend.sintetizar(frase, "pt-br")
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", default="gtts,espeak")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--trabalhadores", type=int, default=4)
+    args = parser.parse_args()
+
+    narracoes, _ = audio.extrair_narracoes([os.path.join(RAIZ, p) for p in audio.PAGINAS])
+    frases = [n["texto"] for n in narracoes] + FRASES
+
+    print(f"{len(frases)} frases x {args.repeticoes} repetições, {args.trabalhadores} threads na vazão")
+    print(f"{'backend':<8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'média (ms)':>11} "
+          f"{'clipes/s':>9} {'KiB/clipe':>10} {'falhas':>7}")
+    for nome in args.backends.split(","):
+        backend = audio.TIPOS_BACKEND[nome.strip()]()
+        if not backend.disponivel():
+            print(f"{nome:<8} indisponível neste sistema")
+            continue
+        r = medir(backend, frases, args.repeticoes, args.trabalhadores)
+        print(f"{nome:<8} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['media_ms']:>11.1f} "
+              f"{r['clipes_s']:>9.2f} {r['kb_medio']:>10.1f} {r['falhas']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Planilha em memória com a interface do ``RecursosPlanilha`` (só para benchmarks e verificações).
+
+``falhar=True`` simula o Google Sheets fora do ar: cada ``append_rows``
+levanta ``ConnectionError`` até que ``falhar`` volte a ser False.
+"""
+
+
+class _AbaFalsa:
+    def __init__(self, planilha, nome):
+        self.planilha = planilha
+        self.nome = nome
+
+    def append_rows(self, linhas):
+        if self.planilha.falhar:
+            raise ConnectionError("Google Sheets indisponível (simulado)")
+        self.planilha.chamadas += 1
+        self.planilha.linhas.setdefault(self.nome, []).extend(linhas)
+
+
+class PlanilhaFalsa:
+    """Backend local em memória com a mesma interface do RecursosPlanilha."""
+
+    def __init__(self, falhar=False):
+        self.falhar = falhar
+        self.chamadas = 0
+        self.linhas = {}
+
+    def aba(self, nome_aba, cabecalho=None):
+        if cabecalho and nome_aba not in self.linhas:
+            self.linhas[nome_aba] = [list(cabecalho)]
+        return _AbaFalsa(self, nome_aba)
+
+    def invalidar(self, nome_aba=None):
+        pass
@@ -0,0 +1,81 @@
+"""Verifica a entrega ao Google Sheets depois de uma queda, com a PlanilhaFalsa.
+
+Uso (a partir da raiz do projeto):
+
+    python benchmarks/verificar_envio.py
+
+Enfileira eventos com a planilha fora do ar e confere que nada é
+perdido: os eventos ficam no diário, o checkpoint não anda e o disjuntor
+abre. Depois a planilha volta e a verificação confere que todos os
+eventos chegam, na ordem, uma vez cada, que o checkpoint avança até o
+último evento e que o disjuntor fecha. Sai com erro se algo falhar.
+"""
+import os
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import registro  # noqa: E402
+from planilha import Disjuntor  # noqa: E402
+from planilha_falsa import PlanilhaFalsa  # noqa: E402
+
+EVENTOS = 12
+
+
+def esperar(condicao, escritor, limite=10.0):
+    prazo = time.monotonic() + limite
+    while not condicao():
+        if time.monotonic() > prazo:
+            return False
+        escritor.descarregar(timeout=0.5)
+        time.sleep(0.05)
+    return True
+
+
+def main():
+    with tempfile.TemporaryDirectory() as pasta:
+        planilha = PlanilhaFalsa(falhar=True)
+        diario = registro.DiarioLocal(os.path.join(pasta, "diario.db"))
+        disjuntor = Disjuntor(falhas_para_abrir=2, espera_inicial=0.1, espera_maxima=0.2)
+        escritor = registro.EscritorEmLote(
+            recursos=planilha, diario=diario, tamanho_lote=5, intervalo_max=0.05, disjuntor=disjuntor,
+            manifesto=registro.Manifesto(os.path.join(pasta, "manifesto.json")))
+
+        eventos = [registro.Evento.criar("interacao", f"anon_{i:08d}", "Introdução", f"acao_{i}")
+                   for i in range(EVENTOS)]
+        aba = eventos[0].shard()
+        for evento in eventos:
+            assert escritor.enfileirar(evento.shard(), evento.como_linha())
+
+        # Queda: nada chega, nada sai do diário e o disjuntor abre
+        assert esperar(lambda: disjuntor.aberturas > 0, escritor), "o disjuntor não abriu durante a queda"
+        assert planilha.chamadas == 0 and len(planilha.linhas.get(aba, [None])) == 1, "linhas entregues durante a queda"
+        assert diario.contar_pendentes() == EVENTOS, diario.contar_pendentes()
+        assert diario._checkpoint(aba) == 0, "o checkpoint avançou sem entrega"
+        falhas = escritor.situacao()["estatisticas"]["falhas"]
+        assert falhas > 0
+        print(f"queda: {falhas} falha(s), disjuntor {disjuntor.estado}, {diario.contar_pendentes()} no diário")
+
+        # Retorno: tudo é entregue, na ordem e sem duplicatas, e o checkpoint avança
+        planilha.falhar = False
+        assert esperar(lambda: escritor.profundidade() == 0, escritor), "eventos não entregues após a queda"
+        cabecalho, *entregues = planilha.linhas[aba]
+        assert cabecalho == registro.CABECALHOS[registro.aba_do_shard(aba)]
+        assert entregues == [list(e.como_linha()) for e in eventos], "entrega incompleta, fora de ordem ou duplicada"
+        assert diario.contar_pendentes() == 0
+        assert diario._checkpoint(aba) > 0, "o checkpoint não avançou"
+        assert diario.pendentes(aba) == []
+        assert disjuntor.estado == Disjuntor.FECHADO, disjuntor.estado
+        assert escritor.situacao()["estatisticas"]["enviados"] == EVENTOS
+        print(f"retorno: {len(entregues)} evento(s) entregues em {planilha.chamadas} chamada(s), "
+              f"checkpoint {diario._checkpoint(aba)}, disjuntor {disjuntor.estado}")
+        escritor.encerrar()
+        diario.fechar()
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Conteúdo didático (bancos de questões e exemplos) lido de ``conteudo/*.json``.
+
+Cada arquivo traz um campo ``versao`` e é lido uma única vez por processo;
+o resultado é convertido em objetos imutáveis (``MappingProxyType`` no
+lugar de dicts, tuplas no lugar de listas) compartilhados por todas as
+sessões e execuções das páginas, sem reconstrução a cada rerun.
+"""
+import json
+import logging
+import os
+import threading
+from types import MappingProxyType
+
+logger = logging.getLogger(__name__)
+
+PASTA_CONTEUDO = os.environ.get(
+    "GESTAO_CONTEUDO", os.path.join(os.path.dirname(os.path.abspath(__file__)), "conteudo"))
+# Versão do formato dos arquivos de conteúdo entendida por este módulo
+VERSAO_CONTEUDO = 1
+
+
+def congelar(valor):
+    """Cópia imutável de uma estrutura JSON (dicts, listas e escalares)."""
+    if isinstance(valor, dict):
+        return MappingProxyType({chave: congelar(item) for chave, item in valor.items()})
+    if isinstance(valor, (list, tuple)):
+        return tuple(congelar(item) for item in valor)
+    return valor
+
+
+_carregados = {}
+_carregados_lock = threading.Lock()
+
+
+def carregar_conteudo(nome, pasta=PASTA_CONTEUDO):
+    """Conteúdo imutável de ``<pasta>/<nome>.json``, lido na primeira chamada."""
+    caminho = os.path.join(pasta, nome + ".json")
+    with _carregados_lock:
+        conteudo = _carregados.get(caminho)
+        if conteudo is None:
+            with open(caminho, encoding="utf-8") as f:
+                bruto = json.load(f)
+            versao = bruto.get("versao")
+            if versao != VERSAO_CONTEUDO:
+                raise ValueError(f"{caminho}: versão de conteúdo {versao!r} não suportada "
+                                 f"(esperada {VERSAO_CONTEUDO})")
+            conteudo = _carregados[caminho] = congelar(bruto)
+        return conteudo
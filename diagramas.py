@@ -0,0 +1,178 @@
+"""Diagramas Graphviz pré-renderizados em SVG e servidos como arquivos estáticos.
+
+Cada diagrama é endereçado pelo conteúdo: o nome do arquivo é o hash do
+código DOT (e do motor de layout), então mudar a definição de um
+diagrama gera outro arquivo e o anterior deixa de ser usado. Os SVGs
+ficam em ``static/diagramas`` e o Streamlit os serve em
+``app/static/diagramas/<hash>.svg`` (``enableStaticServing`` no
+``.streamlit/config.toml``), com ETag e Last-Modified para o cache do
+navegador; o layout não é refeito a cada execução das páginas.
+
+Os diagramas são as funções ``diagrama_*`` de nível de módulo das
+páginas e podem ser gerados antes do deploy (requer o executável
+``dot`` do Graphviz):
+
+    python diagramas.py                # gera o que falta e remove o obsoleto
+    python diagramas.py --verificar    # só confere; sai com erro se desatualizado
+
+O que não foi gerado antes é renderizado na primeira exibição. Sem o
+Graphviz no servidor, as páginas voltam a usar ``st.graphviz_chart``.
+"""
+import argparse
+import glob
+import hashlib
+import importlib.util
+import logging
+import os
+import sys
+import threading
+
+import graphviz
+
+logger = logging.getLogger(__name__)
+
+PASTA_DIAGRAMAS = os.path.join("static", "diagramas")
+# Endereço relativo em que o Streamlit serve a pasta static/ do app
+URL_DIAGRAMAS = "app/static/diagramas"
+PAGINAS = [os.path.join("pages", "*.py")]
+PREFIXO_FUNCAO = "diagrama_"
+
+
+def nome_svg(grafo):
+    """Nome do arquivo SVG do grafo: hash de (motor de layout, código DOT)."""
+    resumo = hashlib.sha256(f"{grafo.engine}\0{grafo.source}".encode("utf-8")).hexdigest()
+    return f"{resumo[:20]}.svg"
+
+
+def renderizar(grafo, pasta=PASTA_DIAGRAMAS):
+    """Gera o SVG do grafo na pasta, se ainda não existir, e devolve o nome do arquivo."""
+    nome = nome_svg(grafo)
+    caminho = os.path.join(pasta, nome)
+    if not os.path.exists(caminho):
+        svg = grafo.pipe(format="svg")
+        os.makedirs(pasta, exist_ok=True)
+        temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporario, "wb") as f:
+            f.write(svg)
+        os.replace(temporario, caminho)
+    return nome
+
+
+class CacheDiagramas:
+    """SVGs já disponíveis na pasta estática, renderizados no máximo uma vez por definição."""
+
+    def __init__(self, pasta=PASTA_DIAGRAMAS):
+        self.pasta = pasta
+        self._lock = threading.Lock()
+        self._prontos = set()
+        self._sem_graphviz = False
+        self.estatisticas = {"acertos": 0, "renderizados": 0, "indisponiveis": 0}
+
+    def svg(self, grafo):
+        """Nome do SVG do grafo, renderizando-o na primeira vez; None sem o Graphviz."""
+        nome = nome_svg(grafo)
+        with self._lock:
+            if nome in self._prontos:
+                self.estatisticas["acertos"] += 1
+                return nome
+            if self._sem_graphviz and not os.path.exists(os.path.join(self.pasta, nome)):
+                self.estatisticas["indisponiveis"] += 1
+                return None
+        existia = os.path.exists(os.path.join(self.pasta, nome))
+        try:
+            renderizar(grafo, self.pasta)
+        except graphviz.ExecutableNotFound:
+            logger.info("Graphviz (dot) não instalado; diagramas renderizados no navegador")
+            with self._lock:
+                self._sem_graphviz = True
+                self.estatisticas["indisponiveis"] += 1
+            return None
+        with self._lock:
+            self._prontos.add(nome)
+            self.estatisticas["acertos" if existia else "renderizados"] += 1
+        return nome
+
+    def url(self, nome):
+        return f"{URL_DIAGRAMAS}/{nome}"
+
+    def situacao(self):
+        with self._lock:
+            return {"estatisticas": dict(self.estatisticas),
+                    "prontos": len(self._prontos),
+                    "graphviz_disponivel": not self._sem_graphviz}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def obter_diagramas():
+    """Retorna o cache de diagramas compartilhado pelo processo."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = CacheDiagramas()
+        return _cache
+
+
+# --- Geração antes do deploy ------------------------------------------------
+
+def diagramas_das_paginas(padroes=PAGINAS):
+    """Lista de (origem, grafo) com os diagramas definidos pelas funções ``diagrama_*`` das páginas."""
+    diagramas = []
+    for padrao in padroes:
+        for arquivo in sorted(glob.glob(padrao)):
+            # Só importa as páginas que definem diagramas; algumas executam código ao importar
+            with open(arquivo, encoding="utf-8") as f:
+                if f"def {PREFIXO_FUNCAO}" not in f.read():
+                    continue
+            spec = importlib.util.spec_from_file_location(f"_pagina_{len(diagramas)}", arquivo)
+            pagina = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(pagina)
+            for nome, funcao in sorted(vars(pagina).items()):
+                if nome.startswith(PREFIXO_FUNCAO) and callable(funcao):
+                    diagramas.append((f"{arquivo}:{nome}", funcao()))
+    return diagramas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera os SVGs dos diagramas das páginas.")
+    parser.add_argument("--pasta", default=PASTA_DIAGRAMAS, help="pasta dos SVGs")
+    parser.add_argument("--paginas", nargs="+", default=PAGINAS, help="arquivos ou padrões glob")
+    parser.add_argument("--verificar", action="store_true",
+                        help="apenas confere os SVGs; código de saída 1 se estiverem desatualizados")
+    parser.add_argument("--manter-obsoletos", action="store_true")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    diagramas = diagramas_das_paginas(args.paginas)
+    esperados = {nome_svg(grafo): origem for origem, grafo in diagramas}
+    existentes = set(os.listdir(args.pasta)) if os.path.isdir(args.pasta) else set()
+    existentes = {nome for nome in existentes if nome.endswith(".svg")}
+    faltando = sorted(set(esperados) - existentes)
+    obsoletos = sorted(existentes - set(esperados))
+    print(f"{len(diagramas)} diagrama(s) encontrado(s)")
+    if args.verificar:
+        for nome in faltando:
+            print(f"faltando  {nome}  {esperados[nome]}")
+        for nome in obsoletos:
+            print(f"obsoleto  {nome}")
+        return 1 if faltando or obsoletos else 0
+
+    try:
+        for origem, grafo in diagramas:
+            if nome_svg(grafo) in faltando:
+                renderizar(grafo, args.pasta)
+    except graphviz.ExecutableNotFound:
+        print("erro: executável dot do Graphviz não encontrado; instale o Graphviz para gerar os SVGs")
+        return 1
+    if not args.manter_obsoletos:
+        for nome in obsoletos:
+            os.remove(os.path.join(args.pasta, nome))
+    print(f"gerados: {len(faltando)} | reaproveitados: {len(esperados) - len(faltando)} | "
+          f"removidos: {0 if args.manter_obsoletos else len(obsoletos)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
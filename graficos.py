@@ -0,0 +1,205 @@
+"""Cache de figuras (Plotly e Matplotlib) compartilhado entre sessões.
+
+Cada figura é identificada por um nome e pelas entradas que a definem,
+normalizadas em uma chave estável (números, textos, listas, dicts,
+arrays e DataFrames). A primeira construção de um par (nome, entradas)
+guarda a figura já pronta para envio: figuras Plotly ficam como a
+especificação JSON e figuras Matplotlib como o PNG renderizado. Os itens
+ficam em um LRU em memória limitado pelo tamanho real desses textos e
+bytes, e acertos e faltas são contados por figura.
+
+Os itens são imutáveis e podem ser compartilhados entre sessões; cada
+envio de uma figura Plotly recebe um objeto novo (``FiguraPronta.plotly``).
+"""
+import hashlib
+import io
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+LIMITE_FIGURAS_MB = float(os.environ.get("GESTAO_FIGURAS_MB", "64"))
+# Mesmos parâmetros que o st.pyplot usa ao renderizar figuras Matplotlib
+OPCOES_PNG = {"format": "png", "dpi": 200, "bbox_inches": "tight"}
+
+PLOTLY = "plotly"
+PNG = "png"
+
+
+def _resumo(dados):
+    return hashlib.blake2b(dados, digest_size=16).hexdigest()
+
+
+def normalizar(valor):
+    """Forma hashável e estável de uma entrada de figura.
+
+    Floats são arredondados a 12 algarismos significativos, para que
+    ruídos de arredondamento não gerem figuras repetidas; DataFrames,
+    Series e arrays entram pelo resumo do conteúdo.
+    """
+    if isinstance(valor, pd.DataFrame):
+        conteudo = pd.util.hash_pandas_object(valor, index=True).to_numpy().tobytes()
+        return ("DataFrame", tuple(map(str, valor.columns)), tuple(map(str, valor.dtypes)), _resumo(conteudo))
+    if isinstance(valor, pd.Series):
+        conteudo = pd.util.hash_pandas_object(valor, index=True).to_numpy().tobytes()
+        return ("Series", str(valor.name), str(valor.dtype), _resumo(conteudo))
+    if isinstance(valor, np.ndarray):
+        return ("ndarray", valor.dtype.str, valor.shape, _resumo(np.ascontiguousarray(valor).tobytes()))
+    if isinstance(valor, np.generic):
+        valor = valor.item()
+    if valor is None or isinstance(valor, (bool, int, str)):
+        return valor
+    if isinstance(valor, float):
+        return float(f"{valor:.12g}")
+    if isinstance(valor, Mapping):
+        return tuple(sorted((str(chave), normalizar(item)) for chave, item in valor.items()))
+    if isinstance(valor, (list, tuple)):
+        return tuple(normalizar(item) for item in valor)
+    if isinstance(valor, (set, frozenset)):
+        return tuple(sorted((normalizar(item) for item in valor), key=repr))
+    raise TypeError(f"Entrada de figura não suportada: {type(valor).__name__}")
+
+
+@dataclass(frozen=True)
+class FiguraPronta:
+    """Figura pronta para envio: especificação JSON do Plotly (``tipo="plotly"``) ou bytes PNG (``"png"``)."""
+    tipo: str
+    dados: object
+    tamanho: int
+
+    def plotly(self):
+        """Figura Plotly nova, montada da especificação guardada.
+
+        A especificação já foi validada na construção, então a validação é
+        pulada (``_validate=False``), o que custa o mesmo que copiar a figura.
+        """
+        import plotly.graph_objects as go
+        return go.Figure(json.loads(self.dados), _validate=False)
+
+
+def preparar(figura):
+    """Converte a figura construída na forma guardada no cache."""
+    if hasattr(figura, "savefig"):
+        import matplotlib.pyplot as plt
+        buffer = io.BytesIO()
+        figura.savefig(buffer, **OPCOES_PNG)
+        plt.close(figura)
+        dados = buffer.getvalue()
+        return FiguraPronta(PNG, dados, len(dados))
+    import plotly.io as pio
+    especificacao = pio.to_json(figura, validate=False)
+    # Tamanho do objeto str, não só o número de caracteres
+    return FiguraPronta(PLOTLY, especificacao, sys.getsizeof(especificacao))
+
+
+class CacheFiguras:
+    """LRU de figuras prontas, chaveado por (nome da figura, entradas normalizadas)."""
+
+    def __init__(self, limite_bytes=LIMITE_FIGURAS_MB * 2**20):
+        self.limite_bytes = limite_bytes
+        self._lock = threading.Lock()
+        self._itens = OrderedDict()  # (nome, entradas) -> FiguraPronta, do menos ao mais recente
+        self._bytes = 0
+        self._por_figura = {}        # nome -> contadores
+
+    def _contadores(self, nome):
+        contadores = self._por_figura.get(nome)
+        if contadores is None:
+            contadores = self._por_figura[nome] = {"acertos": 0, "faltas": 0, "removidas": 0,
+                                                   "segundos_construcao": 0.0}
+        return contadores
+
+    def obter(self, nome, construir, entradas):
+        """Figura ``nome`` para ``entradas``; constrói com ``construir(**entradas)`` só na falta."""
+        chave = (nome, normalizar(entradas))
+        with self._lock:
+            figura = self._itens.get(chave)
+            if figura is not None:
+                self._itens.move_to_end(chave)
+                self._contadores(nome)["acertos"] += 1
+                return figura
+            self._contadores(nome)["faltas"] += 1
+
+        inicio = time.perf_counter()
+        figura = preparar(construir(**entradas))
+        duracao = time.perf_counter() - inicio
+        with self._lock:
+            self._contadores(nome)["segundos_construcao"] += duracao
+            self._guardar(chave, figura)
+        return figura
+
+    def _guardar(self, chave, figura):
+        if figura.tamanho > self.limite_bytes:
+            logger.info("Figura %s maior que o cache (%d bytes); não guardada", chave[0], figura.tamanho)
+            return
+        anterior = self._itens.pop(chave, None)
+        if anterior is not None:
+            self._bytes -= anterior.tamanho
+        self._itens[chave] = figura
+        self._bytes += figura.tamanho
+        while self._bytes > self.limite_bytes:
+            (nome, _), removida = self._itens.popitem(last=False)
+            self._bytes -= removida.tamanho
+            self._contadores(nome)["removidas"] += 1
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+            self._bytes = 0
+
+    def situacao(self):
+        """Ocupação do cache e acertos, faltas e taxa de acerto de cada figura."""
+        with self._lock:
+            ocupacao = {}
+            for (nome, _), figura in self._itens.items():
+                itens, tamanho = ocupacao.get(nome, (0, 0))
+                ocupacao[nome] = (itens + 1, tamanho + figura.tamanho)
+            por_figura = {}
+            for nome, contadores in sorted(self._por_figura.items()):
+                consultas = contadores["acertos"] + contadores["faltas"]
+                itens, tamanho = ocupacao.get(nome, (0, 0))
+                por_figura[nome] = {
+                    "acertos": contadores["acertos"],
+                    "faltas": contadores["faltas"],
+                    "taxa_acerto": round(contadores["acertos"] / consultas, 3) if consultas else 0.0,
+                    "construcao_media_ms": round(contadores["segundos_construcao"] / contadores["faltas"] * 1e3, 1)
+                    if contadores["faltas"] else 0.0,
+                    "removidas": contadores["removidas"],
+                    "itens": itens,
+                    "mb": round(tamanho / 2**20, 3),
+                }
+            acertos = sum(c["acertos"] for c in self._por_figura.values())
+            consultas = acertos + sum(c["faltas"] for c in self._por_figura.values())
+            return {"itens": len(self._itens),
+                    "mb": round(self._bytes / 2**20, 2),
+                    "limite_mb": round(self.limite_bytes / 2**20, 2),
+                    "taxa_acerto": round(acertos / consultas, 3) if consultas else 0.0,
+                    "por_figura": por_figura}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def obter_cache_figuras():
+    """Retorna o cache de figuras compartilhado pelo processo."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = CacheFiguras()
+        return _cache
+
+
+def situacao_figuras():
+    """Estatísticas de acerto e ocupação do cache de figuras."""
+    return obter_cache_figuras().situacao()
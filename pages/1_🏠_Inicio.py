@@ -100,7 +100,7 @@ def main():
     
         if col.button(unidade, help=desc, key=botao_key):
             # Registra a interação
-            safe_log_interacao(nome_usuario, pagina_atual, f"clicou_unidade_{i+1}")
+            safe_log_interacao(nome_usuario, pagina_atual, "clicou_unidade", unidade=i+1)
             st.toast(f"🚀 Ótimo! {unidade} é essencial para sua carreira!", icon="✅")
             
             # Salva a unidade atual no estado da sessão (opcional, para usar depois)
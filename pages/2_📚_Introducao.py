@@ -2,10 +2,401 @@ import streamlit as st
 import numpy as np
 import pandas as pd
 import graphviz
-import matplotlib.pyplot as plt
 import plotly.express as px
-from matplotlib.patches import Rectangle, FancyBboxPatch
-from utils import leitor_de_texto, get_anon_user_id, log_acesso_google, log_interacao_google, safe_log_interacao
+import plotly.graph_objects as go
+from conteudo import carregar_conteudo
+from quiz import CERTA, obter_banco
+from utils import leitor_de_texto, get_anon_user_id, log_acesso_google, log_interacao_google, safe_log_interacao, estado_quiz, pergunta_quiz, cronometrado, expander_preguicoso, abas_preguicosas, mostrar_figura, mostrar_diagrama
+
+CONTEUDO = carregar_conteudo("introducao")
+
+def figura_comportamento(custo_fixo, custo_variavel_unit, producao_min, producao_max):
+    # Gerar dados para o gráfico
+    qtd_producao = list(range(producao_min, producao_max+1, 50))
+    custo_total = [custo_fixo + custo_variavel_unit*q for q in qtd_producao]
+
+    df = pd.DataFrame({
+        "Quantidade": qtd_producao,
+        "Custo Total": custo_total,
+        "Custo Fixo": custo_fixo,
+        "Custo Variável": [custo_variavel_unit*q for q in qtd_producao]
+    })
+
+    return px.line(
+        df,
+        x="Quantidade",
+        y=["Custo Total", "Custo Fixo", "Custo Variável"],
+        labels={"value": "Custo (R$)", "variable": "Tipo de Custo"},
+        title="Comportamento dos Custos em Relação ao Volume de Produção"
+    )
+
+
+def figura_sensibilidade(cf, cv, q):
+    q_range = np.linspace(0, q*2, 50)
+    ct_range = cf + (cv * q_range)
+    fig = px.line(x=q_range, y=ct_range, 
+                 labels={'x': 'Quantidade Produzida', 'y': 'Custo Total (R$)'},
+                 title="Relação entre Quantidade e Custo Total")
+    fig.add_vline(x=q, line_dash="dash", line_color="red",
+                 annotation_text=f"Quantidade Atual: {q}", 
+                 annotation_position="top left")
+    fig.update_layout(hovermode="x unified")
+    return fig
+
+
+def figura_cenarios(df_scenarios):
+    fig2 = px.bar(df_scenarios, x='Cenário', y='Custo Total',
+                 color='Cenário',
+                 title="Comparação de Cenários",
+                 text=[f"R$ {x:,.2f}" for x in df_scenarios['Custo Total']])
+    fig2.update_layout(showlegend=False)
+    return fig2
+
+
+def figura_composicao(produto):
+    # Prepara os dados para o DataFrame
+    dados_formatados = []
+    for tipo, itens in CONTEUDO["dados_produtos"][produto].items():
+        for item, valor in itens.items():
+            dados_formatados.append({
+                "Tipo": tipo,
+                "Item": item,
+                "Valor": valor,
+                "Produto": produto
+            })
+
+    df = pd.DataFrame(dados_formatados)
+
+    # Cria o gráfico Sunburst
+    fig = px.sunburst(
+        df,
+        path=['Tipo', 'Item'],
+        values='Valor',
+        color='Tipo',
+        color_discrete_map={'Direto': '#4CAF50', 'Indireto': '#FF9800'},
+        title=f"Composição de Custos - {produto}",
+        branchvalues='total'
+    )
+
+    # Ajustes de layout
+    fig.update_layout(margin=dict(t=50, l=0, r=0, b=0))
+    fig.update_traces(textinfo="label+percent parent", 
+                      hovertemplate='<b>Custo %{parent}</b><br><b>%{label}</b><br>Valor: R$ %{value:.2f}<extra></extra>')
+    return fig
+
+
+def figura_classificacao_desembolsos():
+    # Caixas, ligações e textos em coordenadas de 0 a 1; o navegador desenha a figura
+    caixas, linhas, textos = [], [], []
+
+    def caixa(x0, y0, largura, altura, margem, cor, opacidade):
+        caixas.append(dict(type="rect", x0=x0 - margem, y0=y0 - margem, x1=x0 + largura + margem,
+                           y1=y0 + altura + margem, fillcolor=cor, opacity=opacidade,
+                           line=dict(color="black", width=1), layer="below"))
+
+    def linha(xs, ys):
+        linhas.append(dict(type="line", x0=xs[0], x1=xs[1], y0=ys[0], y1=ys[1],
+                           line=dict(color="black", width=0.7)))
+
+    def texto(x, y, conteudo, tamanho, negrito=False):
+        textos.append(dict(x=x, y=y, text=f"<b>{conteudo}</b>" if negrito else conteudo,
+                           showarrow=False, font=dict(size=tamanho, color="black")))
+
+    # Título principal
+    texto(0.5, 0.95, 'Classificações dos Desembolsos', 20, negrito=True)
+
+    # Cores para categorias
+    colors = ['#FFD54F', '#4FC3F7', '#AED581', '#7986CB', '#F06292']
+
+    # Categorias principais (agrupando os itens fornecidos)
+    categorias = {
+        'Deduções': ['Impostos', 'Fretes', 'Devoluções'],
+        'Custos': {
+            'Diretos': ['Matéria-prima', 'Insumos'],
+            'Indiretos': ['Energia elétrica', 'Manutenção']
+        },
+        'Despesas': ['Administrativas', 'Comerciais', 'Financeiras'],
+        'Investimentos': ['Ativos Financeiros', 'Ativos Operacionais'],
+        'Outros': ['Institutos', 'Disposições']
+    }
+
+    # Posicionamento das categorias
+    positions = [(0.2, 0.7), (0.5, 0.7), (0.8, 0.7), (0.35, 0.4), (0.65, 0.4)]
+
+    for (x, y), (cat_name, items), color in zip(positions, categorias.items(), colors):
+        # Caixa principal da categoria
+        caixa(x-0.15, y-0.05, 0.3, 0.1, 0.03, color, 0.8)
+        texto(x, y, cat_name, 15, negrito=True)
+
+        # Subitens
+        if isinstance(items, dict):  # Para Custos que tem subcategorias
+            for i, (subcat, subitems) in enumerate(items.items()):
+                # Linha de conexão
+                linha([x, x-0.1+i*0.1], [y-0.05, y-0.15])
+
+                # Caixa da subcategoria
+                caixa(x-0.12+i*0.1, y-0.2, 0.15, 0.08, 0.02, color, 0.6)
+                texto(x-0.05+i*0.1, y-0.16, subcat, 12)
+
+                # Itens da subcategoria
+                for j, item in enumerate(subitems):
+                    texto(x-0.05+i*0.1, y-0.25-j*0.05, item, 11)
+        else:
+            # Para categorias sem subníveis
+            for i, item in enumerate(items):
+                linha([x, x], [y-0.05, y-0.15-i*0.05])
+                texto(x, y-0.2-i*0.05, item, 12)
+
+    # Adicionar legenda explicativa
+    legenda = "<br>".join([
+        "Legenda:",
+        "• Deduções: Gastos para realizar a venda",
+        "• Custos: Gastos na produção de bens/serviços",
+        "• Despesas: Gastos com manutenção da empresa",
+        "• Investimentos: Expectativa de benefícios futuros",
+    ])
+    textos.append(dict(x=0.05, y=0.1, text=legenda, showarrow=False, align="left", xanchor="left",
+                       yanchor="top", font=dict(size=12, color="black"), bgcolor="white",
+                       bordercolor="gray", borderpad=6))
+
+    fig = go.Figure()
+    fig.update_layout(
+        shapes=caixas + linhas,
+        annotations=textos,
+        height=650,
+        margin=dict(t=10, l=10, r=10, b=10),
+        plot_bgcolor="white",
+        xaxis=dict(range=[0, 1], visible=False, fixedrange=True),
+        yaxis=dict(range=[0, 1], visible=False, fixedrange=True),
+    )
+    return fig
+
+
+def diagrama_mapa_gastos():
+    # Criando o diagrama
+    grafico = graphviz.Digraph()
+
+    grafico.attr('node', shape='box', style='rounded, filled', fillcolor='#e8f4f8')
+
+    grafico.node('G', 'Gastos')
+    grafico.node('I', 'Investimentos\n(Gastos que ainda serão usados para gerar receita)')
+    grafico.node('C', 'Custo\n(Gastos que são usados diretamente na operação)')
+    grafico.node('D', 'Despesa\n(Gastos não associados a atividade fim)')
+    grafico.node('P', 'Perda\n(Gastos inesperados ou extraordinários.)')
+
+    # Ligações principais
+    grafico.edge('G', 'I', label='ainda serão usados')
+    grafico.edge('G', 'C', label='uso na operação')
+    grafico.edge('G', 'D', label='foram usados para gerar receita')
+    grafico.edge('G', 'P', label='não geraram receita')
+
+    # Adicionando impacto no resultado
+    grafico.node('B', 'Balanço Patrimonial\n(Bens, direitos e obrigações)')
+    grafico.edge('I', 'B', style='dashed')
+    grafico.edge('C', 'B', style='dashed')
+
+    # Adicionando impacto no resultado
+    grafico.node('R', 'Dem. Resultado do Exdercício\n(impacto financeiro)')
+    grafico.edge('D', 'R', style='dashed')
+    grafico.edge('P', 'R', style='dashed')
+
+    return grafico
+
+
+def diagrama_processos():
+    # Criando o diagrama
+    grafico = graphviz.Digraph()
+
+    grafico.attr('node', shape='box', style='rounded, filled', fillcolor='#f0f9f9')
+
+    # Processos
+    grafico.node('Prod', '🔧 Processo Produtivo')
+    grafico.node('RH', '👥 Recursos Humanos')
+    grafico.node('Mkt', '📢 Marketing')
+    grafico.node('Fin', '💰 Finanças')
+    grafico.node('Adm', '📑 Administrativo')
+    grafico.node('Outros', '➕ Outros')
+
+    # Receita e resultado
+    grafico.node('Rec', '💵 Receita\n(-) Custo das Mercadorias Vendidas\n= Lucro Bruto\n(-) Despesas Operacionais\n= Lucro Operacional', shape='rectangle', fillcolor='#d0eafc')
+
+    # Conexões
+    grafico.edge('Prod', 'Rec', label='➡️ Custo')
+    grafico.edge('RH', 'Rec', label='➡️ Despesa')
+    grafico.edge('Mkt', 'Rec', label='➡️ Despesa')
+    grafico.edge('Fin', 'Rec', label='➡️ Despesa')
+    grafico.edge('Adm', 'Rec', label='➡️ Despesa')
+    grafico.edge('Outros', 'Rec', label='➡️ Despesa')
+
+    return grafico
+
+
+def diagrama_processos_dre():
+    # Criando o diagrama
+    grafico = graphviz.Digraph()
+
+    grafico.attr('node', shape='box', style='rounded, filled', fillcolor='#f0f9f9')
+
+    # Processos
+    grafico.node('Prod', '🔧 Processo Produtivo\n(Custos)')
+    grafico.node('RH', '👥 Recursos Humanos\n(Despesas)')
+    grafico.node('Mkt', '📢 Marketing\n(Despesas)')
+    grafico.node('Fin', '💰 Finanças\n(Despesas)')
+    grafico.node('Adm', '📑 Administrativo\n(Despesas)')
+    grafico.node('Outros', '➕ Outros\n(Despesas)')
+
+    # Receita e DRE
+    grafico.node('Rec', '''💵 Receita
+        (-) Custo das Mercadorias Vendidas
+        = Lucro Bruto
+        (-) Despesas Operacionais
+        = Lucro Operacional''', shape='rectangle', fillcolor='#d0eafc')
+
+    # Conexões
+    grafico.edge('Prod', 'Rec', label='➡️ Custo (CMV)')
+    grafico.edge('RH', 'Rec', label='➡️ Despesa')
+    grafico.edge('Mkt', 'Rec', label='➡️ Despesa')
+    grafico.edge('Fin', 'Rec', label='➡️ Despesa')
+    grafico.edge('Adm', 'Rec', label='➡️ Despesa')
+    grafico.edge('Outros', 'Rec', label='➡️ Despesa')
+
+    return grafico
+
+
+@st.fragment
+@cronometrado("Introdução: simulador de comportamento")
+def simulador_comportamento():
+    """Sliders e gráfico de custo fixo x variável; reexecuta só este bloco."""
+    # Simulador interativo
+    st.markdown("#### 📈 Simulador de Comportamento de Custos")
+
+    col_fv1, col_fv2 = st.columns(2)
+    with col_fv1:
+        custo_fixo = st.slider("Custo Fixo Mensal (R$)", 1000, 50000, 15000)
+        custo_variavel_unit = st.slider("Custo Variável Unitário (R$)", 5, 200, 50)
+
+    with col_fv2:
+        producao_min = st.slider("Produção Mínima (un)", 0, 500, 0)
+        producao_max = st.slider("Produção Máxima (un)", 500, 5000, 2000)
+
+    mostrar_figura("introducao_comportamento", figura_comportamento,
+                   dict(custo_fixo=custo_fixo, custo_variavel_unit=custo_variavel_unit,
+                        producao_min=producao_min, producao_max=producao_max))
+
+
+@st.fragment
+@cronometrado("Introdução: análise de impacto de custos")
+def analise_impacto_custos():
+    """Parâmetros, métricas, sensibilidade e cenários; reexecuta só este bloco."""
+    # Comportamento dos Custos
+    c1, c2 = st.columns([1, 3])
+    with c1:
+    # Controles interativos
+        st.markdown("""
+        """)
+
+    with c2:
+        st.subheader("Parâmetros de Entrada")
+        cf = st.slider("Custos Fixos (R$):", 1000, 50000, 10000, 500, 
+                      help="Custos que não variam com o volume de produção")
+        cv = st.slider("Custo Variável Unitário (R$):", 1, 100, 15, 1,
+                      help="Custo adicional por unidade produzida")
+        q = st.slider("Quantidade Produzida:", 0, 1000, 200, 10,
+                     help="Volume total de unidades produzidas")
+        d = st.slider("Despesas (R$):", 1000, 50000, 10000, 500, 
+                     help="Total de Despesas")
+        p = st.slider("Preço de venda:", 1, 100, 20, 1,
+                     help="Preço unitário do produto")
+
+    # Cálculos
+    ct = cf + (cv * q)
+    custo_medio = ct / q if q > 0 else 0
+
+    # Métricas
+    st.divider()
+    col_met1, col_met2 = st.columns(2)
+    with col_met1:
+        st.metric("Custo Total Estimado", f"R$ {ct:,.2f}", 
+                 help="Soma de custos fixos e variáveis totais")
+    with col_met2:
+        st.metric("Custo Médio por Unidade", f"R$ {custo_medio:,.2f}" if q > 0 else "N/A",
+                 help="Custo total dividido pela quantidade produzida")
+
+    col_met3, col_met4 = st.columns(2)
+    with col_met3:
+        percent_var = (cv * q) / ct * 100
+        st.metric("Participação dos Custos Variáveis", f"{percent_var:.1f}%",
+                 help="Quanto do custo total é variável")
+    with col_met4:
+        if p > cv:
+            peq = (cf+d)/(p-cv)
+            st.metric("Ponto de Equilíbrio", f"{int(peq)} unidades",
+                 help="Quantidade necessária para cobrir todos os custos")
+        elif p == cv:
+            st.markdown("""
+            Ponto de Equilíbrio = ERRO!<br>(Preço de Venda = Custo Unitário)
+            """, unsafe_allow_html=True)
+        else:
+            st.markdown("""
+            CUIDADO! (Preço de Venda abaixo do Custo Unitário)
+            """)
+
+    # Análise de sensibilidade
+    st.divider()
+    st.subheader("🔍 Análise de Sensibilidade")
+
+    # Simulação de diferentes quantidades
+    q_range = np.linspace(0, q*2, 50)
+    ct_range = cf + (cv * q_range)
+    cm_range = ct_range / np.where(q_range > 0, q_range, 1)
+
+    t1, t2 = st.tabs(["Gráfico de Custos", "Tabela de Dados"])
+
+    with t1:
+        mostrar_figura("introducao_sensibilidade", figura_sensibilidade, dict(cf=cf, cv=cv, q=q))
+
+    with t2:
+        df = pd.DataFrame({
+            'Quantidade': q_range.astype(int),
+            'Custo Total': ct_range,
+            'Custo Médio': cm_range
+        })
+        st.dataframe(df.style.format({
+            'Custo Total': 'R$ {:,.2f}',
+            'Custo Médio': 'R$ {:,.2f}'
+        }), width='stretch')
+
+    # Análise de cenários
+    st.divider()
+    st.subheader("🌐 Análise de Cenários")
+
+    scenarios = {
+        "Otimista (CV -20%)": cv * 0.8,
+        "Atual": cv,
+        "Pessimista (CV +20%)": cv * 1.2
+    }
+
+    scenario_data = []
+    for name, cv_scenario in scenarios.items():
+        ct_scenario = cf + (cv_scenario * q)
+        scenario_data.append({
+            "Cenário": name,
+            "Custo Variável Unitário": cv_scenario,
+            "Custo Total": ct_scenario,
+            "Diferença": ct_scenario - ct
+        })
+
+    df_scenarios = pd.DataFrame(scenario_data)
+
+    mostrar_figura("introducao_cenarios", figura_cenarios, dict(df_scenarios=df_scenarios))
+
+    st.markdown("**Impacto de Variações no Custo Variável**")
+    st.dataframe(df_scenarios.style.format({
+        "Custo Variável Unitário": "R$ {:.2f}",
+        "Custo Total": "R$ {:,.2f}",
+        "Diferença": "R$ {:,.2f}"
+    }), hide_index=True, width='stretch')
+
 
 def main():
     st.title("📚 Introdução à Contabilidade de Custos")
@@ -31,15 +422,16 @@ def main():
             safe_log_interacao(nome_usuario, pagina_atual, "viu_objetivos_introducao")
 
     # Criando abas para o submenu
-    tab0, tab1, tab2, tab3, tab4 = st.tabs([
+    (tab0, gerar_tab0), (tab1, gerar_tab1), (tab2, gerar_tab2), (tab3, gerar_tab3), (tab4, gerar_tab4) = abas_preguicosas([
         "💡 Ideação", "📌 Conceitos Básicos", 
         "📊 Classificação", 
         "📈 Comportamento", 
         "🧠 Quiz"
-    ])
+    ], "intro_abas")
     
-    with tab0:  # Conceitos Básicos    
-        st.markdown("""
+    with tab0:  # Conceitos Básicos
+        if gerar_tab0:
+            st.markdown("""
             # 💥 Qual é o problema?
             
             Imagine que você está no comando.  
@@ -112,14 +504,15 @@ def main():
 
             Vá para o topo dessa página e clique em **📌 Conceitos Básicos** para continuar!
         """)
-        #Registra navegação
-        if st.button("✅ Clique aqui se essa informação foi útil", key="intro_context"):
-             safe_log_interacao(nome_usuario, pagina_atual, "viu_intro_contexto")
+            #Registra navegação
+            if st.button("✅ Clique aqui se essa informação foi útil", key="intro_context"):
+                 safe_log_interacao(nome_usuario, pagina_atual, "viu_intro_contexto")
 
-    with tab1:  # Conceitos Básicos    
-        st.header("Terminologia")
+    with tab1:  # Conceitos Básicos
+        if gerar_tab1:
+            st.header("Terminologia")
 
-        st.markdown("""
+            st.markdown("""
         Imagine que você vai abrir uma hamburgueria, um brechó online ou até um estúdio de criação digital. Antes de pensar no lucro, no preço que você vai cobrar ou no quanto vai ganhar, tem uma pergunta crucial:  
         
         > **“Quanto custa para eu fazer, oferecer ou entregar isso?”**  
@@ -129,11 +522,11 @@ def main():
         Entretanto, nem tudo que se gasta é chamado de custo. Assim, vamos conhecer os termos corretos.
         """)
 
-        col1 = st.columns(1)[0]
+            col1 = st.columns(1)[0]
             
-        with col1:
-            st.markdown(
-                """
+            with col1:
+                st.markdown(
+                    """
                 <div style="background-color:#FFD54F; padding:20px; border-radius:12px;
                 box-shadow: 2px 2px 8px rgba(0,0,0,0.2)">
                     <h4 style="color:#BF360C;">📘 Terminologia:</h4>
@@ -150,82 +543,15 @@ def main():
                     </ul>
                 </div>
                 """,
-                unsafe_allow_html=True
-            )
+                    unsafe_allow_html=True
+                )
 
-        plt.figure(figsize=(12, 10))
-        ax = plt.gca()
-        ax.axis('off')  # Desligar eixos
-        
-        # Título principal
-        plt.text(0.5, 0.95, 'Classificações dos Desembolsos', 
-                 ha='center', va='center', fontsize=16, weight='bold')
-        
-        # Cores para categorias
-        colors = ['#FFD54F', '#4FC3F7', '#AED581', '#7986CB', '#F06292']
-        
-        # Categorias principais (agrupando os itens fornecidos)
-        categorias = {
-            'Deduções': ['Impostos', 'Fretes', 'Devoluções'],
-            'Custos': {
-                'Diretos': ['Matéria-prima', 'Insumos'],
-                'Indiretos': ['Energia elétrica', 'Manutenção']
-            },
-            'Despesas': ['Administrativas', 'Comerciais', 'Financeiras'],
-            'Investimentos': ['Ativos Financeiros', 'Ativos Operacionais'],
-            'Outros': ['Institutos', 'Disposições']
-        }
-        
-        # Posicionamento das categorias
-        positions = [(0.2, 0.7), (0.5, 0.7), (0.8, 0.7), (0.35, 0.4), (0.65, 0.4)]
-        
-        for (x, y), (cat_name, items), color in zip(positions, categorias.items(), colors):
-            # Caixa principal da categoria
-            main_box = FancyBboxPatch((x-0.15, y-0.05), 0.3, 0.1, 
-                                     boxstyle="round,pad=0.03", 
-                                     fc=color, ec='black', alpha=0.8)
-            ax.add_patch(main_box)
-            plt.text(x, y, cat_name, ha='center', va='center', fontsize=12, weight='bold')
-            
-            # Subitens
-            if isinstance(items, dict):  # Para Custos que tem subcategorias
-                for i, (subcat, subitems) in enumerate(items.items()):
-                    # Linha de conexão
-                    plt.plot([x, x-0.1+i*0.1], [y-0.05, y-0.15], 'k-', lw=0.5)
-                    
-                    # Caixa da subcategoria
-                    sub_box = FancyBboxPatch((x-0.12+i*0.1, y-0.2), 0.15, 0.08,
-                                           boxstyle="round,pad=0.02",
-                                           fc=color, ec='black', alpha=0.6)
-                    ax.add_patch(sub_box)
-                    plt.text(x-0.05+i*0.1, y-0.16, subcat, ha='center', va='center', fontsize=9)
-                    
-                    # Itens da subcategoria
-                    for j, item in enumerate(subitems):
-                        plt.text(x-0.05+i*0.1, y-0.25-j*0.05, item, 
-                                ha='center', va='center', fontsize=8)
-            else:
-                # Para categorias sem subníveis
-                for i, item in enumerate(items):
-                    plt.plot([x, x], [y-0.05, y-0.15-i*0.05], 'k-', lw=0.5)
-                    plt.text(x, y-0.2-i*0.05, item, ha='center', va='center', fontsize=9)
-        
-        # Adicionar legenda explicativa
-        legenda = """Legenda:
-        • Deduções: Gastos para realizar a venda
-        • Custos: Gastos na produção de bens/serviços
-        • Despesas: Gastos com manutenção da empresa
-        • Investimentos: Expectativa de benefícios futuros"""
-        plt.text(0.05, 0.1, legenda, ha='left', va='top', fontsize=9, 
-                 bbox=dict(facecolor='white', alpha=0.8, edgecolor='gray'))
-        
-        plt.tight_layout()
-        #plt.savefig('classificacao_desembolsos.png', dpi=300, bbox_inches='tight')
-        plt.show()
-
-        st.divider()
+            mostrar_figura("introducao_classificacao_desembolsos", figura_classificacao_desembolsos, {},
+                           config={"displayModeBar": False})
 
-        st.markdown("""
+            st.divider()
+
+            st.markdown("""
             *De acordo como Alves et al. (2018) "O gasto resulta em “desembolso”, no entanto, vale destacar que ambos possuem conceitos distintos, ou seja, nem todo o desembolso é um gasto."
         
             Imagine dirigir uma empresa — seja uma indústria, um comércio, um negócio digital, um restaurante, uma clínica ou até uma repartição pública.  
@@ -243,206 +569,176 @@ def main():
             Ah! Só pra constar... Alves et al. (2018) é um livro e sua referência completa é: ALVES, Aline et al. **Análise de custo**. Porto Alegre: SAGAH, 2018.
         
             """)
-        #Registra navegação
-        if st.button("✅ Clique aqui se essa informação foi útil", key="intro_termos"):
-             safe_log_interacao(nome_usuario, pagina_atual, "viu_intro_terminologia")
+            #Registra navegação
+            if st.button("✅ Clique aqui se essa informação foi útil", key="intro_termos"):
+                 safe_log_interacao(nome_usuario, pagina_atual, "viu_intro_terminologia")
 
-        # ✅ Integração do vídeo
-        st.video("https://youtu.be/9GUog7H4Bgk")
+            # ✅ Integração do vídeo
+            st.video("https://youtu.be/9GUog7H4Bgk")
         
-        st.markdown("""             
+            st.markdown("""             
             Mais detalhes você pode ver [outro vídeo que mostra a diferença entre esses termos. **Clique aqui para acessar**](https://youtu.be/wvAMk9qGhoE?si=JzH89zq0ND1ij3Wt)
 
             Precisa ler mais sobre isso? Tem um texto do [Blog Razonet](https://razonet.com.br/blog/post/diferentes-tipos-de-gastos-custo-despesa-investimento-e-perda) que pode ser útil.
             """)
             
-        st.divider()
-        
-        # 🎯 Atividade Interativa 1: Verdadeiro ou Falso
-        st.subheader("🎯 Quebre seus mitos sobre custos")
-        
-        with st.expander("🔍 Clique aqui para testar seus conhecimentos"):
-            perguntas = {
-                "1️⃣ Custos e despesas são a mesma coisa.": False,
-                "2️⃣ Custos estão diretamente ligados à operação do produto ou serviço.": True,
-                "3️⃣ Investimentos entram no cálculo de custos mensais.": False,
-                "4️⃣ Uma empresa pública não precisa se preocupar com custos.": False
-            }
-        
-            respostas = {}
-            for pergunta, correta in perguntas.items():
-                respostas[pergunta] = st.radio(pergunta, ["Verdadeiro", "Falso"], index=None, key=pergunta)
-        
-            if st.button("🔍 Verificar respostas"):
-                acertos = 0
-                for pergunta, correta in perguntas.items():
-                    resposta_usuario = respostas[pergunta] == ("Verdadeiro" if correta else "Falso")
-                    if resposta_usuario:
-                        acertos += 1
-                        st.success(f"✅ {pergunta} ✔️ Correto!")
-                    else:
-                        st.error(f"❌ {pergunta} ❌ Incorreto.")
-        
-                st.info(f"🎯 Você acertou {acertos} de {len(perguntas)}.")
-        
-        st.divider()
-
-        # 📚 Resumo visual
-        st.subheader("🗺️ Mapa Mental de Custos")
-        st.subheader("🔍 Entendendo os conceitos fundamentais de **Gastos (Custos, Despesas, Investimentos e Perdas)**")
-    
-        st.markdown("""
-        > Na gestão de custos, é fundamental compreender como os diferentes tipos de gastos impactam a saúde financeira de qualquer organização — seja ela uma indústria, comércio, serviço ou setor público.
+            st.divider()
         
-        """)
+            # 🎯 Atividade Interativa 1: Verdadeiro ou Falso
+            st.subheader("🎯 Quebre seus mitos sobre custos")
         
-        st.divider()
+            secao, gerar = expander_preguicoso("🔍 Clique aqui para testar seus conhecimentos", "intro_quiz_vf")
+            with secao:
+                if gerar:
+                    quiz_vf, estado_vf = estado_quiz("introducao_vf")
         
-        st.subheader("📊 **Mapa Conceitual dos Gastos**")
+                    for i, q in enumerate(quiz_vf.questoes):
+                        pergunta_quiz(quiz_vf, estado_vf, i, q.enunciado, key=q.enunciado, index=None)
         
-        # Criando o diagrama
-        grafico = graphviz.Digraph()
+                    if st.button("🔍 Verificar respostas"):
+                        acertos = quiz_vf.enviar(estado_vf)
+                        for q, nota in zip(quiz_vf.questoes, estado_vf.notas):
+                            if nota == CERTA:
+                                st.success(f"✅ {q.enunciado} ✔️ Correto!")
+                            else:
+                                st.error(f"❌ {q.enunciado} ❌ Incorreto.")
         
-        grafico.attr('node', shape='box', style='rounded, filled', fillcolor='#e8f4f8')
+                        st.info(f"🎯 Você acertou {acertos} de {len(quiz_vf)}.")
         
-        grafico.node('G', 'Gastos')
-        grafico.node('I', 'Investimentos\n(Gastos que ainda serão usados para gerar receita)')
-        grafico.node('C', 'Custo\n(Gastos que são usados diretamente na operação)')
-        grafico.node('D', 'Despesa\n(Gastos não associados a atividade fim)')
-        grafico.node('P', 'Perda\n(Gastos inesperados ou extraordinários.)')
+            st.divider()
+
+            # 📚 Resumo visual
+            st.subheader("🗺️ Mapa Mental de Custos")
+            st.subheader("🔍 Entendendo os conceitos fundamentais de **Gastos (Custos, Despesas, Investimentos e Perdas)**")
+    
+            st.markdown("""
+        > Na gestão de custos, é fundamental compreender como os diferentes tipos de gastos impactam a saúde financeira de qualquer organização — seja ela uma indústria, comércio, serviço ou setor público.
         
-        # Ligações principais
-        grafico.edge('G', 'I', label='ainda serão usados')
-        grafico.edge('G', 'C', label='uso na operação')
-        grafico.edge('G', 'D', label='foram usados para gerar receita')
-        grafico.edge('G', 'P', label='não geraram receita')
+        """)
         
-        # Adicionando impacto no resultado
-        grafico.node('B', 'Balanço Patrimonial\n(Bens, direitos e obrigações)')
-        grafico.edge('I', 'B', style='dashed')
-        grafico.edge('C', 'B', style='dashed')
+            st.divider()
         
-        # Adicionando impacto no resultado
-        grafico.node('R', 'Dem. Resultado do Exdercício\n(impacto financeiro)')
-        grafico.edge('D', 'R', style='dashed')
-        grafico.edge('P', 'R', style='dashed')
+            st.subheader("📊 **Mapa Conceitual dos Gastos**")
         
-        st.graphviz_chart(grafico)
+            mostrar_diagrama(diagrama_mapa_gastos(), "Mapa Conceitual dos Gastos")
         
-        st.divider()
+            st.divider()
         
-        # 🏗️ Cenários por setor
-        st.subheader("🏢 E na prática? Como isso aparece em diferentes setores?")
+            # 🏗️ Cenários por setor
+            st.subheader("🏢 E na prática? Como isso aparece em diferentes setores?")
         
-        setor = st.selectbox(
-            "Escolha o setor para explorar:",
-            ["Indústria", "Comércio", "Serviços", "Administração Pública"], index=None
-        )
+            setor = st.selectbox(
+                "Escolha o setor para explorar:",
+                ["Indústria", "Comércio", "Serviços", "Administração Pública"], index=None
+            )
         
-        if setor == "Indústria":
-            st.markdown("""
+            if setor == "Indústria":
+                st.markdown("""
         - 🏭 **Custos:** Matéria-prima, mão de obra da fábrica, energia da produção, manutenção das máquinas.  
         - 💸 **Despesas:** Marketing, vendas, administrativo, RH, aluguel do escritório.  
         - 💼 **Investimentos:** Compra de máquinas, galpões, tecnologia de produção.  
         """)
-        elif setor == "Comércio":
-            st.markdown("""
+            elif setor == "Comércio":
+                st.markdown("""
         - 🏪 **Custos:** Compra de mercadorias para revenda, transporte dos produtos, armazenamento.  
         - 💸 **Despesas:** Vendedores, propaganda, aluguel da loja, sistemas de gestão.  
         - 💼 **Investimentos:** Reformas, expansão de lojas, aquisição de equipamentos.  
         """)
-        elif setor == "Serviços":
-            st.markdown("""
+            elif setor == "Serviços":
+                st.markdown("""
         - 👩‍⚕️ **Custos:** Salário dos profissionais diretamente envolvidos na entrega (médicos, professores, consultores), materiais usados na prestação do serviço.  
         - 💸 **Despesas:** Publicidade, atendimento, suporte, administração, aluguel do escritório.  
         - 💼 **Investimentos:** Softwares, equipamentos especializados, estrutura física.  
         """)
-        elif setor == "Administração Pública":
-            st.markdown("""
+            elif setor == "Administração Pública":
+                st.markdown("""
         - 🏛️ **Custos:** Recursos diretamente aplicados em serviços públicos (salários de médicos de hospitais públicos, professores de escolas públicas, manutenção dos espaços de atendimento).  
         - 💸 **Despesas:** Atividades administrativas, suporte, gestão, auditoria, comunicação.  
         - 💼 **Investimentos:** Obras públicas, compra de veículos, construção de hospitais, sistemas tecnológicos.  
         """)
-        else:
-            st.markdown("""
+            else:
+                st.markdown("""
             """)
 
-        if st.button("Ouvir explicação", key="audio1"):
-            texto = "Terminologia: Custo é o gasto relativo à produção, Despesa é o gasto com administração"
-            leitor_de_texto(texto)
-        st.markdown(""" <span style='color: #32CD32; font-weight: bold;'>
+            if st.button("Ouvir explicação", key="audio1"):
+                texto = "Terminologia: Custo é o gasto relativo à produção, Despesa é o gasto com administração"
+                leitor_de_texto(texto)
+            st.markdown(""" <span style='color: #32CD32; font-weight: bold;'>
                 TAREFA: FORMAR GRUPOS E REDIGIR UM TEXTO PARA INCLUIR EM ÁUDIO </span>""", unsafe_allow_html=True)    
-        st.divider()
-        
-        # 🚀 Desafio Prático
-        st.subheader("🚀 Mini Desafio: Identifique corretamente")
-        
-        with st.expander("🧠 Clique para participar"):
-            st.markdown("**Dado o seguinte item, como você denominaria?**")
-            item = st.selectbox(
-                "Item:",
-                ["Compra de um veículo para transporte na empresa",
-                 "Conta de energia elétrica da fábrica",
-                 "Salário do gerente administrativo",
-                 "Compra de mercadorias para revenda",
-                 "Desenvolvimento de um novo software interno"], index=None
+            st.divider()
+        
+            # 🚀 Desafio Prático
+            st.subheader("🚀 Mini Desafio: Identifique corretamente")
+        
+            secao, gerar = expander_preguicoso("🧠 Clique para participar", "intro_desafio")
+            with secao:
+                if gerar:
+                    st.markdown("**Dado o seguinte item, como você denominaria?**")
+                    item = st.selectbox(
+                        "Item:",
+                        ["Compra de um veículo para transporte na empresa",
+                         "Conta de energia elétrica da fábrica",
+                         "Salário do gerente administrativo",
+                         "Compra de mercadorias para revenda",
+                         "Desenvolvimento de um novo software interno"], index=None
+                    )
+        
+                    classificacao = st.radio(
+                        "Denominação:",
+                        ["Custo", "Despesa", "Investimento"], index=None
+                    )
+        
+                    if st.button("✅ Verificar a denominação"):
+                        respostas_certas = {
+                            "Compra de um veículo para transporte na empresa": "Investimento",
+                            "Conta de energia elétrica da fábrica": "Custo",
+                            "Salário do gerente administrativo": "Despesa",
+                            "Compra de mercadorias para revenda": "Custo",
+                            "Desenvolvimento de um novo software interno": "Investimento"
+                        }
+        
+                        correta = respostas_certas[item]
+                        if classificacao == correta:
+                            st.success(f"🎉 Correto! {item} é denominado como **{correta}**.")
+                        else:
+                            st.error(f"❌ Ops! {item} é na verdade **{correta}**.")
+        
+            st.divider()
+        
+            st.subheader("🚀 **Desafio Rápido!**")
+        
+            pergunta = st.radio(
+                "📌 Imagine que sua empresa comprou um notebook para ser usado pela equipe de vendas. Isso é:",
+                ("Investimento", "Custo", "Despesa", "Perda"),
+                    index=None
             )
         
-            classificacao = st.radio(
-                "Denominação:",
-                ["Custo", "Despesa", "Investimento"], index=None
-            )
-        
-            if st.button("✅ Verificar a denominação"):
-                respostas_certas = {
-                    "Compra de um veículo para transporte na empresa": "Investimento",
-                    "Conta de energia elétrica da fábrica": "Custo",
-                    "Salário do gerente administrativo": "Despesa",
-                    "Compra de mercadorias para revenda": "Custo",
-                    "Desenvolvimento de um novo software interno": "Investimento"
-                }
-        
-                correta = respostas_certas[item]
-                if classificacao == correta:
-                    st.success(f"🎉 Correto! {item} é denominado como **{correta}**.")
+            if pergunta:
+                if pergunta == "Investimento":
+                    st.success("✅ Correto! Inicialmente é um investimento, pois o bem ainda não foi consumido.")
                 else:
-                    st.error(f"❌ Ops! {item} é na verdade **{correta}**.")
-        
-        st.divider()
-        
-        st.subheader("🚀 **Desafio Rápido!**")
+                    st.error("❌ Não é bem isso. Quando compramos um notebook, ele ainda não foi usado, portanto é um investimento.")
         
-        pergunta = st.radio(
-            "📌 Imagine que sua empresa comprou um notebook para ser usado pela equipe de vendas. Isso é:",
-            ("Investimento", "Custo", "Despesa", "Perda"),
-                index=None
-        )
-        
-        if pergunta:
-            if pergunta == "Investimento":
-                st.success("✅ Correto! Inicialmente é um investimento, pois o bem ainda não foi consumido.")
-            else:
-                st.error("❌ Não é bem isso. Quando compramos um notebook, ele ainda não foi usado, portanto é um investimento.")
-        
-        st.markdown("---")
+            st.markdown("---")
         
-        st.subheader("🧠 **Quer testar mais seu conhecimento?**")
+            st.subheader("🧠 **Quer testar mais seu conhecimento?**")
         
-        if st.button("Clique para mais desafios"):
-            st.info("👉 Em breve você poderá acessar quizzes mais completos nesta plataforma!")
-        st.markdown(" ")
+            if st.button("Clique para mais desafios"):
+                st.info("👉 Em breve você poderá acessar quizzes mais completos nesta plataforma!")
+            st.markdown(" ")
         
-        st.markdown("Vá para o topo dessa página e clique em **📊 Classificação** para continuar!")
+            st.markdown("Vá para o topo dessa página e clique em **📊 Classificação** para continuar!")
         
-        # Registra navegação
-        if st.button("✅ Clique aqui se essa informação foi útil", key="tipos_gastos"):
-            safe_log_interacao(nome_usuario, pagina_atual, "viu_tipos_gastos_introducao")
+            # Registra navegação
+            if st.button("✅ Clique aqui se essa informação foi útil", key="tipos_gastos"):
+                safe_log_interacao(nome_usuario, pagina_atual, "viu_tipos_gastos_introducao")
 
     with tab2:  # Classificação
-        st.header("Classificação de Custos")
+        if gerar_tab2:
+            st.header("Classificação de Custos")
         
-        st.markdown(
-        """
+            st.markdown(
+            """
         <div style="background-color:#4FC3F7; padding:20px; border-radius:12px;
         box-shadow: 2px 2px 8px rgba(0,0,0,0.2)">
             <h4 style="color:#01579B;">📗 O que vamos diferenciar?</h4>
@@ -453,46 +749,47 @@ def main():
             </ul>
         </div>
         """,
-        unsafe_allow_html=True
-        )
+            unsafe_allow_html=True
+            )
 
-        col1, col2 = st.columns(2)
+            col1, col2 = st.columns(2)
         
-        with col1:
-            st.markdown("""
+            with col1:
+                st.markdown("""
             **Por Natureza:**
             - Custos Diretos
             - Custos indiretos
             """)
         
-        with col2:
-            st.markdown("""
+            with col2:
+                st.markdown("""
             **Por Comportamento:**
             - Fixos (não variam com produção)
             - Variáveis (variam proporcionalmente)
             - Mistos (parte fixa + parte variável)
             """)
 
-        # Introdução interativa
-        with st.expander("🔍 Por que classificar custos?", expanded=True):
-            st.markdown("""
+            # Introdução interativa
+            with st.expander("🔍 Por que classificar custos?", expanded=True):
+                st.markdown("""
             **A classificação adequada dos custos permite:**
             - Tomada de decisão mais precisa
             - Cálculo correto do custo dos produtos
             - Identificação de oportunidades de redução
             - Melhor planejamento orçamentário
             """)
-            st.image("https://cdn-icons-png.flaticon.com/512/3144/3144456.png", width=100)
+                st.image("https://cdn-icons-png.flaticon.com/512/3144/3144456.png", width=100)
         
-        # Abas para diferentes classificações
-        tb1, tb2 = st.tabs(["🔷 Natureza (Direto/Indireto)", "📊 Comportamento (Fixo/Variável)"])
+            # Abas para diferentes classificações
+            (tb1, gerar_tb1), (tb2, gerar_tb2) = abas_preguicosas(["🔷 Natureza (Direto/Indireto)", "📊 Comportamento (Fixo/Variável)"], "intro_classificacao")
         
-        with tb1:
-            st.subheader("Diretos vs. Indiretos")
-            col1, _, col2 = st.columns([1.5, 0.5, 1.5])
+            with tb1:
+                if gerar_tb1:
+                    st.subheader("Diretos vs. Indiretos")
+                    col1, _, col2 = st.columns([1.5, 0.5, 1.5])
             
-            with col1:
-                st.markdown("""
+                    with col1:
+                        st.markdown("""
                 **Custos Diretos:**
                 - Identificáveis diretamente no produto
                 - Exemplos:
@@ -501,8 +798,8 @@ def main():
                   - Mão de obra dedicada
                 """)
                 
-            with col2:
-                st.markdown("""
+                    with col2:
+                        st.markdown("""
                 **Custos Indiretos:**
                 - Não podem ser atribuídos diretamente
                 - Exemplos:
@@ -512,198 +809,73 @@ def main():
                 """)
              
                 
-            # Dados personalizados por produto
-            dados_produtos = {
-                "Smartphone": {
-                    "Direto": {
-                        "Tela LCD": 120,
-                        "Processador": 85,
-                        "Câmera": 60,
-                        "Bateria": 45
-                    },
-                    "Indireto": {
-                        "Energia": 30,
-                        "Depreciação": 15,
-                        "Logística": 25,
-                        "Embalagem": 10
-                    }
-                },
-                "Notebook": {
-                    "Direto": {
-                        "Tela LED": 200,
-                        "CPU": 150,
-                        "GPU": 120,
-                        "Memória RAM": 80
-                    },
-                    "Indireto": {
-                        "Manutenção": 40,
-                        "Transporte": 35,
-                        "Impostos": 50,
-                        "Seguro": 20
-                    }
-                },
-                "Tablet": {
-                    "Direto": {
-                        "Tela Touch": 90,
-                        "Chipset": 70,
-                        "Alto-falante": 30,
-                        "Conectividade": 25
-                    },
-                    "Indireto": {
-                        "Pesquisa": 20,
-                        "Marketing": 35,
-                        "Armazenamento": 15,
-                        "Suporte": 10
-                    }
-                }
-            }
+                    # Dados personalizados por produto
+                    dados_produtos = CONTEUDO["dados_produtos"]
             
-            # Interface no Streamlit
-            st.title("Vejamos um exemplo prático")
+                    # Interface no Streamlit
+                    st.title("Vejamos um exemplo prático")
             
-            colx1, colx2 = st.columns([1, 3])
+                    colx1, colx2 = st.columns([1, 3])
             
-            with colx1:
-                produto_selecionadox = st.selectbox(
-                    "Selecione um produto para análise:",
-                    list(dados_produtos.keys()),
-                    key="produto_selectx"
-                )
+                    with colx1:
+                        produto_selecionadox = st.selectbox(
+                            "Selecione um produto para análise:",
+                            list(dados_produtos.keys()),
+                            key="produto_selectx"
+                        )
             
-            with colx2:
-                # Prepara os dados para o DataFrame
-                dados_formatados = []
-                for tipo, itens in dados_produtos[produto_selecionadox].items():
-                    for item, valor in itens.items():
-                        dados_formatados.append({
-                            "Tipo": tipo,
-                            "Item": item,
-                            "Valor": valor,
-                            "Produto": produto_selecionadox
-                        })
-                
-                df = pd.DataFrame(dados_formatados)
-                
-                # Cria o gráfico Sunburst
-                fig = px.sunburst(
-                    df,
-                    path=['Tipo', 'Item'],
-                    values='Valor',
-                    color='Tipo',
-                    color_discrete_map={'Direto': '#4CAF50', 'Indireto': '#FF9800'},
-                    title=f"Composição de Custos - {produto_selecionadox}",
-                    branchvalues='total'
-                )
-                
-                # Ajustes de layout
-                fig.update_layout(margin=dict(t=50, l=0, r=0, b=0))
-                fig.update_traces(textinfo="label+percent parent", 
-                                  hovertemplate='<b>Custo %{parent}</b><br><b>%{label}</b><br>Valor: R$ %{value:.2f}<extra></extra>')
-                
-                st.plotly_chart(fig, width='stretch')
-                st.caption("🔎 Clique no gráfico para explorar a composição detalhada")
+                    with colx2:
+                        mostrar_figura("introducao_composicao", figura_composicao, dict(produto=produto_selecionadox))
+                        st.caption("🔎 Clique no gráfico para explorar a composição detalhada")
 
                 
-            # Registra navegação
-            if st.button("✅ Clique aqui se essa informação foi útil", key="classif_intro"):
-                safe_log_interacao(nome_usuario, pagina_atual, "viu_classificacao_introducao")
+                    # Registra navegação
+                    if st.button("✅ Clique aqui se essa informação foi útil", key="classif_intro"):
+                        safe_log_interacao(nome_usuario, pagina_atual, "viu_classificacao_introducao")
 
-            st.markdown("Vá no menu horizontal logo acima e clique em **📊 Comportamento (Fixo/Variável)** para continuar!")
+                    st.markdown("Vá no menu horizontal logo acima e clique em **📊 Comportamento (Fixo/Variável)** para continuar!")
                 
-        with tb2:
-            st.subheader("Fixos vs. Variáveis")
-            
-            # Simulador interativo
-            st.markdown("#### 📈 Simulador de Comportamento de Custos")
-            
-            col_fv1, col_fv2 = st.columns(2)
-            with col_fv1:
-                custo_fixo = st.slider("Custo Fixo Mensal (R$)", 1000, 50000, 15000)
-                custo_variavel_unit = st.slider("Custo Variável Unitário (R$)", 5, 200, 50)
-            
-            with col_fv2:
-                producao_min = st.slider("Produção Mínima (un)", 0, 500, 0)
-                producao_max = st.slider("Produção Máxima (un)", 500, 5000, 2000)
+            with tb2:
+                if gerar_tb2:
+                    st.subheader("Fixos vs. Variáveis")
             
-            # Gerar dados para o gráfico
-            qtd_producao = list(range(producao_min, producao_max+1, 50))
-            custo_total = [custo_fixo + custo_variavel_unit*q for q in qtd_producao]
+                    simulador_comportamento()
             
-            df = pd.DataFrame({
-                "Quantidade": qtd_producao,
-                "Custo Total": custo_total,
-                "Custo Fixo": custo_fixo,
-                "Custo Variável": [custo_variavel_unit*q for q in qtd_producao]
-            })
-            
-            fig = px.line(
-                df,
-                x="Quantidade",
-                y=["Custo Total", "Custo Fixo", "Custo Variável"],
-                labels={"value": "Custo (R$)", "variable": "Tipo de Custo"},
-                title="Comportamento dos Custos em Relação ao Volume de Produção"
-            )
-            
-            st.plotly_chart(fig, width='stretch')
-            
-            # Exemplos práticos
-            st.markdown("""
+                    # Exemplos práticos
+                    st.markdown("""
             **Exemplos Reais:**
             - 🏭 **Custo Fixo Típico:** Aluguel da fábrica, salários administrativos
             - 🚚 **Custo Variável Típico:** Matéria-prima, frete por unidade vendida
             - 💡 **Custo Misto:** Energia (parte fixa + parte variável pelo uso)
             """)
             
-            # Registra navegação
-            if st.button("✅ Clique aqui se essa informação foi útil", key="cfcv_intro"):
-                safe_log_interacao(nome_usuario, pagina_atual, "viu_cfcv_introducao")
+                    # Registra navegação
+                    if st.button("✅ Clique aqui se essa informação foi útil", key="cfcv_intro"):
+                        safe_log_interacao(nome_usuario, pagina_atual, "viu_cfcv_introducao")
 
-            st.markdown("Vá para o topo dessa página e clique em **📈 Comportamento** para continuar!")
+                    st.markdown("Vá para o topo dessa página e clique em **📈 Comportamento** para continuar!")
     
     with tab3:  # Comportamento
-        st.title("⚖️ Diferença entre Custos e Despesas")
-        st.subheader("🔍 Como os custos e as despesas impactam o resultado da empresa?")
+        if gerar_tab3:
+            st.title("⚖️ Diferença entre Custos e Despesas")
+            st.subheader("🔍 Como os custos e as despesas impactam o resultado da empresa?")
         
-        st.markdown("""
+            st.markdown("""
         > Entender a diferença entre **custos** e **despesas** é essencial para uma boa gestão financeira. Cada um tem um papel específico na formação do resultado da empresa.
         
         """)
         
-        st.divider()
-        
-        st.subheader("📊 **Relação dos Processos com Custos e Despesas**")
-        
-        # Criando o diagrama
-        grafico = graphviz.Digraph()
-        
-        grafico.attr('node', shape='box', style='rounded, filled', fillcolor='#f0f9f9')
+            st.divider()
         
-        # Processos
-        grafico.node('Prod', '🔧 Processo Produtivo')
-        grafico.node('RH', '👥 Recursos Humanos')
-        grafico.node('Mkt', '📢 Marketing')
-        grafico.node('Fin', '💰 Finanças')
-        grafico.node('Adm', '📑 Administrativo')
-        grafico.node('Outros', '➕ Outros')
+            st.subheader("📊 **Relação dos Processos com Custos e Despesas**")
         
-        # Receita e resultado
-        grafico.node('Rec', '💵 Receita\n(-) Custo das Mercadorias Vendidas\n= Lucro Bruto\n(-) Despesas Operacionais\n= Lucro Operacional', shape='rectangle', fillcolor='#d0eafc')
+            mostrar_diagrama(diagrama_processos(), "Relação dos Processos com Custos e Despesas")
         
-        # Conexões
-        grafico.edge('Prod', 'Rec', label='➡️ Custo')
-        grafico.edge('RH', 'Rec', label='➡️ Despesa')
-        grafico.edge('Mkt', 'Rec', label='➡️ Despesa')
-        grafico.edge('Fin', 'Rec', label='➡️ Despesa')
-        grafico.edge('Adm', 'Rec', label='➡️ Despesa')
-        grafico.edge('Outros', 'Rec', label='➡️ Despesa')
+            st.divider()
         
-        st.graphviz_chart(grafico)
+            st.subheader("💡 **Conceituando:**")
         
-        st.divider()
-        
-        st.subheader("💡 **Conceituando:**")
-        
-        st.markdown("""
+            st.markdown("""
         ### ✔️ **Custos**
         - São todos os gastos diretamente relacionados com o processo produtivo ou com a entrega do serviço.
         - Quando mais a produção ou venda cresce, mais os custos tendem a aumentar proporcionalmente.
@@ -714,11 +886,11 @@ def main():
         - ➕ **Exemplos:** salários da administração, despesas de marketing, aluguel da sede, energia da área administrativa, honorários da contabilidade.
         """)
     
-        st.divider()
+            st.divider()
         
-        st.subheader("🧠 **Impacto na Demonstração do Resultado:**")
+            st.subheader("🧠 **Impacto na Demonstração do Resultado:**")
         
-        st.markdown("""
+            st.markdown("""
         - 🏭 **Custos** afetam o **Lucro Bruto**:
           > Receita - **Custo das Mercadorias Vendidas** = **Lucro Bruto**
         
@@ -726,79 +898,51 @@ def main():
           > Lucro Bruto - **Despesas Operacionais** = **Lucro Operacional**
         """)
         
-        st.divider()
+            st.divider()
         
-        st.subheader("🚀 **Desafio Interativo!**")
+            st.subheader("🚀 **Desafio Interativo!**")
         
-        pergunta = st.radio(
-            "Imagine que uma empresa contratou uma agência de marketing para fazer campanhas nas redes sociais. Esse gasto é:",
-            ("Custo", "Despesa"), index=None
-        )
+            pergunta = st.radio(
+                "Imagine que uma empresa contratou uma agência de marketing para fazer campanhas nas redes sociais. Esse gasto é:",
+                ("Custo", "Despesa"), index=None
+            )
         
-        if pergunta:
-            if pergunta == "Despesa":
-                st.success("✅ Correto! Marketing é uma despesa, pois não está diretamente ligado à produção.")
-            else:
-                st.error("❌ Não é isso. Marketing não é custo, pois não faz parte diretamente do processo produtivo.")
+            if pergunta:
+                if pergunta == "Despesa":
+                    st.success("✅ Correto! Marketing é uma despesa, pois não está diretamente ligado à produção.")
+                else:
+                    st.error("❌ Não é isso. Marketing não é custo, pois não faz parte diretamente do processo produtivo.")
         
-        st.markdown("---")
+            st.markdown("---")
         
-        st.subheader("🎯 **Mais Desafios?**")
+            st.subheader("🎯 **Mais Desafios?**")
         
-        if st.button("Quero mais perguntas!"):
-            st.info("Em breve teremos quizzes completos aqui na plataforma!")
+            if st.button("Quero mais perguntas!"):
+                st.info("Em breve teremos quizzes completos aqui na plataforma!")
         
-        st.info("""
+            st.info("""
         Se você entende essa diferença, já está à frente de muitos gestores no mercado.
         """)
         
-        st.title("⚖️ Custos x Despesas e seus impactos na DRE")
+            st.title("⚖️ Custos x Despesas e seus impactos na DRE")
         
-        st.subheader("🔍 Como custos e despesas se refletem no resultado da empresa?")
+            st.subheader("🔍 Como custos e despesas se refletem no resultado da empresa?")
         
-        st.markdown("""
+            st.markdown("""
         > Antes de tudo, precisamos entender que **custos** e **despesas** não são apenas conceitos contábeis — eles impactam diretamente os resultados financeiros da empresa, especialmente na **Demonstração do Resultado (DRE)**.
         """)
         
-        st.divider()
-        
-        st.subheader("📊 **Relação dos Processos com Custos, Despesas e a DRE**")
-        
-        # Criando o diagrama
-        grafico = graphviz.Digraph()
-        
-        grafico.attr('node', shape='box', style='rounded, filled', fillcolor='#f0f9f9')
-        
-        # Processos
-        grafico.node('Prod', '🔧 Processo Produtivo\n(Custos)')
-        grafico.node('RH', '👥 Recursos Humanos\n(Despesas)')
-        grafico.node('Mkt', '📢 Marketing\n(Despesas)')
-        grafico.node('Fin', '💰 Finanças\n(Despesas)')
-        grafico.node('Adm', '📑 Administrativo\n(Despesas)')
-        grafico.node('Outros', '➕ Outros\n(Despesas)')
-        
-        # Receita e DRE
-        grafico.node('Rec', '''💵 Receita
-        (-) Custo das Mercadorias Vendidas
-        = Lucro Bruto
-        (-) Despesas Operacionais
-        = Lucro Operacional''', shape='rectangle', fillcolor='#d0eafc')
+            st.divider()
         
-        # Conexões
-        grafico.edge('Prod', 'Rec', label='➡️ Custo (CMV)')
-        grafico.edge('RH', 'Rec', label='➡️ Despesa')
-        grafico.edge('Mkt', 'Rec', label='➡️ Despesa')
-        grafico.edge('Fin', 'Rec', label='➡️ Despesa')
-        grafico.edge('Adm', 'Rec', label='➡️ Despesa')
-        grafico.edge('Outros', 'Rec', label='➡️ Despesa')
+            st.subheader("📊 **Relação dos Processos com Custos, Despesas e a DRE**")
         
-        st.graphviz_chart(grafico)
+            mostrar_diagrama(diagrama_processos_dre(), "Relação dos Processos com Custos, Despesas e a DRE")
         
-        st.divider()
+            st.divider()
         
-        st.subheader("💡 **Conceituando:**")
+            st.subheader("💡 **Conceituando:**")
         
-        st.markdown("""
+            st.markdown("""
         ### ✔️ **Custos**
         - 🔧 São os gastos **diretamente ligados** à produção de bens ou serviços, ou à compra de mercadorias para revenda.
         - ➕ **Exemplos:** matéria-prima, salários da produção, energia da fábrica, depreciação de máquinas, custo de mercadorias para revenda.
@@ -812,277 +956,164 @@ def main():
         - 🔍 **Na DRE:** aparecem no grupo **"Despesas Operacionais"**, sendo deduzidas do **Lucro Bruto** para se chegar ao **Lucro Operacional.**
         """)
         
-        st.divider()
+            st.divider()
         
-        st.subheader("📈 **Visão simplificada da DRE:**")
-        st.markdown("""
+            st.subheader("📈 **Visão simplificada da DRE:**")
+            st.markdown("""
         A **Demonstração do Resultado do Exercício (DRE)** mostra o caminho do dinheiro na empresa:  
         Das **Receitas**, subtraímos os **Custos** e as **Despesas**, chegando ao **Lucro ou Prejuízo**.
         
         Vamos visualizar como isso funciona:
         """)
         
-        # 🔷 Layout visual da DRE
-        st.markdown("---")
-        st.markdown("### 🔷 **Estrutura da DRE:**")
+            # 🔷 Layout visual da DRE
+            st.markdown("---")
+            st.markdown("### 🔷 **Estrutura da DRE:**")
         
-        # Receita
-        st.markdown("""
+            # Receita
+            st.markdown("""
         <div style="background-color:#81C784; padding:15px; border-radius:10px;">
             <h4 style="color:#1B5E20;">🚀 Receita Bruta</h4>
             <p style="color:#212121;">Tudo que a empresa recebe pelas vendas de seus produtos ou serviços.</p>
         </div>
         """, unsafe_allow_html=True)
         
-        # (-) Custos
-        st.markdown("""
+            # (-) Custos
+            st.markdown("""
         <div style="background-color:#FFB74D; padding:15px; border-radius:10px;">
             <h4 style="color:#E65100;">⚙️ (-) Custos dos Produtos ou Serviços</h4>
             <p style="color:#212121;">São os gastos diretamente relacionados à produção ou entrega do serviço.</p>
         </div>
         """, unsafe_allow_html=True)
         
-        st.markdown("""
+            st.markdown("""
         <h3 style="text-align:center;">= Lucro Bruto</h3>
         """, unsafe_allow_html=True)
         
-        # (-) Despesas
-        st.markdown("""
+            # (-) Despesas
+            st.markdown("""
         <div style="background-color:#64B5F6; padding:15px; border-radius:10px;">
             <h4 style="color:#0D47A1;">🧾 (-) Despesas Operacionais</h4>
             <p style="color:#212121;">Gastos administrativos, comerciais, marketing, vendas, etc.</p>
         </div>
         """, unsafe_allow_html=True)
         
-        st.markdown("""
+            st.markdown("""
         <h3 style="text-align:center;">= Resultado Operacional</h3>
         """, unsafe_allow_html=True)
         
-        # Resultado
-        st.markdown("""
+            # Resultado
+            st.markdown("""
         <div style="background-color:#FFD54F; padding:15px; border-radius:10px;">
             <h4 style="color:#F57F17;">💰 Lucro ou Prejuízo</h4>
             <p style="color:#212121;">Resultado final após considerar receitas, custos e despesas.</p>
         </div>
         """, unsafe_allow_html=True)
         
-        st.markdown("---")
+            st.markdown("---")
         
-        # 🔥 Desafio prático — Montar a DRE
+            # 🔥 Desafio prático — Montar a DRE
         
-        st.markdown("## 🧠 **Desafio: Monte sua própria DRE!**")
+            st.markdown("## 🧠 **Desafio: Monte sua própria DRE!**")
         
-        with st.expander("🚀 Clique aqui para testar sua compreensão"):
-            st.markdown("Associe corretamente cada item à sua posição na DRE:")
+            secao, gerar = expander_preguicoso("🚀 Clique aqui para testar sua compreensão", "intro_compreensao")
+            with secao:
+                if gerar:
+                    st.markdown("Associe corretamente cada item à sua posição na DRE:")
         
-            itens_dre = {
-                "💰 Venda de produtos ou serviços": "Receita",
-                "🛠️ Compra de matéria-prima": "Custo",
-                "🔌 Energia elétrica da fábrica": "Custo",
-                "🏢 Aluguel do escritório": "Despesa",
-                "🧠 Salário do administrativo": "Despesa",
-                "🚛 Frete pago para entregar mercadorias": "Custo",
-                "🛒 Comissão de vendedores": "Despesa",
-            }
+                    itens_dre = {
+                        "💰 Venda de produtos ou serviços": "Receita",
+                        "🛠️ Compra de matéria-prima": "Custo",
+                        "🔌 Energia elétrica da fábrica": "Custo",
+                        "🏢 Aluguel do escritório": "Despesa",
+                        "🧠 Salário do administrativo": "Despesa",
+                        "🚛 Frete pago para entregar mercadorias": "Custo",
+                        "🛒 Comissão de vendedores": "Despesa",
+                    }
         
-            acertos = 0
-            for item, resposta_correta in itens_dre.items():
-                resposta = st.radio(
-                    f"{item}",
-                    ["Receita", "Custo", "Despesa"],
-                    index=None,
-                    key=item
-                )
-                if resposta:
-                    if resposta == resposta_correta:
-                        st.success(f"✅ Correto!")
-                        acertos += 1
+                    acertos = 0
+                    for item, resposta_correta in itens_dre.items():
+                        resposta = st.radio(
+                            f"{item}",
+                            ["Receita", "Custo", "Despesa"],
+                            index=None,
+                            key=item
+                        )
+                        if resposta:
+                            if resposta == resposta_correta:
+                                st.success(f"✅ Correto!")
+                                acertos += 1
+                            else:
+                                st.error(f"❌ Incorreto. A resposta certa é: **{resposta_correta}**")
+        
+                    if acertos == len(itens_dre):
+                        st.balloons()
+                        st.success("🎉 Excelente! Você classificou tudo corretamente!")
+                    elif acertos > 0:
+                        st.info(f"👍 Você acertou {acertos} de {len(itens_dre)}.")
                     else:
-                        st.error(f"❌ Incorreto. A resposta certa é: **{resposta_correta}**")
+                        st.warning("🚀 Vamos começar! Classifique os itens acima.")
         
-            if acertos == len(itens_dre):
-                st.balloons()
-                st.success("🎉 Excelente! Você classificou tudo corretamente!")
-            elif acertos > 0:
-                st.info(f"👍 Você acertou {acertos} de {len(itens_dre)}.")
-            else:
-                st.warning("🚀 Vamos começar! Classifique os itens acima.")
-        
-        # 🔗 Conclusão
-        st.markdown("""
+            # 🔗 Conclusão
+            st.markdown("""
         > 💡 Perceba como a estrutura da DRE ajuda a entender **onde estão os maiores gastos e como se forma o lucro da empresa.**  
         > Isso vale para empresas privadas, públicas, ONGs e qualquer organização!
         """)    
-        st.markdown("""
+            st.markdown("""
         """)
         
-        st.divider()
+            st.divider()
         
-        st.subheader("🚀 **Desafio Interativo!**")
+            st.subheader("🚀 **Desafio Interativo!**")
         
-        pergunta = st.radio(
-            "📢 A empresa paga aluguel da sua sede administrativa. Esse gasto é considerado:",
-            ("Custo", "Despesa"), index=None
-        )
+            pergunta = st.radio(
+                "📢 A empresa paga aluguel da sua sede administrativa. Esse gasto é considerado:",
+                ("Custo", "Despesa"), index=None
+            )
         
-        if pergunta:
-            if pergunta == "Despesa":
-                st.success("✅ Correto! É uma despesa, pois não está diretamente ligado à produção, mas sim ao suporte da operação.")
-            else:
-                st.error("❌ Incorreto. O aluguel da sede administrativa não faz parte do custo de produção.")
+            if pergunta:
+                if pergunta == "Despesa":
+                    st.success("✅ Correto! É uma despesa, pois não está diretamente ligado à produção, mas sim ao suporte da operação.")
+                else:
+                    st.error("❌ Incorreto. O aluguel da sede administrativa não faz parte do custo de produção.")
         
-        st.markdown("---")
+            st.markdown("---")
         
-        st.subheader("🎯 **Mais desafios ou simulações?**")
+            st.subheader("🎯 **Mais desafios ou simulações?**")
         
-        if st.button("Quero simular uma DRE!"):
-            st.info("🔧 Em breve vamos incluir uma planilha simuladora da DRE, mostrando como custos e despesas impactam o resultado.")
+            if st.button("Quero simular uma DRE!"):
+                st.info("🔧 Em breve vamos incluir uma planilha simuladora da DRE, mostrando como custos e despesas impactam o resultado.")
     
-        # Quiz interativo
-        with st.expander("🧩 Teste Seu Conhecimento"):
-            resposta = st.radio(
-                "O salário do supervisor de produção é classificado como:",
-                ["Custo Direto", "Custo Indireto", "Despesa"],
-                index=None
-            )
-            if resposta:
-                if resposta == "Custo Indireto":
-                    st.success("✅ Correto! É um custo indireto pois beneficia toda a produção.")
-                else:
-                    st.error("❌ Revise a classificação de custos indiretos")
+            # Quiz interativo
+            secao, gerar = expander_preguicoso("🧩 Teste Seu Conhecimento", "intro_teste")
+            with secao:
+                if gerar:
+                    resposta = st.radio(
+                        "O salário do supervisor de produção é classificado como:",
+                        ["Custo Direto", "Custo Indireto", "Despesa"],
+                        index=None
+                    )
+                    if resposta:
+                        if resposta == "Custo Indireto":
+                            st.success("✅ Correto! É um custo indireto pois beneficia toda a produção.")
+                        else:
+                            st.error("❌ Revise a classificação de custos indiretos")
                 
         
-        st.header("📊 Análise [Simples] de Impacto de Custos")
-        st.markdown("""
+            st.header("📊 Análise [Simples] de Impacto de Custos")
+            st.markdown("""
                     Custo Total = Custo Fixo + (Custo Variável Unitário × Quantidade)
                    
                     Ponto de Equilíbrio = (Custo Total + Despesas) / (PV - CVU)
                     """)
 
-        # Comportamento dos Custos
-        c1, c2 = st.columns([1, 3])
-        with c1:
-        # Controles interativos
-            st.markdown("""
-            """)
-        
-        with c2:
-            st.subheader("Parâmetros de Entrada")
-            cf = st.slider("Custos Fixos (R$):", 1000, 50000, 10000, 500, 
-                          help="Custos que não variam com o volume de produção")
-            cv = st.slider("Custo Variável Unitário (R$):", 1, 100, 15, 1,
-                          help="Custo adicional por unidade produzida")
-            q = st.slider("Quantidade Produzida:", 0, 1000, 200, 10,
-                         help="Volume total de unidades produzidas")
-            d = st.slider("Despesas (R$):", 1000, 50000, 10000, 500, 
-                         help="Total de Despesas")
-            p = st.slider("Preço de venda:", 1, 100, 20, 1,
-                         help="Preço unitário do produto")
-        
-        # Cálculos
-        ct = cf + (cv * q)
-        custo_medio = ct / q if q > 0 else 0
-        
-        # Métricas
-        st.divider()
-        col_met1, col_met2 = st.columns(2)
-        with col_met1:
-            st.metric("Custo Total Estimado", f"R$ {ct:,.2f}", 
-                     help="Soma de custos fixos e variáveis totais")
-        with col_met2:
-            st.metric("Custo Médio por Unidade", f"R$ {custo_medio:,.2f}" if q > 0 else "N/A",
-                     help="Custo total dividido pela quantidade produzida")
-        
-        col_met3, col_met4 = st.columns(2)
-        with col_met3:
-            percent_var = (cv * q) / ct * 100
-            st.metric("Participação dos Custos Variáveis", f"{percent_var:.1f}%",
-                     help="Quanto do custo total é variável")
-        with col_met4:
-            if p > cv:
-                peq = (cf+d)/(p-cv)
-                st.metric("Ponto de Equilíbrio", f"{int(peq)} unidades",
-                     help="Quantidade necessária para cobrir todos os custos")
-            elif p == cv:
-                st.markdown("""
-                Ponto de Equilíbrio = ERRO!<br>(Preço de Venda = Custo Unitário)
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown("""
-                CUIDADO! (Preço de Venda abaixo do Custo Unitário)
-                """)
-            
-        # Análise de sensibilidade
-        st.divider()
-        st.subheader("🔍 Análise de Sensibilidade")
-        
-        # Simulação de diferentes quantidades
-        q_range = np.linspace(0, q*2, 50)
-        ct_range = cf + (cv * q_range)
-        cm_range = ct_range / np.where(q_range > 0, q_range, 1)
-        
-        t1, t2 = st.tabs(["Gráfico de Custos", "Tabela de Dados"])
-        
-        with t1:
-            fig = px.line(x=q_range, y=ct_range, 
-                         labels={'x': 'Quantidade Produzida', 'y': 'Custo Total (R$)'},
-                         title="Relação entre Quantidade e Custo Total")
-            fig.add_vline(x=q, line_dash="dash", line_color="red",
-                         annotation_text=f"Quantidade Atual: {q}", 
-                         annotation_position="top left")
-            fig.update_layout(hovermode="x unified")
-            st.plotly_chart(fig, width='stretch')
-        
-        with t2:
-            df = pd.DataFrame({
-                'Quantidade': q_range.astype(int),
-                'Custo Total': ct_range,
-                'Custo Médio': cm_range
-            })
-            st.dataframe(df.style.format({
-                'Custo Total': 'R$ {:,.2f}',
-                'Custo Médio': 'R$ {:,.2f}'
-            }), width='stretch')
-        
-        # Análise de cenários
-        st.divider()
-        st.subheader("🌐 Análise de Cenários")
-        
-        scenarios = {
-            "Otimista (CV -20%)": cv * 0.8,
-            "Atual": cv,
-            "Pessimista (CV +20%)": cv * 1.2
-        }
-        
-        scenario_data = []
-        for name, cv_scenario in scenarios.items():
-            ct_scenario = cf + (cv_scenario * q)
-            scenario_data.append({
-                "Cenário": name,
-                "Custo Variável Unitário": cv_scenario,
-                "Custo Total": ct_scenario,
-                "Diferença": ct_scenario - ct
-            })
-        
-        df_scenarios = pd.DataFrame(scenario_data)
-                
-        fig2 = px.bar(df_scenarios, x='Cenário', y='Custo Total',
-                     color='Cenário',
-                     title="Comparação de Cenários",
-                     text=[f"R$ {x:,.2f}" for x in df_scenarios['Custo Total']])
-        fig2.update_layout(showlegend=False)
-        st.plotly_chart(fig2, width='stretch')
-
-        st.markdown("**Impacto de Variações no Custo Variável**")
-        st.dataframe(df_scenarios.style.format({
-            "Custo Variável Unitário": "R$ {:.2f}",
-            "Custo Total": "R$ {:,.2f}",
-            "Diferença": "R$ {:,.2f}"
-        }), hide_index=True, width='stretch')
-
-        # Explicação dos conceitos
-        with st.expander("📚 Explicação dos Conceitos"):
-            st.markdown("""
+            analise_impacto_custos()
+
+            # Explicação dos conceitos
+            secao, gerar = expander_preguicoso("📚 Explicação dos Conceitos", "intro_explicacao")
+            with secao:
+                if gerar:
+                    st.markdown("""
             **Análise de Impacto de Custos**:
             - **Custo Fixo**: Despesas que não mudam com o volume de produção (aluguel, salários)
             - **Custo Variável**: Custos diretamente ligados à produção (matéria-prima, embalagem)
@@ -1091,169 +1122,94 @@ def main():
             **Análise de Sensibilidade** mostra como mudanças nos parâmetros afetam os resultados.
             """)
 
-        st.markdown("""E aí?! **Já domina os termos básicos da gestão de custos**???<br> 
+            st.markdown("""E aí?! **Já domina os termos básicos da gestão de custos**???<br> 
         Se está ok, vamos então verificar se isso é verdade? Clique em **🧠 Quiz** no topo dessa página e bora mostrar que você é TOP!""", unsafe_allow_html=True)
         
-        # Registra navegação
-        if st.button("✅ Clique aqui se essa informação foi útil", key="desafios_intro"):
-            safe_log_interacao(nome_usuario, pagina_atual, "viu_desafios_introducao")
+            # Registra navegação
+            if st.button("✅ Clique aqui se essa informação foi útil", key="desafios_intro"):
+                safe_log_interacao(nome_usuario, pagina_atual, "viu_desafios_introducao")
 
-        # 🔜 Botão para próxima página
-        st.markdown(" ")
-        if st.button("👉 Avançar para o próximo tópico: Conhecer o Método de Custeio por Absorção"):
-            st.switch_page("pages/3_📊_Custeio_por_Absorcao.py")
+            # 🔜 Botão para próxima página
+            st.markdown(" ")
+            if st.button("👉 Avançar para o próximo tópico: Conhecer o Método de Custeio por Absorção"):
+                st.switch_page("pages/3_📊_Custeio_por_Absorcao.py")
 
     with tab4:  # Quiz
-        st.header("🧠 Quiz Interativo: Terminologia e Comportamento de Custos")
-        
-        # Inicialização da sessão para controle
-        if "pontuacao" not in st.session_state:
-            st.session_state.pontuacao = 0
-        if "respostas_usuario" not in st.session_state:
-            st.session_state.respostas_usuario = {}
-        if "quiz_reiniciar" not in st.session_state:
-            st.session_state.quiz_reiniciar = False
-        
-        # Função para reiniciar o quiz
-        def reiniciar_quiz():
-            st.session_state.pontuacao = 0
-            st.session_state.respostas_usuario.clear()
+        if gerar_tab4:
+            st.header("🧠 Quiz Interativo: Terminologia e Comportamento de Custos")
+        
+            # Partes 1 e 2 formam um único quiz (bancos "introducao_parte1" e "introducao_parte2")
+            quiz, estado = estado_quiz("introducao_parte1", "introducao_parte2")
+            n_parte1 = len(obter_banco().quiz("introducao_parte1"))
+        
+            # Função para reiniciar o quiz
+            def reiniciar_quiz():
+                estado.limpar()
                 
-        # --- QUIZ MULTIPLA ESCOLHA - PARTE 1 ---
-        st.subheader("🎯 Parte 1: Conceitos Básicos")
-        with st.expander("🔍 Clique aqui para responder ao primeiro bloco", expanded=False):
-            perguntas_parte1 = [
-                {
-                    "pergunta": "Qual das alternativas representa um investimento?",
-                    "opcoes": ["A) Depreciação de equipamentos", "B) Salário dos vendedores", "C) Aquisição de uma nova máquina", "D) Conta de luz da sede", "E) Gasto com propaganda"],
-                    "correta": "C",
-                    "tema": "Terminologia"
-                },
-                {
-                    "pergunta": "O que é considerado custo direto?",
-                    "opcoes": ["A) Aluguel da fábrica", "B) Materiais utilizados na produção", "C) Despesa com marketing", "D) Custo com energia elétrica", "E) Impostos sobre vendas"],
-                    "correta": "B",
-                    "tema": "Natureza de Custos"
-                },
-                {
-                    "pergunta": "Como são classificados os custos que permanecem constantes mesmo com aumento da produção?",
-                    "opcoes": ["A) Variáveis", "B) Semi-variáveis", "C) Fixos", "D) Diretos", "E) Indiretos"],
-                    "correta": "C",
-                    "tema": "Classificação de Custos"
-                },
-                {
-                    "pergunta": "Qual é um exemplo de desembolso?",
-                    "opcoes": ["A) Depreciação", "B) Compra de matéria-prima à vista", "C) Amortização", "D) Juros sobre capital próprio", "E) Perda por obsolescência"],
-                    "correta": "B",
-                    "tema": "Terminologia"
-                },
-                {
-                    "pergunta": "O comportamento de custo variável significa que ele:",
-                    "opcoes": ["A) Não muda com a produção", "B) É sempre fixo por unidade", "C) Aumenta proporcionalmente ao volume produzido", "D) Diminui com o tempo", "E) É irrelevante para decisão"],
-                    "correta": "C",
-                    "tema": "Comportamento de Custos"
-                }
-            ]
-        
-            for i, p in enumerate(perguntas_parte1):
-                resposta = st.radio(p["pergunta"], p["opcoes"], index=None, key=f"parte1_p{i}")
-                st.session_state.respostas_usuario[i] = resposta
-        
-        # --- QUIZ MULTIPLO ESCOLHA - PARTE 2 ---
-        st.subheader("🎯 Parte 2: Classificação e Comportamento de Custos")
-        with st.expander("🔍 Clique aqui para responder ao segundo bloco", expanded=False):
-            perguntas_parte2 = [
-                {
-                    "pergunta": "Depreciação de máquinas é considerada um custo:",
-                    "opcoes": ["A) Direto", "B) Variável", "C) Indireto", "D) Despesa", "E) Investimento"],
-                    "correta": "C",
-                    "tema": "Natureza de Custos"
-                },
-                {
-                    "pergunta": "Materiais diretos fazem parte da natureza dos custos de:",
-                    "opcoes": ["A) Administração", "B) Vendas", "C) Produção", "D) Marketing", "E) Finanças"],
-                    "correta": "C",
-                    "tema": "Natureza de Custos"
-                },
-                {
-                    "pergunta": "Sobre o custo semi-variável, é correto afirmar:",
-                    "opcoes": ["A) É totalmente fixo", "B) Varia somente com grandes alterações de produção", "C) Possui parte fixa e parte variável", "D) Sempre é indireto", "E) Nunca aparece nos relatórios financeiros"],
-                    "correta": "C",
-                    "tema": "Comportamento de Custos"
-                },
-                {
-                    "pergunta": "Custos fixos unitários:",
-                    "opcoes": ["A) Aumentam conforme a produção", "B) Diminuem com o aumento da produção", "C) São sempre zero", "D) São iguais aos custos variáveis", "E) Não existem"],
-                    "correta": "B",
-                    "tema": "Comportamento de Custos"
-                },
-                {
-                    "pergunta": "Perdas são definidas como:",
-                    "opcoes": ["A) Gastos normais da operação", "B) Eventos anormais e involuntários", "C) Custos fixos de longo prazo", "D) Investimentos não planejados", "E) Despesas estratégicas"],
-                    "correta": "B",
-                    "tema": "Terminologia"
-                }
-            ]
-        
-            for i, p in enumerate(perguntas_parte2):
-                resposta = st.radio(p["pergunta"], p["opcoes"], index=None, key=f"parte2_p{i}")
-                st.session_state.respostas_usuario[len(perguntas_parte1) + i] = resposta
-        
-        # --- VERIFICAR TODAS AS RESPOSTAS ---
-        if st.button("🔍 Verificar respostas", key="verificar_respostas"):
-            total_acertos = 0
-            todas_perguntas = perguntas_parte1 + perguntas_parte2
-        
-            for idx, p in enumerate(todas_perguntas):
-                resposta_usuario = st.session_state.respostas_usuario.get(idx)
-                if resposta_usuario and resposta_usuario[0] == p["correta"]:
-                    total_acertos += 1
-                    st.success(f"✅ Correto! ({p['tema']})")
-                else:
-                    st.error(f"❌ Incorreto. Resposta correta: {p['correta']} — {p['opcoes'][ord(p['correta']) - ord('A')]}. Justificativa: Veja o conteúdo relacionado a '{p['tema']}'.")
+            # --- QUIZ MULTIPLA ESCOLHA - PARTE 1 ---
+            st.subheader("🎯 Parte 1: Conceitos Básicos")
+            secao, gerar = expander_preguicoso("🔍 Clique aqui para responder ao primeiro bloco", "intro_quiz_parte1")
+            with secao:
+                if gerar:
+                    for i in range(n_parte1):
+                        pergunta_quiz(quiz, estado, i, quiz.questoes[i].enunciado, key=f"parte1_p{i}", index=None)
+        
+            # --- QUIZ MULTIPLO ESCOLHA - PARTE 2 ---
+            st.subheader("🎯 Parte 2: Classificação e Comportamento de Custos")
+            secao, gerar = expander_preguicoso("🔍 Clique aqui para responder ao segundo bloco", "intro_quiz_parte2")
+            with secao:
+                if gerar:
+                    for i in range(n_parte1, len(quiz)):
+                        pergunta_quiz(quiz, estado, i, quiz.questoes[i].enunciado, key=f"parte2_p{i - n_parte1}", index=None)
+        
+            # --- VERIFICAR TODAS AS RESPOSTAS ---
+            if st.button("🔍 Verificar respostas", key="verificar_respostas"):
+                total_acertos = quiz.enviar(estado)
+        
+                for p, nota in zip(quiz.questoes, estado.notas):
+                    if nota == CERTA:
+                        st.success(f"✅ Correto! ({p.tema})")
+                    else:
+                        letra = chr(ord('A') + int(p.resposta))
+                        st.error(f"❌ Incorreto. Resposta correta: {letra} — {p.texto_resposta}. Justificativa: Veja o conteúdo relacionado a '{p.tema}'.")
         
-            st.session_state.pontuacao = total_acertos
-            st.info(f"🎯 Você acertou **{total_acertos} de {len(todas_perguntas)}**.")
+                st.info(f"🎯 Você acertou **{total_acertos} de {len(quiz)}**.")
     
         
-        # --- FEEDBACK MOTIVACIONAL ---
-        if st.session_state.pontuacao > 0:
-            st.markdown("---")
-            st.subheader("🏆 Resultado Final")
-        
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                if st.session_state.pontuacao == len(todas_perguntas):
-                    st.balloons()
-                    st.success("🎉 Excelente! Você domina o tema!")
-                elif st.session_state.pontuacao >= 7:
-                    st.info("👍 Parabéns! Você está no caminho certo.")
-                else:
-                    st.warning("💡 Que tal revisar os conceitos de custos e terminologia?")
-            with col2:
-                st.metric(label="Pontuação", value=f"{st.session_state.pontuacao}/{len(todas_perguntas)}")
-        
-            # Sugestões de estudo
-            if st.session_state.pontuacao < len(todas_perguntas):
-                temas_a_estudar = set()
-                for idx, p in enumerate(todas_perguntas):
-                    resposta_usuario = st.session_state.respostas_usuario.get(idx)
-                    if resposta_usuario and resposta_usuario[0] != p["correta"]:
-                        temas_a_estudar.add(p["tema"])
-                if temas_a_estudar:
-                    st.markdown("📌 **Sugestões de revisão:**")
-                    for tema in temas_a_estudar:
-                        st.markdown(f"- Revisar: **{tema}**")
-                else:
-                    st.markdown("✅ Você acertou todas as perguntas!")
+            # --- FEEDBACK MOTIVACIONAL ---
+            if estado.pontuacao:
+                st.markdown("---")
+                st.subheader("🏆 Resultado Final")
+        
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    if estado.pontuacao == len(quiz):
+                        st.balloons()
+                        st.success("🎉 Excelente! Você domina o tema!")
+                    elif estado.pontuacao >= 7:
+                        st.info("👍 Parabéns! Você está no caminho certo.")
+                    else:
+                        st.warning("💡 Que tal revisar os conceitos de custos e terminologia?")
+                with col2:
+                    st.metric(label="Pontuação", value=f"{estado.pontuacao}/{len(quiz)}")
+        
+                # Sugestões de estudo
+                if estado.pontuacao < len(quiz):
+                    temas_a_estudar = quiz.temas_errados(estado)
+                    if temas_a_estudar:
+                        st.markdown("📌 **Sugestões de revisão:**")
+                        for tema in temas_a_estudar:
+                            st.markdown(f"- Revisar: **{tema}**")
+                    else:
+                        st.markdown("✅ Você acertou todas as perguntas!")
 
-        # Registra navegação
-        if st.button("✅ Clique aqui se você fez o Quiz", key="quiz_intro"):
-            safe_log_interacao(nome_usuario, pagina_atual, "fez_quiz_introducao")
+            # Registra navegação
+            if st.button("✅ Clique aqui se você fez o Quiz", key="quiz_intro"):
+                safe_log_interacao(nome_usuario, pagina_atual, "fez_quiz_introducao")
     
-        # --- BOTÃO PARA REINICIAR ---
-        if st.button("🔁 Reiniciar Quiz", key="reiniciar_quiz", on_click=reiniciar_quiz):
-            st.rerun()            
+            # --- BOTÃO PARA REINICIAR ---
+            if st.button("🔁 Reiniciar Quiz", key="reiniciar_quiz", on_click=reiniciar_quiz):
+                st.rerun()            
             
 if __name__ == "__main__":
-    main()
+    cronometrado("Introdução: página")(main)()
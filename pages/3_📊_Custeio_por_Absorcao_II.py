@@ -2,7 +2,16 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
-from utils import leitor_de_texto, get_anon_user_id, log_acesso_google, log_interacao_google, safe_log_interacao
+from utils import leitor_de_texto, get_anon_user_id, log_acesso_google, log_interacao_google, safe_log_interacao, abas_preguicosas, mostrar_figura
+
+def figura_cif_departamentos(deptos):
+    return px.pie(deptos, values='CIF Rateado', names='Departamento',
+                  title='Distribuição do CIF por Departamento')
+
+def figura_custo_produtos(produtos):
+    return px.bar(produtos, x='Produto', y='Custo Unitário',
+                  title='Custo Unitário por Produto',
+                  text_auto='.2f')
 
 def main():
     st.title("📈 Custeio por Absorção - Avançado")
@@ -20,142 +29,140 @@ def main():
         st.session_state[chave_log] = True
       
     # Divisão em abas para diferentes métodos
-    tab1, tab2, tab3 = st.tabs(["🏭 Rateio por Departamentos", "📊 Rateio por Produtos", "🧮 Cálculo Taxa CIF"])
+    (tab1, gerar_tab1), (tab2, gerar_tab2), (tab3, gerar_tab3) = abas_preguicosas(["🏭 Rateio por Departamentos", "📊 Rateio por Produtos", "🧮 Cálculo Taxa CIF"], "abs2_abas")
     
     with tab1:
-        st.header("Método de Departamentalização")
-        st.subheader("Dados de Entrada")
-        deptos = pd.DataFrame({
-            'Departamento': ['Montagem', 'Acabamento', 'Administração'],
-            'Custo Direto': [120000, 80000, 50000],
-            'Horas-Mod': [3000, 2000, 1000],
-            'Horas-Máquina': [1500, 1000, 500],
-            'Área (m²)': [800, 600, 400]
-        })
-        edited_deptos = st.data_editor(deptos, num_rows="dynamic")
+        if gerar_tab1:
+            st.header("Método de Departamentalização")
+            st.subheader("Dados de Entrada")
+            deptos = pd.DataFrame({
+                'Departamento': ['Montagem', 'Acabamento', 'Administração'],
+                'Custo Direto': [120000, 80000, 50000],
+                'Horas-Mod': [3000, 2000, 1000],
+                'Horas-Máquina': [1500, 1000, 500],
+                'Área (m²)': [800, 600, 400]
+            })
+            edited_deptos = st.data_editor(deptos, num_rows="dynamic")
         
-        criterio = st.selectbox(
-            "Critério de Rateio:",
-            ["Horas-Máquina", "Horas-MOD", "Área", "Custo Direto"],
-            key="depto"
-        )
+            criterio = st.selectbox(
+                "Critério de Rateio:",
+                ["Horas-Máquina", "Horas-MOD", "Área", "Custo Direto"],
+                key="depto"
+            )
     
-        st.subheader("Resultado do Rateio")
-        if st.button("Calcular Rateio", key="calc_depto"):
-            total_cif = st.number_input("Total CIF a Ratear (R$):", value=150000)
+            st.subheader("Resultado do Rateio")
+            if st.button("Calcular Rateio", key="calc_depto"):
+                total_cif = st.number_input("Total CIF a Ratear (R$):", value=150000)
             
-            if criterio == "Horas-Máquina":
-                base = edited_deptos['Horas-Máquina'].sum()
-                edited_deptos['% Rateio'] = edited_deptos['Horas-Máquina'] / base
-            elif criterio == "Horas-MOD":
-                base = edited_deptos['Horas-Mod'].sum()
-                edited_deptos['% Rateio'] = edited_deptos['Horas-Mod'] / base
-            elif criterio == "Área":
-                base = edited_deptos['Área (m²)'].sum()
-                edited_deptos['% Rateio'] = edited_deptos['Área (m²)'] / base
-            else:
-                base = edited_deptos['Custo Direto'].sum()
-                edited_deptos['% Rateio'] = edited_deptos['Custo Direto'] / base
+                if criterio == "Horas-Máquina":
+                    base = edited_deptos['Horas-Máquina'].sum()
+                    edited_deptos['% Rateio'] = edited_deptos['Horas-Máquina'] / base
+                elif criterio == "Horas-MOD":
+                    base = edited_deptos['Horas-Mod'].sum()
+                    edited_deptos['% Rateio'] = edited_deptos['Horas-Mod'] / base
+                elif criterio == "Área":
+                    base = edited_deptos['Área (m²)'].sum()
+                    edited_deptos['% Rateio'] = edited_deptos['Área (m²)'] / base
+                else:
+                    base = edited_deptos['Custo Direto'].sum()
+                    edited_deptos['% Rateio'] = edited_deptos['Custo Direto'] / base
             
-            edited_deptos['CIF Rateado'] = edited_deptos['% Rateio'] * total_cif
-            edited_deptos['Custo Total'] = edited_deptos['Custo Direto'] + edited_deptos['CIF Rateado']
+                edited_deptos['CIF Rateado'] = edited_deptos['% Rateio'] * total_cif
+                edited_deptos['Custo Total'] = edited_deptos['Custo Direto'] + edited_deptos['CIF Rateado']
             
-            st.dataframe(edited_deptos.style.format({
-                '% Rateio': '{:.1%}',
-                'CIF Rateado': 'R$ {:,.2f}',
-                'Custo Total': 'R$ {:,.2f}'
-            }))
+                st.dataframe(edited_deptos.style.format({
+                    '% Rateio': '{:.1%}',
+                    'CIF Rateado': 'R$ {:,.2f}',
+                    'Custo Total': 'R$ {:,.2f}'
+                }))
             
-            # Gráfico de composição
-            fig = px.pie(edited_deptos, values='CIF Rateado', names='Departamento',
-                        title='Distribuição do CIF por Departamento')
-            st.plotly_chart(fig, use_container_width=True)
+                # Gráfico de composição
+                mostrar_figura("absorcao_cif_departamentos", figura_cif_departamentos, dict(deptos=edited_deptos))
     
     with tab2:
-        st.header("Rateio por Linha de Produtos")
+        if gerar_tab2:
+            st.header("Rateio por Linha de Produtos")
         
-        produtos = pd.DataFrame({
-            'Produto': ['Cadeira', 'Mesa', 'Armário'],
-            'Unidades Produzidas': [500, 300, 200],
-            'Horas-MOD': [2000, 1500, 1000],
-            'MP Consumida': [40000, 35000, 25000]
-        })
+            produtos = pd.DataFrame({
+                'Produto': ['Cadeira', 'Mesa', 'Armário'],
+                'Unidades Produzidas': [500, 300, 200],
+                'Horas-MOD': [2000, 1500, 1000],
+                'MP Consumida': [40000, 35000, 25000]
+            })
         
-        col1, col2 = st.columns(2)
+            col1, col2 = st.columns(2)
         
-        with col1:
-            st.subheader("Dados de Produção")
-            edited_prod = st.data_editor(produtos, num_rows="dynamic")
+            with col1:
+                st.subheader("Dados de Produção")
+                edited_prod = st.data_editor(produtos, num_rows="dynamic")
             
-            criterio_prod = st.selectbox(
-                "Critério de Rateio:",
-                ["Unidades", "Horas-MOD", "MP Consumida"],
-                key="prod"
-            )
+                criterio_prod = st.selectbox(
+                    "Critério de Rateio:",
+                    ["Unidades", "Horas-MOD", "MP Consumida"],
+                    key="prod"
+                )
             
-            cif_total = st.number_input("Total CIF (R$):", value=90000, key="cif_prod")
+                cif_total = st.number_input("Total CIF (R$):", value=90000, key="cif_prod")
         
-        with col2:
-            st.subheader("Custo Unitário por Produto")
-            if st.button("Calcular Rateio", key="calc_prod"):
-                if criterio_prod == "Unidades":
-                    base = edited_prod['Unidades Produzidas'].sum()
-                    edited_prod['% Rateio'] = edited_prod['Unidades Produzidas'] / base
-                elif criterio_prod == "Horas-MOD":
-                    base = edited_prod['Horas-MOD'].sum()
-                    edited_prod['% Rateio'] = edited_prod['Horas-MOD'] / base
-                else:
-                    base = edited_prod['MP Consumida'].sum()
-                    edited_prod['% Rateio'] = edited_prod['MP Consumida'] / base
+            with col2:
+                st.subheader("Custo Unitário por Produto")
+                if st.button("Calcular Rateio", key="calc_prod"):
+                    if criterio_prod == "Unidades":
+                        base = edited_prod['Unidades Produzidas'].sum()
+                        edited_prod['% Rateio'] = edited_prod['Unidades Produzidas'] / base
+                    elif criterio_prod == "Horas-MOD":
+                        base = edited_prod['Horas-MOD'].sum()
+                        edited_prod['% Rateio'] = edited_prod['Horas-MOD'] / base
+                    else:
+                        base = edited_prod['MP Consumida'].sum()
+                        edited_prod['% Rateio'] = edited_prod['MP Consumida'] / base
                 
-                edited_prod['CIF Rateado'] = edited_prod['% Rateio'] * cif_total
-                edited_prod['Custo Unitário'] = (edited_prod['MP Consumida'] + edited_prod['Horas-MOD'] * 25 + edited_prod['CIF Rateado']) / edited_prod['Unidades Produzidas']
+                    edited_prod['CIF Rateado'] = edited_prod['% Rateio'] * cif_total
+                    edited_prod['Custo Unitário'] = (edited_prod['MP Consumida'] + edited_prod['Horas-MOD'] * 25 + edited_prod['CIF Rateado']) / edited_prod['Unidades Produzidas']
                 
-                st.dataframe(edited_prod.style.format({
-                    '% Rateio': '{:.1%}',
-                    'CIF Rateado': 'R$ {:,.2f}',
-                    'Custo Unitário': 'R$ {:,.2f}'
-                }))
+                    st.dataframe(edited_prod.style.format({
+                        '% Rateio': '{:.1%}',
+                        'CIF Rateado': 'R$ {:,.2f}',
+                        'Custo Unitário': 'R$ {:,.2f}'
+                    }))
                 
-                # Gráfico comparativo
-                fig = px.bar(edited_prod, x='Produto', y='Custo Unitário',
-                            title='Custo Unitário por Produto',
-                            text_auto='.2f')
-                st.plotly_chart(fig, use_container_width=True)
+                    # Gráfico comparativo
+                    mostrar_figura("absorcao_custo_produtos", figura_custo_produtos, dict(produtos=edited_prod))
     
     with tab3:
-        st.header("Taxa de Aplicação de CIF")
+        if gerar_tab3:
+            st.header("Taxa de Aplicação de CIF")
         
-        st.markdown("""
+            st.markdown("""
         **Fórmula:**  
         `Taxa CIF = (CIF Total / Base de Rateio) × 100`  
         *Onde a base pode ser horas-máquina, MOD, etc.*
         """)
         
-        col1, col2 = st.columns(2)
+            col1, col2 = st.columns(2)
         
-        with col1:
-            st.subheader("Cálculo da Taxa")
-            cif_total = st.number_input("CIF Total (R$):", value=180000)
-            base_rateio = st.number_input("Base de Rateio (ex: horas-máquina):", value=3000)
-            st.metric("Taxa de Aplicação", f"R$ {cif_total/base_rateio:,.2f} por unidade de base")
+            with col1:
+                st.subheader("Cálculo da Taxa")
+                cif_total = st.number_input("CIF Total (R$):", value=180000)
+                base_rateio = st.number_input("Base de Rateio (ex: horas-máquina):", value=3000)
+                st.metric("Taxa de Aplicação", f"R$ {cif_total/base_rateio:,.2f} por unidade de base")
             
-            st.subheader("Aplicação Prática")
-            horas_produto = st.number_input("Horas consumidas pelo produto:", value=150)
-            st.metric("CIF Alocado", f"R$ {(cif_total/base_rateio)*horas_produto:,.2f}")
+                st.subheader("Aplicação Prática")
+                horas_produto = st.number_input("Horas consumidas pelo produto:", value=150)
+                st.metric("CIF Alocado", f"R$ {(cif_total/base_rateio)*horas_produto:,.2f}")
         
-        with col2:
-            st.subheader("Exemplo Real")
-            st.write("**Indústria Automobilística**")
-            st.markdown("""
+            with col2:
+                st.subheader("Exemplo Real")
+                st.write("**Indústria Automobilística**")
+                st.markdown("""
             - CIF Anual: R$ 12.000.000  
             - Horas-Máquina Anuais: 24.000  
             - Taxa: R$ 500/hora-máquina  
             - Carro X usa 8 horas: R$ 4.000 de CIF
             """)
             
-            st.write("**Fábrica de Móveis**")
-            st.markdown("""
+                st.write("**Fábrica de Móveis**")
+                st.markdown("""
             - CIF Mensal: R$ 150.000  
             - MOD Mensal: R$ 300.000  
             - Taxa: 50% da MOD  
@@ -0,0 +1,104 @@
+import hmac
+import json
+import os
+
+import pandas as pd
+import streamlit as st
+
+from audio import situacao_audio
+from diagramas import obter_diagramas
+from graficos import situacao_figuras
+from registro import situacao_envio
+from sessao import obter_armazem, obter_gerenciador
+from utils import situacao_tempos
+
+# Página restrita: só abre com ?token=... ou digitando o token configurado
+TOKEN_ADMIN = os.environ.get("GESTAO_ADMIN_TOKEN", "")
+# Quantidade de maiores consumidores listada em cada visão (?top=...)
+TOP_PADRAO, TOP_MAX = 15, 200
+
+
+def autorizado():
+    if not TOKEN_ADMIN:
+        st.info("Página de administração desativada (defina GESTAO_ADMIN_TOKEN).")
+        return False
+    fornecido = st.query_params.get("token") or st.text_input("Token de administração", type="password")
+    return bool(fornecido) and hmac.compare_digest(fornecido, TOKEN_ADMIN)
+
+
+def parametro_top():
+    """Valor de ``?top=`` limitado a 1..TOP_MAX; inválido ou ausente usa TOP_PADRAO."""
+    try:
+        top = int(st.query_params.get("top", TOP_PADRAO))
+    except ValueError:
+        return TOP_PADRAO
+    return min(max(top, 1), TOP_MAX)
+
+
+def mb(n):
+    return n / (1024 * 1024)
+
+
+def tabela(itens):
+    df = pd.DataFrame(itens)
+    if not df.empty:
+        df["MB"] = df.pop("bytes").map(mb).round(3)
+    return df
+
+
+def main():
+    st.title("🛠️ Administração")
+    if not autorizado():
+        st.stop()
+
+    perfil = obter_gerenciador().perfil(top=parametro_top())
+    if st.query_params.get("formato") == "json":
+        # Saída só com o JSON, para coleta automática
+        st.json(perfil)
+        st.stop()
+
+    st.subheader("Memória das sessões")
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Sessões vivas", perfil["sessoes"])
+    c2.metric("Total (MB)", f"{mb(perfil['bytes_total']):.1f}", help=f"Limite: {mb(perfil['limite_total']):.0f} MB")
+    c3.metric("Média por sessão (MB)", f"{mb(perfil['bytes_medio']):.2f}")
+    c4.metric("p95 por sessão (MB)", f"{mb(perfil['bytes_p95']):.2f}",
+              help=f"Máximo: {mb(perfil['bytes_max']):.2f} MB; limite: {mb(perfil['limite_sessao']):.0f} MB")
+
+    st.markdown("**Maiores chaves** (somadas entre as sessões; números nas chaves viram `#`)")
+    st.dataframe(tabela(perfil["por_chave"]), hide_index=True, width='stretch')
+    col_sessoes, col_tipos = st.columns(2)
+    with col_sessoes:
+        st.markdown("**Maiores sessões**")
+        st.dataframe(tabela(perfil["por_sessao"]), hide_index=True, width='stretch')
+    with col_tipos:
+        st.markdown("**Por tipo de objeto**")
+        st.dataframe(tabela(perfil["por_tipo"]), hide_index=True, width='stretch')
+
+    st.download_button("Baixar perfil (JSON)", json.dumps(perfil, ensure_ascii=False, indent=2),
+                       file_name=f"perfil_sessoes_{perfil['medido_em']}.json", mime="application/json")
+
+    with st.expander("Ciclo de vida e armazenamento das sessões"):
+        st.json({"ciclo": obter_gerenciador().situacao(), "armazem": obter_armazem().estatisticas})
+    with st.expander("Envio de logs"):
+        try:
+            st.json(situacao_envio())
+        except Exception as e:
+            st.warning(f"Situação do envio indisponível: {e}")
+    with st.expander("Cache de áudio"):
+        st.json(situacao_audio())
+    with st.expander("Cache de figuras"):
+        figuras = situacao_figuras()
+        st.caption(f"{figuras['itens']} figuras, {figuras['mb']:.2f} de {figuras['limite_mb']:.0f} MB; "
+                   f"taxa de acerto geral: {figuras['taxa_acerto']:.0%}")
+        st.dataframe(pd.DataFrame.from_dict(figuras["por_figura"], orient="index").rename_axis("figura"),
+                     width='stretch')
+    with st.expander("Diagramas pré-renderizados"):
+        st.json(obter_diagramas().situacao())
+    with st.expander("Tempos de execução (páginas e fragmentos)"):
+        tempos = pd.DataFrame.from_dict(situacao_tempos(), orient="index")
+        st.dataframe(tempos.rename_axis("bloco"), width='stretch')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""Recursos do Google Sheets compartilhados pelo processo.
+
+O cliente ``gspread`` é autenticado uma única vez e os objetos de
+planilha e de aba ficam em cache por um tempo limitado (TTL), evitando
+as chamadas de metadados repetidas a cada evento registrado.
+"""
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+NOME_PLANILHA = "Logs-gestao-custos"
+TTL_RECURSOS = float(os.environ.get("GESTAO_SHEETS_TTL", "600"))
+# Cota padrão da API do Sheets: 60 requisições de escrita por minuto por conta
+COTA_POR_MINUTO = float(os.environ.get("GESTAO_SHEETS_COTA", "60"))
+FALHAS_PARA_ABRIR = int(os.environ.get("GESTAO_SHEETS_FALHAS", "3"))
+ESPERA_INICIAL = float(os.environ.get("GESTAO_SHEETS_ESPERA", "5"))
+ESPERA_MAXIMA = float(os.environ.get("GESTAO_SHEETS_ESPERA_MAX", "300"))
+
+
+def _cliente_dos_secrets():
+    """Autentica a conta de serviço configurada nos secrets do Streamlit."""
+    import gspread
+    from streamlit import secrets
+    return gspread.service_account_from_dict(secrets["gspread"])
+
+
+class RecursosPlanilha:
+    """Cache de cliente, planilhas e abas com expiração por TTL."""
+
+    def __init__(self, criar_cliente=_cliente_dos_secrets, ttl=TTL_RECURSOS, relogio=time.monotonic):
+        self.criar_cliente = criar_cliente
+        self.ttl = ttl
+        self.relogio = relogio
+        self._cliente = None
+        self._planilhas = {}
+        self._abas = {}
+        # A trava só protege os caches; as chamadas de rede são feitas fora
+        # dela, e quem pede um handle que já está sendo aberto espera o evento
+        self._lock = threading.Lock()
+        self._lock_cliente = threading.Lock()
+        self._abrindo = {}  # (cache, chave) -> Event da abertura em curso
+        self.estatisticas = {"autenticacoes": 0, "autenticacoes_evitadas": 0,
+                             "aberturas": 0, "aberturas_evitadas": 0, "abas_criadas": 0}
+
+    def cliente(self):
+        """Retorna o cliente autenticado, criando-o na primeira chamada."""
+        with self._lock:
+            if self._cliente is not None:
+                self.estatisticas["autenticacoes_evitadas"] += 1
+                return self._cliente
+        with self._lock_cliente:
+            with self._lock:
+                cliente = self._cliente
+            if cliente is None:
+                cliente = self.criar_cliente()
+                with self._lock:
+                    self._cliente = cliente
+                    self.estatisticas["autenticacoes"] += 1
+            else:
+                with self._lock:
+                    self.estatisticas["autenticacoes_evitadas"] += 1
+            return cliente
+
+    def _do_cache(self, cache, chave, abrir):
+        em_curso = (id(cache), chave)
+        while True:
+            with self._lock:
+                item = cache.get(chave)
+                if item is not None and item[1] > self.relogio():
+                    self.estatisticas["aberturas_evitadas"] += 1
+                    return item[0]
+                evento = self._abrindo.get(em_curso)
+                if evento is None:
+                    evento = self._abrindo[em_curso] = threading.Event()
+                    break
+            # Outra thread está abrindo o mesmo handle: usa o dela (ou tenta de novo se falhou)
+            evento.wait()
+        try:
+            objeto = abrir()
+            with self._lock:
+                self.estatisticas["aberturas"] += 1
+                cache[chave] = (objeto, self.relogio() + self.ttl)
+            return objeto
+        finally:
+            with self._lock:
+                self._abrindo.pop(em_curso, None)
+            evento.set()
+
+    def planilha(self, nome=NOME_PLANILHA):
+        """Retorna a planilha pelo nome, reaproveitando o handle em cache."""
+        return self._do_cache(self._planilhas, nome, lambda: self.cliente().open(nome))
+
+    def aba(self, nome_aba, planilha=NOME_PLANILHA, cabecalho=None):
+        """Retorna a aba da planilha, reaproveitando o handle em cache.
+
+        Com ``cabecalho``, a aba é criada (já com a linha de títulos) caso
+        ainda não exista, como acontece na virada de cada período de log.
+        """
+        return self._do_cache(self._abas, (planilha, nome_aba),
+                              lambda: self._abrir_aba(planilha, nome_aba, cabecalho))
+
+    def _abrir_aba(self, planilha, nome_aba, cabecalho):
+        from gspread.exceptions import WorksheetNotFound
+        documento = self.planilha(planilha)
+        try:
+            return documento.worksheet(nome_aba)
+        except WorksheetNotFound:
+            if not cabecalho:
+                raise
+        logger.info("Criando a aba %s na planilha %s", nome_aba, planilha)
+        aba = documento.add_worksheet(title=nome_aba, rows=1, cols=len(cabecalho))
+        aba.append_row(list(cabecalho))
+        with self._lock:
+            self.estatisticas["abas_criadas"] += 1
+        return aba
+
+    def invalidar(self, nome_aba=None, planilha=NOME_PLANILHA):
+        """Descarta handles possivelmente obsoletos para que sejam reabertos."""
+        with self._lock:
+            if nome_aba is None:
+                self._planilhas.pop(planilha, None)
+                for chave in [c for c in self._abas if c[0] == planilha]:
+                    del self._abas[chave]
+            else:
+                self._abas.pop((planilha, nome_aba), None)
+
+    def reiniciar(self):
+        """Descarta o cliente e todos os handles (ex.: credenciais expiradas)."""
+        with self._lock:
+            self._cliente = None
+            self._planilhas.clear()
+            self._abas.clear()
+
+
+class BaldeDeTokens:
+    """Limitador de taxa: permite rajadas até a capacidade e repõe a uma taxa fixa."""
+
+    def __init__(self, capacidade=COTA_POR_MINUTO, por_segundo=COTA_POR_MINUTO / 60,
+                 relogio=time.monotonic):
+        self.capacidade = capacidade
+        self.por_segundo = por_segundo
+        self.relogio = relogio
+        self._tokens = capacidade
+        self._ultimo = relogio()
+        self._lock = threading.Lock()
+
+    def _repor(self):
+        agora = self.relogio()
+        self._tokens = min(self.capacidade, self._tokens + (agora - self._ultimo) * self.por_segundo)
+        self._ultimo = agora
+
+    def disponivel(self, n=1):
+        """Indica se há tokens para n requisições, sem consumi-los."""
+        with self._lock:
+            self._repor()
+            return self._tokens >= n
+
+    def consumir(self, n=1):
+        """Consome n tokens; retorna False se a cota do momento não permitir."""
+        with self._lock:
+            self._repor()
+            if self._tokens < n:
+                return False
+            self._tokens -= n
+            return True
+
+    def tokens(self):
+        with self._lock:
+            self._repor()
+            return self._tokens
+
+
+class Disjuntor:
+    """Circuit breaker: suspende as chamadas após falhas seguidas e testa de novo
+    com espera exponencial."""
+
+    FECHADO = "fechado"
+    ABERTO = "aberto"
+    SEMIABERTO = "semiaberto"
+
+    def __init__(self, falhas_para_abrir=FALHAS_PARA_ABRIR, espera_inicial=ESPERA_INICIAL,
+                 espera_maxima=ESPERA_MAXIMA, relogio=time.monotonic):
+        self.falhas_para_abrir = falhas_para_abrir
+        self.espera_inicial = espera_inicial
+        self.espera_maxima = espera_maxima
+        self.relogio = relogio
+        self.estado = self.FECHADO
+        self.falhas_seguidas = 0
+        self.espera = espera_inicial
+        self.proxima_tentativa = 0.0
+        self.aberturas = 0
+        self._lock = threading.Lock()
+
+    def permitir(self):
+        """Indica se uma chamada pode ser feita agora (no máximo uma sonda quando aberto)."""
+        with self._lock:
+            if self.estado == self.FECHADO:
+                return True
+            if self.estado == self.ABERTO and self.relogio() >= self.proxima_tentativa:
+                self.estado = self.SEMIABERTO
+                return True
+            return False
+
+    def registrar_sucesso(self):
+        with self._lock:
+            self.estado = self.FECHADO
+            self.falhas_seguidas = 0
+            self.espera = self.espera_inicial
+
+    def registrar_falha(self):
+        with self._lock:
+            self.falhas_seguidas += 1
+            if self.estado == self.SEMIABERTO:
+                # A sonda falhou: dobra a espera até o limite
+                self.espera = min(self.espera * 2, self.espera_maxima)
+            elif self.falhas_seguidas < self.falhas_para_abrir:
+                return
+            self.estado = self.ABERTO
+            self.aberturas += 1
+            self.proxima_tentativa = self.relogio() + self.espera
+
+    def situacao(self):
+        with self._lock:
+            return {"estado": self.estado,
+                    "falhas_seguidas": self.falhas_seguidas,
+                    "espera_atual": self.espera,
+                    "aberturas": self.aberturas,
+                    "proxima_tentativa_em": max(0.0, self.proxima_tentativa - self.relogio())
+                    if self.estado == self.ABERTO else 0.0}
+
+
+_recursos = None
+_recursos_lock = threading.Lock()
+
+
+def obter_recursos():
+    """Retorna o cache de recursos do Google Sheets compartilhado pelo processo."""
+    global _recursos
+    with _recursos_lock:
+        if _recursos is None:
+            _recursos = RecursosPlanilha()
+        return _recursos
@@ -0,0 +1,468 @@
+"""Motor único dos quizzes: banco de questões indexado e corretor compartilhado.
+
+As questões de todos os quizzes ficam em ``conteudo/questoes.json`` em um
+esquema só (tipo, enunciado, opções, resposta, tolerância, explicação,
+tema e dificuldade). O banco é compilado uma vez por processo: cada quiz
+vira um ``Quiz`` imutável com o gabarito em arrays NumPy, e o estado de
+cada aluno (``EstadoQuiz``) são alguns arrays pequenos. A correção é
+incremental: só as respostas alteradas desde a última correção são
+avaliadas.
+
+Para corrigir uma turma inteira fora do app (arquivo de respostas de
+muitos alunos), use ``corrigir_turma`` ou a linha de comando:
+
+    python quiz.py respostas.csv --quiz simulado_absorcao --saida notas/
+"""
+import argparse
+import os
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from conteudo import carregar_conteudo
+
+MULTIPLA = "multipla"
+VERDADEIRO_FALSO = "vf"
+NUMERICA = "numerica"
+TIPOS_QUESTAO = (MULTIPLA, VERDADEIRO_FALSO, NUMERICA)
+DIFICULDADES = ("basico", "intermediario", "avancado")
+OPCOES_VF = ("Verdadeiro", "Falso")
+# Tolerância das questões numéricas sem ``tolerancia`` explícita (fração da resposta)
+TOLERANCIA_RELATIVA = 0.01
+
+# Valores de EstadoQuiz.notas
+SEM_RESPOSTA, ERRADA, CERTA = -1, 0, 1
+
+
+@dataclass(frozen=True, slots=True)
+class Questao:
+    id: str
+    tipo: str
+    enunciado: str
+    opcoes: tuple
+    resposta: float
+    tolerancia: float
+    explicacao: str
+    tema: str
+    dificuldade: str
+
+    @property
+    def numerica(self):
+        return self.tipo == NUMERICA
+
+    @property
+    def texto_resposta(self):
+        """Resposta correta como aparece para o aluno."""
+        if self.numerica:
+            return f"{self.resposta:,.2f}"
+        return self.opcoes[int(self.resposta)]
+
+
+def compilar_questao(banco, i, bruta, tema, dificuldade):
+    """Questao a partir de um item de ``questoes.json``; valida tipo e resposta."""
+    tipo = bruta["tipo"]
+    ident = f"{banco}/{i + 1}"
+    if tipo not in TIPOS_QUESTAO:
+        raise ValueError(f"{ident}: tipo de questão desconhecido: {tipo!r}")
+    if tipo == VERDADEIRO_FALSO:
+        opcoes, resposta, tolerancia = OPCOES_VF, 0 if bruta["resposta"] else 1, 0.0
+    elif tipo == MULTIPLA:
+        opcoes, resposta, tolerancia = tuple(bruta["opcoes"]), int(bruta["resposta"]), 0.0
+        if not 0 <= resposta < len(opcoes):
+            raise ValueError(f"{ident}: resposta fora das opções")
+    else:
+        opcoes, resposta = (), float(bruta["resposta"])
+        tolerancia = float(bruta.get("tolerancia", TOLERANCIA_RELATIVA * abs(resposta)))
+    dificuldade = bruta.get("dificuldade", dificuldade)
+    if dificuldade not in DIFICULDADES:
+        raise ValueError(f"{ident}: dificuldade desconhecida: {dificuldade!r}")
+    return Questao(ident, tipo, bruta["enunciado"], opcoes, resposta, tolerancia,
+                   bruta.get("explicacao", ""), bruta.get("tema", tema), dificuldade)
+
+
+@dataclass(slots=True)
+class EstadoQuiz:
+    """Respostas de um aluno em um quiz, guardadas na sessão.
+
+    ``escolhas`` tem o índice da opção escolhida (-1 sem resposta) e
+    ``valores`` a resposta das numéricas (NaN sem resposta); ``notas`` é o
+    resultado da última correção e ``pendentes`` marca o que mudou desde
+    então. ``pontuacao`` é preenchida quando o aluno envia o quiz.
+    """
+    escolhas: np.ndarray
+    valores: np.ndarray
+    notas: np.ndarray
+    pendentes: np.ndarray
+    pontuacao: Optional[int] = None
+
+    @classmethod
+    def vazio(cls, n):
+        return cls(np.full(n, -1, dtype=np.int8), np.full(n, np.nan), np.full(n, SEM_RESPOSTA, dtype=np.int8),
+                   np.zeros(n, dtype=bool))
+
+    def __len__(self):
+        return len(self.escolhas)
+
+    def limpar(self):
+        self.escolhas[:] = -1
+        self.valores[:] = np.nan
+        self.notas[:] = SEM_RESPOSTA
+        self.pendentes[:] = False
+        self.pontuacao = None
+
+    def escolha(self, i):
+        """Índice escolhido na questão i, ou None."""
+        return int(self.escolhas[i]) if self.escolhas[i] >= 0 else None
+
+    def respondidas(self):
+        return int(np.count_nonzero((self.escolhas >= 0) | ~np.isnan(self.valores)))
+
+    def acertos(self):
+        return int(np.count_nonzero(self.notas == CERTA))
+
+
+class Quiz:
+    """Conjunto fixo de questões com o gabarito compilado em arrays."""
+
+    def __init__(self, nome, questoes):
+        self.nome = nome
+        self.questoes = tuple(questoes)
+        self.numericas = np.array([q.numerica for q in self.questoes], dtype=bool)
+        self.gabarito = np.array([-1 if q.numerica else q.resposta for q in self.questoes], dtype=np.int8)
+        self.corretos = np.array([q.resposta if q.numerica else np.nan for q in self.questoes], dtype=float)
+        self.tolerancias = np.array([q.tolerancia for q in self.questoes], dtype=float)
+        self.temas = tuple(sorted({q.tema for q in self.questoes}))
+        self.indice_tema = np.array([self.temas.index(q.tema) for q in self.questoes], dtype=np.int16)
+
+    def __len__(self):
+        return len(self.questoes)
+
+    def novo_estado(self):
+        return EstadoQuiz.vazio(len(self))
+
+    def responder(self, estado, i, resposta):
+        """Registra a resposta da questão i (índice da opção, número ou None).
+
+        Retorna True se a resposta mudou; só então a questão volta a ser
+        corrigida.
+        """
+        if self.numericas[i]:
+            novo = np.nan if resposta is None else float(resposta)
+            atual = estado.valores[i]
+            if novo == atual or (np.isnan(novo) and np.isnan(atual)):
+                return False
+            estado.valores[i] = novo
+        else:
+            novo = -1 if resposta is None else int(resposta)
+            if novo == estado.escolhas[i]:
+                return False
+            estado.escolhas[i] = novo
+        estado.pendentes[i] = True
+        return True
+
+    def _avaliar(self, escolhas, valores, idx=slice(None)):
+        # Vale para um aluno (vetores) ou uma turma (matrizes alunos x questões)
+        numericas = self.numericas[idx]
+        respondida = np.where(numericas, ~np.isnan(valores), escolhas >= 0)
+        certa = np.where(numericas,
+                         np.abs(valores - self.corretos[idx]) <= self.tolerancias[idx],
+                         escolhas == self.gabarito[idx])
+        return np.where(respondida, certa.astype(np.int8), np.int8(SEM_RESPOSTA))
+
+    def corrigir(self, estado):
+        """Corrige as respostas pendentes e retorna ``estado.notas``."""
+        idx = np.flatnonzero(estado.pendentes)
+        if idx.size:
+            estado.notas[idx] = self._avaliar(estado.escolhas[idx], estado.valores[idx], idx)
+            estado.pendentes[idx] = False
+        return estado.notas
+
+    def corrigir_lote(self, escolhas, valores):
+        """Notas (alunos x questões, int8) de uma turma inteira de uma vez.
+
+        ``escolhas`` (inteiros, -1 sem resposta) e ``valores`` (float, NaN
+        sem resposta) têm uma linha por aluno e uma coluna por questão.
+        """
+        return self._avaliar(np.asarray(escolhas), np.asarray(valores, dtype=float))
+
+    def enviar(self, estado):
+        """Corrige e fixa a pontuação do envio (número de acertos)."""
+        self.corrigir(estado)
+        estado.pontuacao = estado.acertos()
+        return estado.pontuacao
+
+    def temas_errados(self, estado):
+        """Temas das questões respondidas de forma errada na última correção."""
+        return {self.questoes[i].tema for i in np.flatnonzero(estado.notas == ERRADA)}
+
+
+class BancoQuestoes:
+    """Todas as questões, por quiz, tema e dificuldade."""
+
+    def __init__(self, conteudo):
+        self._bancos = {}
+        self.por_tema = {}
+        self.por_dificuldade = {}
+        for nome, banco in conteudo["bancos"].items():
+            questoes = tuple(compilar_questao(nome, i, bruta, banco["tema"], banco["dificuldade"])
+                             for i, bruta in enumerate(banco["questoes"]))
+            self._bancos[nome] = questoes
+            for q in questoes:
+                self.por_tema.setdefault(q.tema, []).append(q)
+                self.por_dificuldade.setdefault(q.dificuldade, []).append(q)
+        self.por_tema = {tema: tuple(qs) for tema, qs in self.por_tema.items()}
+        self.por_dificuldade = {d: tuple(qs) for d, qs in self.por_dificuldade.items()}
+        self._quizzes = {}
+        self._lock = threading.Lock()
+
+    @property
+    def nomes(self):
+        return tuple(self._bancos)
+
+    def quiz(self, *nomes):
+        """Quiz compilado com as questões dos bancos ``nomes``, nesta ordem (reutilizado)."""
+        with self._lock:
+            quiz = self._quizzes.get(nomes)
+            if quiz is None:
+                quiz = self._quizzes[nomes] = Quiz("+".join(nomes),
+                                                   [q for nome in nomes for q in self._bancos[nome]])
+            return quiz
+
+    def questoes(self, tema=None, dificuldade=None):
+        """Questões de um tema e/ou dificuldade, na ordem do banco."""
+        if tema is None and dificuldade is None:
+            return tuple(q for qs in self._bancos.values() for q in qs)
+        candidatas = self.por_tema.get(tema, ()) if tema is not None else self.por_dificuldade.get(dificuldade, ())
+        if tema is not None and dificuldade is not None:
+            candidatas = tuple(q for q in candidatas if q.dificuldade == dificuldade)
+        return candidatas
+
+
+# --- Correção em lote --------------------------------------------------------
+
+_TEXTOS_VF = {"v": 0, "verdadeiro": 0, "true": 0, "f": 1, "falso": 1, "false": 1}
+
+
+def _coluna_da_questao(colunas, i, questao):
+    for nome in (questao.id, f"q{i + 1}", f"Q{i + 1}", str(i + 1)):
+        if nome in colunas:
+            return nome
+    return None
+
+
+def _indice_da_resposta(resposta, questao, mapa):
+    try:
+        numero = float(resposta)
+    except (TypeError, ValueError):
+        indice = mapa.get(str(resposta).strip().lower(), -1)
+    else:
+        indice = int(numero) if numero.is_integer() else -1
+    return indice if 0 <= indice < len(questao.opcoes) else -1
+
+
+def _indices_opcao(coluna, questao):
+    """Coluna de respostas -> (índices de opção, respostas não reconhecidas).
+
+    Aceita o índice da opção (0 = primeira), a letra (A, B, ...), o texto
+    da opção e, em verdadeiro/falso, V/F, Verdadeiro/Falso ou true/false.
+    Células vazias dão -1; as preenchidas que não correspondem a nenhuma
+    opção também dão -1 e são marcadas como inválidas. Cada resposta
+    distinta é interpretada uma vez só.
+    """
+    mapa = {opcao.lower(): j for j, opcao in enumerate(questao.opcoes)}
+    mapa.update({chr(ord("a") + j): j for j in range(len(questao.opcoes))})
+    if questao.tipo == VERDADEIRO_FALSO:
+        mapa.update(_TEXTOS_VF)
+    codigos, distintas = pd.factorize(coluna)
+    indices = [_indice_da_resposta(r, questao, mapa) for r in distintas]
+    invalidas = [i < 0 and str(r).strip() != "" for i, r in zip(indices, distintas)]
+    # O código -1 (célula vazia) cai na última posição das tabelas
+    return (np.array(indices + [-1], dtype=np.int8)[codigos],
+            np.array(invalidas + [False], dtype=bool)[codigos])
+
+
+_MILHAR = re.compile(r"[-+]?[1-9]\d{0,2}(\.\d{3})+")
+
+
+def _numero(resposta):
+    """Valor de uma resposta numérica; NaN se vazia, None se não for um número.
+
+    Aceita o formato brasileiro ("1.234,56", "12,5", "R$ 1.500") e o ponto
+    decimal ("12.5"). Sem vírgula, o ponto é separador de milhar quando
+    separa grupos de três dígitos ("1.500", "74.000", "1.234.567").
+    """
+    if isinstance(resposta, (int, float, np.number)) and not isinstance(resposta, bool):
+        return float(resposta)
+    texto = str(resposta).replace("R$", "").replace("\u00a0", "").replace(" ", "").strip()
+    if not texto:
+        return np.nan
+    if "," in texto:
+        texto = texto.replace(".", "").replace(",", ".")
+    elif _MILHAR.fullmatch(texto):
+        texto = texto.replace(".", "")
+    try:
+        return float(texto)
+    except ValueError:
+        return None
+
+
+def _valores_numericos(coluna):
+    """Coluna de respostas numéricas -> (valores, respostas que não são números)."""
+    codigos, distintas = pd.factorize(coluna)
+    numeros = [_numero(r) for r in distintas]
+    valores = np.array([np.nan if v is None else v for v in numeros] + [np.nan])
+    invalidas = np.array([v is None for v in numeros] + [False], dtype=bool)
+    return valores[codigos], invalidas[codigos]
+
+
+def matrizes_respostas(quiz, submissoes):
+    """(escolhas, valores, ausentes, invalidas) de um DataFrame com uma linha por aluno e uma coluna por questão.
+
+    As colunas das questões podem se chamar pelo id (``simulado_absorcao/3``),
+    ``q3`` ou ``3``; questões sem coluna contam como não respondidas.
+    ``invalidas`` marca (alunos x questões) as células preenchidas que não
+    puderam ser interpretadas; elas também contam como não respondidas.
+    """
+    n = len(submissoes)
+    escolhas = np.full((n, len(quiz)), -1, dtype=np.int8)
+    valores = np.full((n, len(quiz)), np.nan)
+    invalidas = np.zeros((n, len(quiz)), dtype=bool)
+    ausentes = []
+    for i, questao in enumerate(quiz.questoes):
+        nome = _coluna_da_questao(submissoes.columns, i, questao)
+        if nome is None:
+            ausentes.append(questao.id)
+        elif questao.numerica:
+            valores[:, i], invalidas[:, i] = _valores_numericos(submissoes[nome])
+        else:
+            escolhas[:, i], invalidas[:, i] = _indices_opcao(submissoes[nome], questao)
+    return escolhas, valores, ausentes, invalidas
+
+
+def corrigir_turma(quiz, submissoes, coluna_aluno="aluno"):
+    """Corrige todas as submissões e resume por aluno, por tema e por questão.
+
+    Retorna um dict com os DataFrames ``por_aluno`` (acertos, respondidas,
+    nota de 0 a 100 e, em quizzes com mais de um tema, % de acerto em cada
+    tema), ``por_tema`` e
+    ``por_questao``, além de ``notas`` (matriz alunos x questões) e
+    ``ausentes`` (questões sem coluna no arquivo) e ``invalidas``
+    (DataFrame com as respostas que não puderam ser interpretadas).
+    """
+    escolhas, valores, ausentes, invalidas = matrizes_respostas(quiz, submissoes)
+    notas = quiz.corrigir_lote(escolhas, valores)
+    certas = (notas == CERTA).astype(float)
+    respondidas = notas != SEM_RESPOSTA
+
+    # Matriz questões x temas: um produto dá os acertos de todos os alunos em todos os temas
+    temas = np.eye(len(quiz.temas))[quiz.indice_tema]
+    questoes_por_tema = temas.sum(axis=0)
+    acerto_tema = certas @ temas / questoes_por_tema * 100
+
+    alunos = (submissoes[coluna_aluno].to_numpy() if coluna_aluno in submissoes.columns
+              else np.arange(1, len(submissoes) + 1))
+    acertos = certas.sum(axis=1).astype(int)
+    por_aluno = pd.DataFrame({"aluno": alunos, "acertos": acertos,
+                              "respondidas": respondidas.sum(axis=1), "invalidas": invalidas.sum(axis=1),
+                              "total": len(quiz),
+                              "nota": (acertos / len(quiz) * 100).round(1)})
+    if len(quiz.temas) > 1:
+        # Com um tema só, o % de acerto no tema repetiria a nota
+        por_aluno = pd.concat([por_aluno, pd.DataFrame(acerto_tema.round(1), columns=list(quiz.temas))], axis=1)
+    por_tema = pd.DataFrame({"tema": quiz.temas, "questoes": questoes_por_tema.astype(int),
+                             "acerto_medio": acerto_tema.mean(axis=0).round(1) if len(notas) else 0.0})
+    por_questao = pd.DataFrame({"questao": [q.id for q in quiz.questoes],
+                                "tema": [q.tema for q in quiz.questoes],
+                                "dificuldade": [q.dificuldade for q in quiz.questoes],
+                                "acerto": (certas.mean(axis=0) * 100).round(1) if len(notas) else 0.0,
+                                "sem_resposta": ((~respondidas).mean(axis=0) * 100).round(1) if len(notas) else 0.0})
+    linhas, colunas = np.nonzero(invalidas)
+    nomes = [_coluna_da_questao(submissoes.columns, i, q) for i, q in enumerate(quiz.questoes)]
+    invalidas = pd.DataFrame({"aluno": alunos[linhas], "questao": [quiz.questoes[c].id for c in colunas],
+                              "resposta": [submissoes[nomes[c]].iloc[l] for l, c in zip(linhas, colunas)]})
+    return {"por_aluno": por_aluno, "por_tema": por_tema, "por_questao": por_questao,
+            "notas": notas, "ausentes": ausentes, "invalidas": invalidas}
+
+
+def ler_submissoes(caminho):
+    """Respostas de um arquivo CSV ou Parquet (uma linha por aluno)."""
+    if caminho.endswith(".parquet"):
+        return pd.read_parquet(caminho)
+    return pd.read_csv(caminho, dtype=str)
+
+
+_banco = None
+_banco_lock = threading.Lock()
+
+
+def obter_banco():
+    """Retorna o banco de questões compilado do processo."""
+    global _banco
+    with _banco_lock:
+        if _banco is None:
+            _banco = BancoQuestoes(carregar_conteudo("questoes"))
+        return _banco
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Corrige em lote as respostas de uma turma a um quiz.")
+    parser.add_argument("submissoes", nargs="?", help="arquivo CSV ou Parquet, uma linha por aluno")
+    parser.add_argument("--quiz", nargs="+", help="banco(s) de questões, ex.: simulado_absorcao")
+    parser.add_argument("--saida", default=".", help="pasta dos relatórios CSV")
+    parser.add_argument("--coluna-aluno", default="aluno")
+    parser.add_argument("--modelo", metavar="ARQUIVO",
+                        help="só grava um CSV vazio com as colunas esperadas para o quiz")
+    parser.add_argument("--listar", action="store_true", help="lista os bancos de questões disponíveis")
+    args = parser.parse_args(argv)
+
+    banco = obter_banco()
+    if args.listar:
+        for nome in banco.nomes:
+            quiz = banco.quiz(nome)
+            print(f"{nome:<20} {len(quiz):>3} questões  temas: {', '.join(quiz.temas)}")
+        return 0
+    if not args.quiz:
+        parser.error("informe --quiz (veja --listar)")
+    quiz = banco.quiz(*args.quiz)
+    if args.modelo:
+        pd.DataFrame(columns=[args.coluna_aluno, *(q.id for q in quiz.questoes)]).to_csv(args.modelo, index=False)
+        print(f"modelo com {len(quiz)} questões gravado em {args.modelo}")
+        return 0
+    if not args.submissoes:
+        parser.error("informe o arquivo de submissões")
+
+    submissoes = ler_submissoes(args.submissoes)
+    inicio = time.perf_counter()
+    resultado = corrigir_turma(quiz, submissoes, args.coluna_aluno)
+    duracao = time.perf_counter() - inicio
+    for ident in resultado["ausentes"]:
+        print(f"aviso: sem coluna para a questão {ident}; contada como não respondida")
+    invalidas = resultado["invalidas"]
+    if len(invalidas):
+        print(f"aviso: {len(invalidas)} resposta(s) não interpretada(s), contadas como não respondidas "
+              f"(ver notas_invalidas.csv)")
+
+    os.makedirs(args.saida, exist_ok=True)
+    partes = ["por_aluno", "por_tema", "por_questao", "invalidas"]
+    if len(quiz.temas) == 1:
+        partes.remove("por_tema")
+    for parte in partes:
+        resultado[parte].to_csv(os.path.join(args.saida, f"notas_{parte}.csv"), index=False)
+    por_aluno = resultado["por_aluno"]
+    print(f"{len(por_aluno)} alunos x {len(quiz)} questões corrigidos em {duracao * 1e3:.1f} ms")
+    if len(por_aluno):
+        print(f"nota média: {por_aluno['nota'].mean():.1f} | mediana: {por_aluno['nota'].median():.1f}")
+    if len(quiz.temas) > 1:
+        print(resultado["por_tema"].to_string(index=False))
+    print(f"relatórios gravados em {args.saida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,919 @@
+"""Pipeline de registro de eventos em segundo plano.
+
+Cada evento é primeiro anexado a um diário local (SQLite em modo WAL),
+o que custa uma única escrita local na página. Uma thread de envio por
+processo lê o diário a partir do último checkpoint de cada aba e
+replica os eventos ao Google Sheets em lotes (``append_rows``),
+disparados por tamanho ou por tempo. Eventos não enviados sobrevivem a
+quedas do Sheets e a reinícios do servidor.
+"""
+import atexit
+import csv
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from planilha import BaldeDeTokens, Disjuntor, obter_recursos
+
+logger = logging.getLogger(__name__)
+
+ARQUIVO_DIARIO = os.environ.get("GESTAO_LOG_DIARIO", os.path.join("logs", "diario_eventos.db"))
+TAMANHO_LOTE = int(os.environ.get("GESTAO_LOG_LOTE", "50"))
+INTERVALO_MAX = float(os.environ.get("GESTAO_LOG_INTERVALO", "5"))
+MAX_LINHAS_ENVIO = 500
+PASTA_LOGS = os.environ.get("GESTAO_LOG_PASTA", "logs")
+# Destinos ativos, separados por vírgula: sheets, csv, sqlite, stdout, parquet
+SINKS = os.environ.get("GESTAO_LOG_SINKS", "sheets")
+# Particionamento dos logs por período: "mes", "semana" ou "nenhum" (aba única)
+PERIODO_SHARD = os.environ.get("GESTAO_LOG_PERIODO", "mes")
+ARQUIVO_MANIFESTO = os.path.join(PASTA_LOGS, "manifesto.json")
+
+ABAS = {"acesso": "Acessos", "interacao": "Interações"}
+
+CABECALHOS = {
+    "Acessos": ["nome", "pagina", "acao", "timestamp"],
+    "Interações": ["nome", "pagina", "acao", "timestamp", "tempo_desde_ultimo"],
+}
+
+
+def chave_periodo(ts_us, periodo=PERIODO_SHARD):
+    """Período do instante: ``2026-10`` (mês), ``2026-S42`` (semana ISO) ou None."""
+    if periodo == "nenhum":
+        return None
+    data = datetime.fromtimestamp(ts_us / 1e6)
+    if periodo == "mes":
+        return f"{data:%Y-%m}"
+    if periodo == "semana":
+        ano, semana, _ = data.isocalendar()
+        return f"{ano}-S{semana:02d}"
+    raise ValueError(f"Período de particionamento desconhecido: {periodo}")
+
+
+def nome_shard(aba, ts_us, periodo=PERIODO_SHARD):
+    """Nome da aba (ou arquivo) que recebe o evento, ex.: ``Acessos-2026-10``."""
+    chave = chave_periodo(ts_us, periodo)
+    return aba if chave is None else f"{aba}-{chave}"
+
+
+def aba_do_shard(shard):
+    """Aba lógica de um shard: ``Acessos-2026-10`` -> ``Acessos``."""
+    return shard.split("-", 1)[0]
+
+
+def _para_us(valor):
+    if valor is None or isinstance(valor, int):
+        return valor
+    return int(valor.timestamp() * 1e6)
+
+
+def _ts_da_linha(linha):
+    """Instante (µs) da coluna timestamp de uma linha no layout das planilhas."""
+    return int(datetime.fromisoformat(linha[3]).timestamp() * 1e6)
+
+
+class Manifesto:
+    """Índice JSON dos shards de cada destino e do intervalo de tempo de cada um.
+
+    As consultas por período usam o manifesto para abrir apenas os
+    shards que se sobrepõem ao intervalo pedido.
+    """
+
+    def __init__(self, caminho=ARQUIVO_MANIFESTO):
+        self.caminho = caminho
+        self._lock = threading.Lock()
+        self._dados = {}
+        self._alterado = False
+        if os.path.exists(caminho):
+            try:
+                with open(caminho, encoding="utf-8") as f:
+                    self._dados = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning("Manifesto de logs ilegível (%s), será recriado: %s", caminho, e)
+
+    def registrar(self, destino, shard, primeiro_ts, ultimo_ts, eventos, aba=None, local=None):
+        """Acrescenta ``eventos`` ao shard, ampliando seu intervalo se preciso."""
+        with self._lock:
+            shards = self._dados.setdefault(destino, {})
+            item = shards.get(shard)
+            if item is None:
+                item = shards[shard] = {"aba": aba, "local": local or shard, "eventos": 0,
+                                        "primeiro_ts": primeiro_ts, "ultimo_ts": ultimo_ts}
+            item["primeiro_ts"] = min(item["primeiro_ts"], primeiro_ts)
+            item["ultimo_ts"] = max(item["ultimo_ts"], ultimo_ts)
+            item["eventos"] += eventos
+            self._alterado = True
+
+    def salvar(self):
+        """Grava o manifesto (substituição atômica) se houve alterações."""
+        with self._lock:
+            if not self._alterado:
+                return
+            pasta = os.path.dirname(self.caminho)
+            if pasta:
+                os.makedirs(pasta, exist_ok=True)
+            temporario = self.caminho + ".tmp"
+            with open(temporario, "w", encoding="utf-8") as f:
+                json.dump(self._dados, f, ensure_ascii=False, indent=1)
+            os.replace(temporario, self.caminho)
+            self._alterado = False
+
+    def shards(self, destino, inicio=None, fim=None, aba=None):
+        """Shards do destino com eventos entre inicio e fim, em ordem cronológica.
+
+        ``inicio``/``fim`` aceitam datetime ou microssegundos; None deixa o
+        intervalo aberto. Shards sem aba definida (Parquet) sempre passam
+        pelo filtro de ``aba``.
+        """
+        inicio_us, fim_us = _para_us(inicio), _para_us(fim)
+        with self._lock:
+            itens = [dict(item, shard=shard) for shard, item in self._dados.get(destino, {}).items()]
+        return sorted((item for item in itens
+                       if (aba is None or item["aba"] in (aba, None))
+                       and (inicio_us is None or item["ultimo_ts"] >= inicio_us)
+                       and (fim_us is None or item["primeiro_ts"] <= fim_us)),
+                      key=lambda item: item["primeiro_ts"])
+
+
+_manifesto = None
+_manifesto_lock = threading.Lock()
+
+
+def obter_manifesto():
+    """Retorna o manifesto de shards compartilhado pelo processo."""
+    global _manifesto
+    with _manifesto_lock:
+        if _manifesto is None:
+            _manifesto = Manifesto()
+        return _manifesto
+
+
+class DiarioLocal:
+    """Diário de eventos só-de-anexação com checkpoint de envio por aba."""
+
+    def __init__(self, caminho=ARQUIVO_DIARIO):
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        self._lock = threading.Lock()
+        self._con = sqlite3.connect(caminho, check_same_thread=False, isolation_level=None)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute("PRAGMA synchronous=NORMAL")
+        self._con.execute("""CREATE TABLE IF NOT EXISTS eventos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            aba TEXT NOT NULL,
+            linha TEXT NOT NULL)""")
+        self._con.execute("CREATE INDEX IF NOT EXISTS eventos_aba ON eventos (aba, id)")
+        self._con.execute("""CREATE TABLE IF NOT EXISTS checkpoint (
+            aba TEXT PRIMARY KEY,
+            ultimo_id INTEGER NOT NULL)""")
+
+    def anexar(self, aba, linha):
+        """Grava o evento no diário e retorna seu id."""
+        dados = json.dumps(list(linha), ensure_ascii=False, default=str)
+        with self._lock:
+            return self._con.execute("INSERT INTO eventos (aba, linha) VALUES (?, ?)",
+                                     (aba, dados)).lastrowid
+
+    def _checkpoint(self, aba):
+        linha = self._con.execute("SELECT ultimo_id FROM checkpoint WHERE aba = ?", (aba,)).fetchone()
+        return linha[0] if linha else 0
+
+    def abas_pendentes(self):
+        """Abas que possuem eventos além do checkpoint."""
+        with self._lock:
+            return [aba for (aba,) in self._con.execute("""
+                SELECT DISTINCT e.aba FROM eventos e
+                LEFT JOIN checkpoint c ON c.aba = e.aba
+                WHERE e.id > COALESCE(c.ultimo_id, 0)""")]
+
+    def pendentes(self, aba, limite=MAX_LINHAS_ENVIO):
+        """Lista (id, linha) dos eventos da aba ainda não enviados."""
+        with self._lock:
+            cursor = self._con.execute(
+                "SELECT id, linha FROM eventos WHERE aba = ? AND id > ? ORDER BY id LIMIT ?",
+                (aba, self._checkpoint(aba), limite))
+            return [(id_, json.loads(linha)) for id_, linha in cursor]
+
+    def contar_pendentes(self):
+        """Total de eventos ainda não enviados, somando todas as abas."""
+        with self._lock:
+            return self._con.execute("""
+                SELECT COUNT(*) FROM eventos e
+                LEFT JOIN checkpoint c ON c.aba = e.aba
+                WHERE e.id > COALESCE(c.ultimo_id, 0)""").fetchone()[0]
+
+    def avancar(self, aba, ultimo_id):
+        """Registra que os eventos da aba até ultimo_id já foram enviados."""
+        with self._lock:
+            self._con.execute("""INSERT INTO checkpoint (aba, ultimo_id) VALUES (?, ?)
+                ON CONFLICT(aba) DO UPDATE SET ultimo_id = excluded.ultimo_id""", (aba, ultimo_id))
+
+    def compactar(self):
+        """Remove do diário os eventos já enviados."""
+        with self._lock:
+            self._con.execute("""DELETE FROM eventos WHERE id <= COALESCE(
+                (SELECT ultimo_id FROM checkpoint c WHERE c.aba = eventos.aba), 0)""")
+
+    def fechar(self):
+        with self._lock:
+            self._con.close()
+
+
+class EscritorEmLote:
+    """Anexa eventos ao diário local e os replica ao Sheets em lotes.
+
+    Cada aba do diário é um shard (ex.: ``Acessos-2026-10``); a aba é
+    criada na planilha, com o cabeçalho, no primeiro envio do período.
+    """
+
+    def __init__(self, recursos=None, diario=None, tamanho_lote=TAMANHO_LOTE,
+                 intervalo_max=INTERVALO_MAX, limitador=None, disjuntor=None, manifesto=None):
+        # recursos: objeto com aba(nome, cabecalho) e invalidar(nome), como o RecursosPlanilha
+        self.recursos = recursos or obter_recursos()
+        self.diario = diario or DiarioLocal()
+        self.manifesto = manifesto or obter_manifesto()
+        self.limitador = limitador or BaldeDeTokens()
+        self.disjuntor = disjuntor or Disjuntor()
+        self.tamanho_lote = tamanho_lote
+        self.intervalo_max = intervalo_max
+        self._lock = threading.Lock()
+        self._acordar = threading.Event()
+        self._parar = False
+        self._aguardando = []
+        # Eventos deixados por uma execução anterior são enviados logo no início
+        self._pendentes = self.diario.contar_pendentes()
+        self._desde = time.monotonic() - intervalo_max if self._pendentes else None
+        self.estatisticas = {"enfileirados": 0, "enviados": 0, "lotes": 0,
+                             "chamadas_api": 0, "falhas": 0, "descartados": 0,
+                             "rejeitadas_disjuntor": 0, "adiadas_cota": 0}
+        self._thread = threading.Thread(target=self._executar, name="escritor-logs", daemon=True)
+        self._thread.start()
+
+    def _contar(self, chave, n=1):
+        with self._lock:
+            self.estatisticas[chave] += n
+
+    def enfileirar(self, aba, linha):
+        """Anexa o evento ao diário local sem esperar pelo Google Sheets."""
+        # Conta antes de gravar para que a thread de envio nunca desconte a mais
+        with self._lock:
+            self._pendentes += 1
+        try:
+            self.diario.anexar(aba, linha)
+        except sqlite3.Error as e:
+            with self._lock:
+                self._pendentes -= 1
+                self.estatisticas["descartados"] += 1
+            logger.warning("Erro ao gravar evento no diário local: %s", e)
+            return False
+        with self._lock:
+            self.estatisticas["enfileirados"] += 1
+            if self._desde is None:
+                self._desde = time.monotonic()
+            cheio = self._pendentes >= self.tamanho_lote
+        if cheio:
+            self._acordar.set()
+        return True
+
+    def profundidade(self):
+        """Quantidade de eventos aguardando envio."""
+        return self._pendentes
+
+    def descarregar(self, timeout=None):
+        """Força o envio do que estiver pendente e aguarda a conclusão."""
+        if not self._thread.is_alive():
+            return False
+        pronto = threading.Event()
+        with self._lock:
+            self._aguardando.append(pronto)
+        self._acordar.set()
+        return pronto.wait(timeout)
+
+    def encerrar(self, timeout=10):
+        """Tenta enviar os eventos pendentes e finaliza a thread de envio."""
+        if self._thread.is_alive():
+            self._parar = True
+            self._acordar.set()
+            self._thread.join(timeout)
+
+    def _executar(self):
+        while True:
+            self._acordar.wait(self.intervalo_max)
+            self._acordar.clear()
+            with self._lock:
+                aguardando, self._aguardando = self._aguardando, []
+                vencido = self._desde is not None and time.monotonic() - self._desde >= self.intervalo_max
+                enviar = (self._parar or aguardando or vencido
+                          or self._pendentes >= self.tamanho_lote)
+            try:
+                if enviar and self._pendentes:
+                    self._despachar()
+            except Exception:
+                logger.exception("Erro ao despachar os eventos do diário ao Google Sheets")
+            finally:
+                for pronto in aguardando:
+                    pronto.set()
+            if self._parar:
+                return
+
+    def situacao(self):
+        """Resumo para dimensionamento: fila, contadores, cota e disjuntor."""
+        with self._lock:
+            estatisticas = dict(self.estatisticas)
+        return {"pendentes": self._pendentes,
+                "estatisticas": estatisticas,
+                "tokens_disponiveis": round(self.limitador.tokens(), 2),
+                "disjuntor": self.disjuntor.situacao()}
+
+    def _pode_chamar(self):
+        # Verifica a cota antes de consultar o disjuntor para não desperdiçar a sonda
+        if not self.limitador.disponivel():
+            self._contar("adiadas_cota")
+            return False
+        if not self.disjuntor.permitir():
+            self._contar("rejeitadas_disjuntor")
+            return False
+        self.limitador.consumir()
+        return True
+
+    def _despachar(self):
+        enviou = False
+        for aba in self.diario.abas_pendentes():
+            eventos = self.diario.pendentes(aba)
+            while eventos:
+                if not self._pode_chamar():
+                    # Os eventos continuam no diário; nova tentativa no próximo ciclo
+                    break
+                linhas = [linha for _, linha in eventos]
+                try:
+                    cabecalho = CABECALHOS.get(aba_do_shard(aba))
+                    self.recursos.aba(aba, cabecalho=cabecalho).append_rows(linhas)
+                except Exception as e:
+                    self.disjuntor.registrar_falha()
+                    self._contar("falhas")
+                    self.recursos.invalidar(aba)
+                    logger.warning("Erro ao enviar %d evento(s) ao Google Sheets (%s): %s",
+                                   len(linhas), aba, e)
+                    break
+                self.disjuntor.registrar_sucesso()
+                self.diario.avancar(aba, eventos[-1][0])
+                self._registrar_no_manifesto(aba, linhas)
+                enviou = True
+                with self._lock:
+                    self.estatisticas["enviados"] += len(linhas)
+                    self.estatisticas["chamadas_api"] += 1
+                    self._pendentes -= len(linhas)
+                eventos = self.diario.pendentes(aba)
+            if self.disjuntor.estado != Disjuntor.FECHADO:
+                break
+        with self._lock:
+            self.estatisticas["lotes"] += 1
+            self._desde = time.monotonic() if self._pendentes else None
+        if enviou:
+            self.diario.compactar()
+            self.manifesto.salvar()
+
+    def _registrar_no_manifesto(self, aba, linhas):
+        try:
+            self.manifesto.registrar("sheets", aba, _ts_da_linha(linhas[0]), _ts_da_linha(linhas[-1]),
+                                     len(linhas), aba=aba_do_shard(aba))
+        except (IndexError, ValueError) as e:
+            logger.warning("Linhas sem timestamp válido na aba %s; fora do manifesto: %s", aba, e)
+
+
+_escritor = None
+_escritor_lock = threading.Lock()
+
+
+def obter_escritor():
+    """Retorna o escritor em lote compartilhado pelo processo."""
+    global _escritor
+    with _escritor_lock:
+        if _escritor is None:
+            _escritor = EscritorEmLote()
+            atexit.register(_escritor.encerrar)
+        return _escritor
+
+
+# Âncora que converte o relógio monotônico em data/hora de parede
+_ANCORA_PAREDE_US = time.time_ns() // 1000
+_ANCORA_MONO_NS = time.monotonic_ns()
+
+
+def agora_us():
+    """Instante atual em microssegundos desde a época, sem retroceder no processo."""
+    return _ANCORA_PAREDE_US + (time.monotonic_ns() - _ANCORA_MONO_NS) // 1000
+
+
+@dataclass(frozen=True, slots=True)
+class Evento:
+    """Evento de uso com esquema fixo.
+
+    ``acao`` e ``pagina`` são códigos curtos e repetitivos (internados no
+    processo e codificados em dicionário no Parquet); o que varia, como o
+    nome do vídeo assistido, vai em ``parametros``.
+    """
+
+    tipo: str                 # "acesso" ou "interacao"
+    usuario: str
+    pagina: str
+    acao: str
+    ts_us: int                # microssegundos desde a época (monotônico no processo)
+    permanencia: float = 0.0  # segundos desde a ação anterior do mesmo usuário
+    parametros: tuple = ()    # pares (chave, valor)
+
+    @classmethod
+    def criar(cls, tipo, usuario, pagina, acao, permanencia=0.0, ts_us=None, **parametros):
+        return cls(tipo=tipo,
+                   usuario=str(usuario),
+                   pagina=sys.intern(str(pagina)),
+                   acao=sys.intern(str(acao)),
+                   ts_us=agora_us() if ts_us is None else ts_us,
+                   permanencia=float(permanencia),
+                   parametros=tuple((str(k), str(v)) for k, v in sorted(parametros.items())))
+
+    @property
+    def aba(self):
+        return ABAS[self.tipo]
+
+    def shard(self, periodo=PERIODO_SHARD):
+        return nome_shard(self.aba, self.ts_us, periodo)
+
+    @property
+    def rotulo(self):
+        """Ação no formato texto antigo, ex.: ``assistiu_video_<nome>``."""
+        return "_".join([self.acao, *(valor for _, valor in self.parametros)])
+
+    def data_hora(self):
+        return datetime.fromtimestamp(self.ts_us / 1e6)
+
+    def como_linha(self):
+        """Linha no layout das abas do Google Sheets."""
+        linha = [self.usuario, self.pagina, self.rotulo, str(self.data_hora())]
+        if self.tipo == "interacao":
+            linha.append(f"{self.permanencia:.1f}")
+        return linha
+
+    def como_dict(self):
+        return {"tipo": self.tipo, "usuario": self.usuario, "pagina": self.pagina,
+                "acao": self.acao, "parametros": dict(self.parametros),
+                "ts_us": self.ts_us, "permanencia": self.permanencia}
+
+
+class EventSink:
+    """Destino de eventos de log usado por todas as páginas."""
+
+    def emitir(self, evento):
+        """Registra um Evento."""
+        raise NotImplementedError
+
+    def descarregar(self):
+        """Grava o que estiver em buffer."""
+
+    def fechar(self):
+        self.descarregar()
+
+
+class _SinkBufferizado(EventSink):
+    """Acumula os eventos em memória e grava em blocos por tamanho ou tempo.
+
+    Uma thread grava o buffer quando ele enche ou completa
+    ``intervalo_max`` segundos, mesmo que nenhum outro evento chegue
+    (servidor ocioso); a página que emite o evento não paga a gravação.
+    Só se a thread ficar para trás e o buffer passar de
+    ``FATOR_BUFFER_MAX`` vezes o tamanho a própria chamada grava, para
+    que ele não cresça sem limite.
+    """
+
+    FATOR_BUFFER_MAX = 4
+
+    def __init__(self, tamanho_buffer=TAMANHO_LOTE, intervalo_max=INTERVALO_MAX):
+        self.tamanho_buffer = tamanho_buffer
+        self.intervalo_max = intervalo_max
+        self._buffer = []
+        self._desde = None
+        self._lock = threading.Lock()
+        self._lock_gravacao = threading.Lock()
+        self._acordar = threading.Event()
+        self._parar = False
+        self._thread = threading.Thread(target=self._executar, name=f"descarga-{type(self).__name__}",
+                                        daemon=True)
+        self._thread.start()
+
+    def emitir(self, evento):
+        with self._lock:
+            primeiro = not self._buffer
+            if primeiro:
+                self._desde = time.monotonic()
+            self._buffer.append(evento)
+            n = len(self._buffer)
+        if n >= self.tamanho_buffer * self.FATOR_BUFFER_MAX:
+            self.descarregar()
+        elif primeiro or n == self.tamanho_buffer:
+            # A thread passa a contar o prazo deste buffer, ou o grava já se encheu
+            self._acordar.set()
+
+    def descarregar(self):
+        with self._lock_gravacao:
+            with self._lock:
+                itens, self._buffer = self._buffer, []
+            if itens:
+                self._gravar(itens)
+
+    def fechar(self):
+        self._parar = True
+        self._acordar.set()
+        super().fechar()
+
+    def _executar(self):
+        while not self._parar:
+            self._acordar.clear()
+            with self._lock:
+                if not self._buffer:
+                    restante = None
+                elif len(self._buffer) >= self.tamanho_buffer:
+                    restante = 0
+                else:
+                    restante = self._desde + self.intervalo_max - time.monotonic()
+            if restante is None or restante > 0:
+                self._acordar.wait(restante)
+                continue
+            try:
+                self.descarregar()
+            except Exception:
+                logger.exception("Erro ao gravar os eventos em buffer (%s)", type(self).__name__)
+
+    def _gravar(self, itens):
+        raise NotImplementedError
+
+
+class CsvSink(_SinkBufferizado):
+    """Um arquivo CSV por aba e período (ex.: ``Acessos-2026-10.csv``).
+
+    O arquivo do período atual fica aberto entre as gravações; os
+    anteriores são fechados quando o período vira. O manifesto em memória
+    é atualizado a cada gravação, mas só é regravado em disco quando um
+    shard é criado ou fechado, e no encerramento.
+    """
+
+    def __init__(self, pasta=PASTA_LOGS, periodo=PERIODO_SHARD, manifesto=None, **kwargs):
+        super().__init__(**kwargs)
+        self.pasta = pasta
+        self.periodo = periodo
+        self.manifesto = manifesto or obter_manifesto()
+        os.makedirs(pasta, exist_ok=True)
+        self._arquivos = {}
+
+    def _caminho(self, shard):
+        return os.path.join(self.pasta, f"{shard}.csv")
+
+    def _arquivo(self, shard):
+        """(arquivo, escritor, novo): ``novo`` indica que o shard foi aberto ou trocado agora."""
+        if shard in self._arquivos:
+            return (*self._arquivos[shard], False)
+        aba = aba_do_shard(shard)
+        for antigo in [s for s in self._arquivos if aba_do_shard(s) == aba]:
+            self._arquivos.pop(antigo)[0].close()
+        caminho = self._caminho(shard)
+        vazio = not os.path.exists(caminho)
+        arquivo = open(caminho, "a", newline="", encoding="utf-8")
+        escritor = csv.writer(arquivo)
+        if vazio and aba in CABECALHOS:
+            escritor.writerow(CABECALHOS[aba])
+        self._arquivos[shard] = (arquivo, escritor)
+        return arquivo, escritor, True
+
+    def _gravar(self, eventos):
+        # shard -> [eventos, primeiro_ts, ultimo_ts]
+        resumo = {}
+        trocou = False
+        for evento in eventos:
+            shard = evento.shard(self.periodo)
+            _, escritor, novo = self._arquivo(shard)
+            trocou = trocou or novo
+            escritor.writerow(evento.como_linha())
+            item = resumo.setdefault(shard, [0, evento.ts_us, evento.ts_us])
+            item[0] += 1
+            item[1] = min(item[1], evento.ts_us)
+            item[2] = max(item[2], evento.ts_us)
+        for shard, (n, primeiro, ultimo) in resumo.items():
+            if shard in self._arquivos:
+                self._arquivos[shard][0].flush()
+            self.manifesto.registrar("csv", shard, primeiro, ultimo, n,
+                                     aba=aba_do_shard(shard), local=self._caminho(shard))
+        if trocou:
+            self.manifesto.salvar()
+
+    def fechar(self):
+        super().fechar()
+        with self._lock_gravacao:
+            for arquivo, _ in self._arquivos.values():
+                arquivo.close()
+            self._arquivos.clear()
+            self.manifesto.salvar()
+
+
+class SqliteSink(_SinkBufferizado):
+    """Tabela SQLite local; cada bloco é gravado em uma única transação."""
+
+    def __init__(self, caminho=os.path.join(PASTA_LOGS, "eventos.db"), **kwargs):
+        super().__init__(**kwargs)
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        self._con = sqlite3.connect(caminho, check_same_thread=False)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute("PRAGMA synchronous=NORMAL")
+        self._con.execute("""CREATE TABLE IF NOT EXISTS eventos (
+            ts_us INTEGER NOT NULL,
+            tipo TEXT NOT NULL,
+            usuario TEXT NOT NULL,
+            pagina TEXT NOT NULL,
+            acao TEXT NOT NULL,
+            parametros TEXT,
+            permanencia REAL)""")
+        # Tabela única: as consultas por período usam o índice em vez de shards
+        self._con.execute("CREATE INDEX IF NOT EXISTS eventos_ts ON eventos (ts_us)")
+
+    def _gravar(self, eventos):
+        with self._con:
+            self._con.executemany(
+                "INSERT INTO eventos VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(e.ts_us, e.tipo, e.usuario, e.pagina, e.acao,
+                  json.dumps(dict(e.parametros), ensure_ascii=False) if e.parametros else None,
+                  e.permanencia) for e in eventos])
+
+    def fechar(self):
+        super().fechar()
+        with self._lock_gravacao:
+            self._con.close()
+
+
+class StdoutSink(_SinkBufferizado):
+    """Escreve uma linha JSON por evento na saída padrão (útil em contêineres)."""
+
+    def __init__(self, saida=None, **kwargs):
+        super().__init__(**kwargs)
+        self.saida = saida or sys.stdout
+
+    def _gravar(self, eventos):
+        self.saida.write("".join(
+            json.dumps(e.como_dict(), ensure_ascii=False) + "\n" for e in eventos))
+        self.saida.flush()
+
+
+class SheetsSink(EventSink):
+    """Google Sheets via diário local e envio em lote (ver EscritorEmLote)."""
+
+    def __init__(self, escritor=None):
+        self.escritor = escritor or obter_escritor()
+
+    def emitir(self, evento):
+        self.escritor.enfileirar(evento.shard(), evento.como_linha())
+
+    def descarregar(self):
+        self.escritor.descarregar(timeout=0)
+
+
+class FanoutSink(EventSink):
+    """Repassa cada evento a vários destinos; a falha de um não afeta os demais."""
+
+    def __init__(self, sinks):
+        self.sinks = list(sinks)
+
+    def _para_cada(self, metodo, *args):
+        for sink in self.sinks:
+            try:
+                getattr(sink, metodo)(*args)
+            except Exception as e:
+                logger.warning("Erro no destino de log %s: %s", type(sink).__name__, e)
+
+    def emitir(self, evento):
+        self._para_cada("emitir", evento)
+
+    def descarregar(self):
+        self._para_cada("descarregar")
+
+    def fechar(self):
+        self._para_cada("fechar")
+
+
+def _esquema_parquet(pa):
+    texto = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("ts", pa.timestamp("us")),
+        ("tipo", texto),
+        ("usuario", texto),
+        ("pagina", texto),
+        ("acao", texto),
+        ("parametros", pa.string()),
+        ("permanencia", pa.float32()),
+    ])
+
+
+class ParquetSink(_SinkBufferizado):
+    """Arquivos Parquet compactados e rotativos, em formato colunar.
+
+    Páginas, ações e usuários são colunas codificadas em dicionário, o
+    instante usa codificação delta e cada bloco do buffer vira um row
+    group (por isso o buffer padrão é grande). Os arquivos ficam em uma
+    pasta por período (ex.: ``parquet/2026-10/``); o arquivo atual é
+    fechado e um novo é aberto quando o período vira ou ao atingir
+    ``linhas_por_arquivo`` ou ``idade_max`` segundos. Requer o pacote
+    opcional ``pyarrow``.
+    """
+
+    COLUNAS_DICIONARIO = ["tipo", "usuario", "pagina", "acao", "parametros", "permanencia"]
+
+    def __init__(self, pasta=os.path.join(PASTA_LOGS, "parquet"), linhas_por_arquivo=500_000,
+                 idade_max=3600, compressao="zstd", tamanho_buffer=10_000, intervalo_max=60,
+                 periodo=PERIODO_SHARD, manifesto=None, **kwargs):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("O destino 'parquet' requer o pacote pyarrow (pip install pyarrow)") from e
+        super().__init__(tamanho_buffer=tamanho_buffer, intervalo_max=intervalo_max, **kwargs)
+        self._pa, self._pq = pa, pq
+        self.pasta = pasta
+        self.linhas_por_arquivo = linhas_por_arquivo
+        self.idade_max = idade_max
+        self.compressao = compressao
+        self.periodo = periodo
+        self.manifesto = manifesto or obter_manifesto()
+        os.makedirs(pasta, exist_ok=True)
+        self.esquema = _esquema_parquet(pa)
+        self._escritor = None
+        self._caminho = None
+        self._periodo_arquivo = None
+        self._linhas_arquivo = 0
+        self._aberto_em = 0.0
+
+    def _novo_arquivo(self, chave):
+        self._fechar_arquivo()
+        pasta = os.path.join(self.pasta, chave) if chave else self.pasta
+        os.makedirs(pasta, exist_ok=True)
+        nome = f"eventos-{datetime.now():%Y%m%dT%H%M%S%f}-{os.getpid()}.parquet"
+        self._caminho = os.path.join(pasta, nome)
+        self._escritor = self._pq.ParquetWriter(
+            self._caminho, self.esquema, compression=self.compressao,
+            use_dictionary=self.COLUNAS_DICIONARIO,
+            column_encoding={"ts": "DELTA_BINARY_PACKED"})
+        self._periodo_arquivo = chave
+        self._linhas_arquivo = 0
+        self._aberto_em = time.monotonic()
+
+    def _fechar_arquivo(self):
+        if self._escritor is not None:
+            self._escritor.close()
+            self._escritor = None
+
+    def _gravar(self, eventos):
+        inicio = 0
+        while inicio < len(eventos):
+            # Cada trecho contíguo do mesmo período vai para o arquivo daquele período
+            chave = chave_periodo(eventos[inicio].ts_us, self.periodo)
+            fim = inicio + 1
+            while fim < len(eventos) and chave_periodo(eventos[fim].ts_us, self.periodo) == chave:
+                fim += 1
+            self._gravar_trecho(chave, eventos[inicio:fim])
+            inicio = fim
+        self.manifesto.salvar()
+
+    def _gravar_trecho(self, chave, eventos):
+        pa = self._pa
+        if (self._escritor is None or chave != self._periodo_arquivo
+                or self._linhas_arquivo >= self.linhas_por_arquivo
+                or time.monotonic() - self._aberto_em >= self.idade_max):
+            self._novo_arquivo(chave)
+        texto = lambda valores: pa.array(valores, pa.string()).dictionary_encode()  # noqa: E731
+        instantes = [e.ts_us for e in eventos]
+        tabela = pa.Table.from_arrays([
+            pa.array(instantes, pa.timestamp("us")),
+            texto([e.tipo for e in eventos]),
+            texto([e.usuario for e in eventos]),
+            texto([e.pagina for e in eventos]),
+            texto([e.acao for e in eventos]),
+            pa.array([json.dumps(dict(e.parametros), ensure_ascii=False) if e.parametros else None
+                      for e in eventos], pa.string()),
+            # Décimos de segundo, como nas planilhas: poucos valores distintos
+            pa.array([round(e.permanencia, 1) for e in eventos], pa.float32()),
+        ], schema=self.esquema)
+        self._escritor.write_table(tabela)
+        self._linhas_arquivo += len(eventos)
+        self.manifesto.registrar("parquet", os.path.relpath(self._caminho, self.pasta),
+                                 min(instantes), max(instantes), len(eventos), local=self._caminho)
+
+    def fechar(self):
+        super().fechar()
+        with self._lock_gravacao:
+            self._fechar_arquivo()
+
+
+TIPOS_SINK = {
+    "sheets": SheetsSink,
+    "csv": CsvSink,
+    "sqlite": SqliteSink,
+    "stdout": StdoutSink,
+    "parquet": ParquetSink,
+}
+
+
+def criar_sink(config=SINKS):
+    """Cria o destino de log a partir de uma lista de nomes, ex.: "sheets,csv"."""
+    nomes = [nome.strip().lower() for nome in config.split(",") if nome.strip()]
+    desconhecidos = [nome for nome in nomes if nome not in TIPOS_SINK]
+    if desconhecidos:
+        raise ValueError(f"Destino de log desconhecido: {', '.join(desconhecidos)}")
+    sinks = [TIPOS_SINK[nome]() for nome in nomes]
+    return sinks[0] if len(sinks) == 1 else FanoutSink(sinks)
+
+
+_sink = None
+_sink_lock = threading.Lock()
+
+
+def obter_sink():
+    """Retorna o destino de log configurado (GESTAO_LOG_SINKS), único por processo."""
+    global _sink
+    with _sink_lock:
+        if _sink is None:
+            _sink = criar_sink()
+            atexit.register(_sink.fechar)
+        return _sink
+
+
+def profundidade_fila():
+    """Quantidade de eventos aguardando envio ao Google Sheets."""
+    return obter_escritor().profundidade()
+
+
+def situacao_envio():
+    """Estado do envio ao Google Sheets (fila, cota e disjuntor)."""
+    return obter_escritor().situacao()
+
+
+def ler_linhas(aba, inicio=None, fim=None, destino="csv", manifesto=None):
+    """Linhas (layout das planilhas) da aba com timestamp entre inicio e fim.
+
+    Só os shards que se sobrepõem ao intervalo, segundo o manifesto, são
+    lidos: arquivos CSV locais (``destino="csv"``) ou abas do Google
+    Sheets (``destino="sheets"``).
+    """
+    if destino not in ("csv", "sheets"):
+        raise ValueError(f"Leitura por período não suportada para o destino: {destino}")
+    manifesto = manifesto or obter_manifesto()
+    inicio_us, fim_us = _para_us(inicio), _para_us(fim)
+    linhas = []
+    for item in manifesto.shards(destino, inicio_us, fim_us, aba=aba):
+        if destino == "csv":
+            with open(item["local"], newline="", encoding="utf-8") as f:
+                candidatas = list(csv.reader(f))[1:]
+        else:
+            candidatas = obter_recursos().aba(item["local"]).get_all_values()[1:]
+        inteiro = ((inicio_us is None or item["primeiro_ts"] >= inicio_us)
+                   and (fim_us is None or item["ultimo_ts"] <= fim_us))
+        if inteiro:
+            linhas.extend(candidatas)
+        else:
+            linhas.extend(linha for linha in candidatas
+                          if (inicio_us is None or _ts_da_linha(linha) >= inicio_us)
+                          and (fim_us is None or _ts_da_linha(linha) <= fim_us))
+    return linhas
+
+
+def ler_parquet(inicio=None, fim=None, colunas=None, manifesto=None):
+    """Tabela Arrow com os eventos entre inicio e fim, lendo só os shards do intervalo.
+
+    O arquivo ainda em gravação só fica legível depois de fechado e é
+    ignorado até lá.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    manifesto = manifesto or obter_manifesto()
+    inicio_us, fim_us = _para_us(inicio), _para_us(fim)
+    filtros = []
+    if inicio_us is not None:
+        filtros.append(("ts", ">=", pa.scalar(inicio_us, pa.timestamp("us"))))
+    if fim_us is not None:
+        filtros.append(("ts", "<=", pa.scalar(fim_us, pa.timestamp("us"))))
+    tabelas = []
+    for item in manifesto.shards("parquet", inicio_us, fim_us):
+        try:
+            tabelas.append(pq.read_table(item["local"], columns=colunas, filters=filtros or None))
+        except (OSError, pa.ArrowInvalid) as e:
+            logger.info("Shard %s ignorado (ainda em gravação?): %s", item["shard"], e)
+    if not tabelas:
+        esquema = _esquema_parquet(pa)
+        if colunas is not None:
+            esquema = pa.schema([esquema.field(coluna) for coluna in colunas])
+        return esquema.empty_table()
+    return pa.concat_tables(tabelas).unify_dictionaries()
+
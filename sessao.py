@@ -0,0 +1,989 @@
+"""Armazenamento do estado de sessão de cada usuário.
+
+Cada usuário anônimo (``get_anon_user_id``) tem seu próprio registro em
+um banco SQLite em modo WAL: leituras concorrentes não bloqueiam, cada
+gravação é uma transação atômica que toca apenas o registro do usuário
+e o bloqueio entre processos fica a cargo do próprio SQLite (com espera
+em vez de erro quando o banco está ocupado).
+
+O estado é guardado chave a chave. Uma gravação incremental compara o
+resumo (hash) de cada chave com o da última gravação e anexa um delta
+só com o que mudou (DataFrames que continuam sendo o mesmo objeto nem
+chegam a ser recodificados); periodicamente os deltas são compactados de volta
+no snapshot base. Salvamentos seguidos do mesmo usuário são agrupados
+pelo GravadorSessoes em uma única gravação.
+
+Nada é gravado com pickle: valores simples vão em msgpack com cabeçalho
+de versão e DataFrames/Series viram arquivos Arrow IPC (ver
+CodificadorSessao), reabertos com memory map sem copiar os dados. Um
+banco gravado no formato anterior (pickle) é convertido uma única vez,
+ao ser aberto.
+"""
+import atexit
+import datetime
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import sqlite3
+import threading
+import sys
+import time
+import weakref
+from contextlib import contextmanager
+
+import msgpack
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+ARQUIVO_SESSOES = os.environ.get("GESTAO_SESSOES", os.path.join("dados", "sessoes.db"))
+ESPERA_BLOQUEIO = float(os.environ.get("GESTAO_SESSOES_ESPERA", "10"))
+CONEXOES_SESSOES = int(os.environ.get("GESTAO_SESSOES_CONEXOES", "8"))
+# Segundos sem novos salvamentos do usuário antes de gravar (agrupamento)
+ESPERA_GRAVACAO = float(os.environ.get("GESTAO_SESSOES_DEBOUNCE", "2"))
+# Quantidade de deltas acumulados que dispara a compactação no snapshot base
+COMPACTAR_APOS = int(os.environ.get("GESTAO_SESSOES_COMPACTAR", "20"))
+# Ciclo de vida: sessões ociosas perdem o estado em memória após TTL_MEMORIA
+# segundos e o estado gravado após TTL_DISCO; limites de memória em MB
+TTL_MEMORIA = float(os.environ.get("GESTAO_SESSOES_TTL", str(2 * 3600)))
+TTL_DISCO = float(os.environ.get("GESTAO_SESSOES_TTL_DISCO", str(30 * 86400)))
+LIMITE_SESSAO_MB = float(os.environ.get("GESTAO_SESSOES_LIMITE_MB", "64"))
+LIMITE_TOTAL_MB = float(os.environ.get("GESTAO_SESSOES_LIMITE_TOTAL_MB", "1024"))
+INTERVALO_VARREDURA = float(os.environ.get("GESTAO_SESSOES_VARREDURA", "60"))
+# Chaves que nunca são descartadas do session_state
+CHAVES_PROTEGIDAS = frozenset({"anon_user_id"})
+
+# Cabeçalho de cada blob gravado: assinatura + versão do formato
+ASSINATURA = b"GS"
+VERSAO_FORMATO = 2
+
+# Tipos estendidos do msgpack usados pelo CodificadorSessao
+EXT_FRAME, EXT_SERIE, EXT_NDARRAY, EXT_TUPLA, EXT_CONJUNTO, EXT_DATA_HORA, EXT_DATA = range(1, 8)
+
+
+def _resumo(blob):
+    return hashlib.blake2b(blob, digest_size=16).digest()
+
+
+def _forma(valor):
+    """Marca barata de DataFrames/Series/arrays (os caros de codificar); None nos demais."""
+    if isinstance(valor, pd.DataFrame):
+        return valor.shape, tuple(valor.columns), tuple(valor.dtypes)
+    if isinstance(valor, (pd.Series, np.ndarray)):
+        return valor.shape, valor.dtype
+    return None
+
+
+class CodificadorSessao:
+    """Serializa valores da sessão sem pickle.
+
+    Valores simples vão em msgpack precedidos de ``ASSINATURA`` e
+    ``VERSAO_FORMATO``. DataFrames e Series, em qualquer nível, são
+    gravados à parte como arquivos Arrow IPC sem compressão, nomeados pelo
+    hash do conteúdo (frames iguais são gravados uma vez só), e o blob
+    guarda apenas a referência. Na leitura o arquivo é aberto com memory
+    map e as colunas numéricas do DataFrame apontam direto para ele.
+    Tipos sem representação segura levantam TypeError.
+    """
+
+    def __init__(self, pasta_frames):
+        self.pasta_frames = pasta_frames
+        os.makedirs(pasta_frames, exist_ok=True)
+
+    def caminho_frame(self, resumo):
+        return os.path.join(self.pasta_frames, resumo + ".arrow")
+
+    def _gravar_frame(self, frame):
+        tabela = pa.Table.from_pandas(frame)
+        saida = pa.BufferOutputStream()
+        with pa.ipc.new_file(saida, tabela.schema) as escritor:
+            escritor.write_table(tabela)
+        buf = saida.getvalue()
+        resumo = hashlib.blake2b(buf, digest_size=16).hexdigest()
+        caminho = self.caminho_frame(resumo)
+        if not os.path.exists(caminho):
+            tmp = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(buf)
+            os.replace(tmp, caminho)
+        return resumo
+
+    def _ler_frame(self, resumo, copiar=False):
+        # O memory map continua vivo enquanto os buffers do DataFrame o referenciarem
+        tabela = pa.ipc.open_file(pa.memory_map(self.caminho_frame(resumo))).read_all()
+        frame = tabela.to_pandas(split_blocks=True)
+        return frame.copy() if copiar else frame
+
+    def _padrao(self, valor):
+        if isinstance(valor, pd.DataFrame):
+            return msgpack.ExtType(EXT_FRAME, self._gravar_frame(valor).encode())
+        if isinstance(valor, pd.Series):
+            resumo = self._gravar_frame(valor.to_frame(name="valores"))
+            return msgpack.ExtType(EXT_SERIE, self._empacotar([resumo, valor.name]))
+        if isinstance(valor, np.ndarray) and not valor.dtype.hasobject:
+            return msgpack.ExtType(EXT_NDARRAY, self._empacotar(
+                [valor.dtype.str, list(valor.shape), np.ascontiguousarray(valor).tobytes()]))
+        if isinstance(valor, np.generic):
+            return valor.item()
+        if isinstance(valor, tuple):
+            return msgpack.ExtType(EXT_TUPLA, self._empacotar(list(valor)))
+        if isinstance(valor, (set, frozenset)):
+            return msgpack.ExtType(EXT_CONJUNTO, self._empacotar(list(valor)))
+        if isinstance(valor, datetime.datetime):
+            return msgpack.ExtType(EXT_DATA_HORA, valor.isoformat().encode())
+        if isinstance(valor, datetime.date):
+            return msgpack.ExtType(EXT_DATA, valor.isoformat().encode())
+        if isinstance(valor, dict):
+            return dict(valor)
+        if isinstance(valor, list):
+            return list(valor)
+        raise TypeError(f"tipo não suportado na sessão: {type(valor).__name__}")
+
+    def _leitor(self, copiar):
+        def estendido(codigo, dados):
+            if codigo == EXT_FRAME:
+                return self._ler_frame(dados.decode(), copiar)
+            if codigo == EXT_SERIE:
+                resumo, nome = self._desempacotar(dados, estendido)
+                return self._ler_frame(resumo, copiar)["valores"].rename(nome)
+            if codigo == EXT_NDARRAY:
+                dtype, forma, bruto = self._desempacotar(dados, estendido)
+                return np.frombuffer(bruto, dtype=np.dtype(dtype)).reshape(forma).copy()
+            if codigo == EXT_TUPLA:
+                return tuple(self._desempacotar(dados, estendido))
+            if codigo == EXT_CONJUNTO:
+                return set(self._desempacotar(dados, estendido))
+            return self._estendido_simples(codigo, dados)
+        return estendido
+
+    def _estendido_simples(self, codigo, dados):
+        if codigo == EXT_DATA_HORA:
+            return datetime.datetime.fromisoformat(dados.decode())
+        if codigo == EXT_DATA:
+            return datetime.date.fromisoformat(dados.decode())
+        return msgpack.ExtType(codigo, dados)
+
+    def _empacotar(self, valor):
+        return msgpack.packb(valor, default=self._padrao, strict_types=True, use_bin_type=True)
+
+    def _desempacotar(self, dados, ext_hook):
+        return msgpack.unpackb(dados, ext_hook=ext_hook, raw=False, strict_map_key=False)
+
+    def codificar(self, valor):
+        return ASSINATURA + bytes([VERSAO_FORMATO]) + self._empacotar(valor)
+
+    def _corpo(self, blob):
+        if blob[:2] != ASSINATURA or blob[2] != VERSAO_FORMATO:
+            raise ValueError("blob de sessão em formato desconhecido")
+        return blob[3:]
+
+    def decodificar(self, blob, copiar_frames=False):
+        """Valor gravado em ``blob``.
+
+        Sem ``copiar_frames`` os DataFrames apontam para o arquivo mapeado e
+        são somente leitura: atribuições no lugar (``df.loc[...] = ...``)
+        exigem um ``.copy()`` antes; criar colunas ou novos frames funciona.
+        """
+        return self._desempacotar(self._corpo(blob), self._leitor(copiar_frames))
+
+    def frames_referenciados(self, blob):
+        """Resumos dos arquivos Arrow referenciados pelo blob (sem abri-los)."""
+        encontrados = set()
+
+        def coletar(codigo, dados):
+            if codigo == EXT_FRAME:
+                encontrados.add(dados.decode())
+            elif codigo == EXT_SERIE:
+                encontrados.add(self._desempacotar(dados, coletar)[0])
+            elif codigo in (EXT_TUPLA, EXT_CONJUNTO):
+                self._desempacotar(dados, coletar)
+            return None
+
+        self._desempacotar(self._corpo(blob), coletar)
+        return encontrados
+
+
+class ArmazemSessoes:
+    """Registros de sessão por usuário em SQLite, com um pool de conexões.
+
+    O Streamlit usa uma thread nova a cada execução do script, então as
+    conexões ficam em um pool limitado em vez de uma por thread.
+    """
+
+    def __init__(self, caminho=ARQUIVO_SESSOES, espera_bloqueio=ESPERA_BLOQUEIO,
+                 conexoes=CONEXOES_SESSOES, compactar_apos=COMPACTAR_APOS, pasta_frames=None):
+        self.caminho = caminho
+        self.espera_bloqueio = espera_bloqueio
+        self.compactar_apos = compactar_apos
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        self.codificador = CodificadorSessao(pasta_frames or os.path.join(pasta, "frames"))
+        self._livres = queue.LifoQueue()
+        self._vagas = threading.BoundedSemaphore(conexoes)
+        self._todas = []
+        self._lock = threading.Lock()
+        # usuario -> {chave: resumo} do que está persistido
+        self._resumos = {}
+        # usuario -> {chave: (weakref do valor, forma, blob)} dos frames já codificados
+        self._codificados = {}
+        self.estatisticas = {"leituras": 0, "gravacoes": 0, "gravacoes_delta": 0,
+                             "sem_alteracao": 0, "chaves_gravadas": 0, "chaves_inalteradas": 0,
+                             "bytes_gravados": 0, "bytes_evitados": 0, "compactacoes": 0,
+                             "chaves_ignoradas": 0, "frames_removidos": 0, "chaves_reaproveitadas": 0}
+        with self._conexao() as con:
+            con.execute("PRAGMA journal_mode=WAL")
+        with self._transacao() as con:
+            # Relido dentro da transação: outro processo pode ter migrado antes
+            if con.execute("PRAGMA user_version").fetchone()[0] < VERSAO_FORMATO:
+                self._migrar_pickle(con)
+                con.execute(f"PRAGMA user_version = {VERSAO_FORMATO}")
+            # dados/alteradas: {chave: blob do valor}, codificados pelo CodificadorSessao
+            con.execute("""CREATE TABLE IF NOT EXISTS sessoes (
+                usuario TEXT PRIMARY KEY,
+                dados BLOB NOT NULL,
+                versao INTEGER NOT NULL,
+                atualizado REAL NOT NULL)""")
+            con.execute("""CREATE TABLE IF NOT EXISTS deltas (
+                usuario TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                alteradas BLOB NOT NULL,
+                removidas TEXT NOT NULL,
+                PRIMARY KEY (usuario, seq))""")
+
+    def _migrar_pickle(self, con):
+        """Converte as sessões gravadas em pickle para o CodificadorSessao.
+
+        Há dois formatos antigos: o estado inteiro em um pickle, e um pickle
+        de ``{chave: pickle do valor}`` com deltas no mesmo formato (quando
+        existe a tabela ``deltas``). O banco é local e só este app grava
+        nele, então o pickle é lido uma última vez aqui. Sessões que não
+        puderem ser convertidas são removidas, com aviso.
+        """
+        import pickle
+
+        tabelas = {nome for (nome,) in con.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        if "sessoes" not in tabelas:
+            return
+        por_chave = "deltas" in tabelas
+        deltas = {}
+        if por_chave:
+            for usuario, alteradas, removidas in con.execute(
+                    "SELECT usuario, alteradas, removidas FROM deltas ORDER BY usuario, seq"):
+                deltas.setdefault(usuario, []).append((alteradas, removidas))
+        convertidas, descartadas = 0, 0
+        for usuario, dados in con.execute("SELECT usuario, dados FROM sessoes").fetchall():
+            try:
+                estado = pickle.loads(dados)
+                if por_chave:
+                    for alteradas, removidas in deltas.get(usuario, []):
+                        estado.update(pickle.loads(alteradas))
+                        for chave in json.loads(removidas):
+                            estado.pop(chave, None)
+                    estado = {chave: pickle.loads(blob) for chave, blob in estado.items()}
+                blob = self.codificador.codificar(self._serializar_chaves(estado))
+            except Exception as e:
+                logger.warning("Sessão de %s no formato antigo não pôde ser convertida: %s", usuario, e)
+                con.execute("DELETE FROM sessoes WHERE usuario = ?", (usuario,))
+                descartadas += 1
+                continue
+            con.execute("UPDATE sessoes SET dados = ? WHERE usuario = ?", (blob, usuario))
+            convertidas += 1
+        if por_chave:
+            con.execute("DELETE FROM deltas")
+        logger.info("Sessões convertidas do formato antigo (pickle): %d; descartadas: %d",
+                    convertidas, descartadas)
+
+    @contextmanager
+    def _conexao(self):
+        self._vagas.acquire()
+        try:
+            try:
+                con = self._livres.get_nowait()
+            except queue.Empty:
+                con = sqlite3.connect(self.caminho, timeout=self.espera_bloqueio,
+                                      isolation_level=None, check_same_thread=False)
+                con.execute("PRAGMA synchronous=NORMAL")
+                with self._lock:
+                    self._todas.append(con)
+            try:
+                yield con
+            finally:
+                self._livres.put(con)
+        finally:
+            self._vagas.release()
+
+    def _contar(self, chave, n=1):
+        with self._lock:
+            self.estatisticas[chave] += n
+
+    @contextmanager
+    def _transacao(self):
+        with self._conexao() as con:
+            con.execute("BEGIN IMMEDIATE")
+            try:
+                yield con
+                con.execute("COMMIT")
+            except BaseException:
+                con.execute("ROLLBACK")
+                raise
+
+    def _mapa_persistido(self, con, usuario):
+        """{chave: bytes} do snapshot base com os deltas aplicados, e quantos deltas havia."""
+        linha = con.execute("SELECT dados FROM sessoes WHERE usuario = ?", (usuario,)).fetchone()
+        if linha is None:
+            return None, 0
+        mapa = self.codificador.decodificar(linha[0])
+        n = 0
+        for alteradas, removidas in con.execute(
+                "SELECT alteradas, removidas FROM deltas WHERE usuario = ? ORDER BY seq", (usuario,)):
+            mapa.update(self.codificador.decodificar(alteradas))
+            for chave in json.loads(removidas):
+                mapa.pop(chave, None)
+            n += 1
+        return mapa, n
+
+    def carregar(self, usuario, copiar_frames=False):
+        """Estado salvo do usuário ({} se não houver); lê apenas o registro dele.
+
+        Os DataFrames vêm mapeados do disco, sem cópia (ver
+        CodificadorSessao.decodificar); ``copiar_frames=True`` os torna editáveis.
+        """
+        with self._conexao() as con:
+            mapa, _ = self._mapa_persistido(con, usuario)
+        self._contar("leituras")
+        if mapa is None:
+            return {}
+        estado = {chave: self.codificador.decodificar(blob, copiar_frames)
+                  for chave, blob in mapa.items()}
+        with self._lock:
+            self._resumos[usuario] = {chave: _resumo(blob) for chave, blob in mapa.items()}
+            self._codificados[usuario] = {
+                chave: (weakref.ref(valor), forma, mapa[chave])
+                for chave, valor in estado.items() if (forma := _forma(valor)) is not None}
+        return estado
+
+    def _serializar_chaves(self, dados, usuario=None, editadas=()):
+        """Codifica cada chave de ``dados``.
+
+        Com ``usuario``, DataFrames/Series/arrays que são o mesmo objeto, com
+        a mesma forma, da última codificação reaproveitam o blob anterior sem
+        recodificar. Alterações feitas no lugar (``df.loc[...] = ...``) não
+        mudam o objeto: informe essas chaves em ``editadas``.
+        """
+        with self._lock:
+            anteriores = self._codificados.get(usuario, {}) if usuario else {}
+        mapa, codificados, reaproveitadas = {}, {}, 0
+        for chave, valor in dados.items():
+            forma = _forma(valor)
+            anterior = anteriores.get(chave)
+            if (forma is not None and anterior is not None and chave not in editadas
+                    and anterior[0]() is valor and anterior[1] == forma):
+                mapa[chave] = anterior[2]
+                codificados[chave] = anterior
+                reaproveitadas += 1
+                continue
+            try:
+                mapa[chave] = self.codificador.codificar(valor)
+            except (TypeError, ValueError, pa.ArrowException) as e:
+                self._contar("chaves_ignoradas")
+                logger.warning("Chave %r da sessão não foi salva: %s", chave, e)
+                continue
+            if forma is not None:
+                try:
+                    codificados[chave] = (weakref.ref(valor), forma, mapa[chave])
+                except TypeError:
+                    pass
+        if usuario:
+            with self._lock:
+                self._codificados[usuario] = codificados
+                self.estatisticas["chaves_reaproveitadas"] += reaproveitadas
+        return mapa
+
+    def _gravar_base(self, con, usuario, mapa):
+        blob = self.codificador.codificar(mapa)
+        con.execute("""INSERT INTO sessoes (usuario, dados, versao, atualizado)
+            VALUES (?, ?, 1, ?)
+            ON CONFLICT(usuario) DO UPDATE SET dados = excluded.dados,
+                versao = sessoes.versao + 1, atualizado = excluded.atualizado""",
+                    (usuario, blob, time.time()))
+        con.execute("DELETE FROM deltas WHERE usuario = ?", (usuario,))
+        return len(blob)
+
+    def salvar(self, usuario, dados):
+        """Substitui atomicamente todo o estado salvo do usuário; retorna a nova versão."""
+        mapa = self._serializar_chaves(dados)
+        with self._transacao() as con:
+            tamanho = self._gravar_base(con, usuario, mapa)
+            versao = con.execute("SELECT versao FROM sessoes WHERE usuario = ?",
+                                 (usuario,)).fetchone()[0]
+        with self._lock:
+            self._resumos[usuario] = {chave: _resumo(blob) for chave, blob in mapa.items()}
+            self.estatisticas["gravacoes"] += 1
+            self.estatisticas["chaves_gravadas"] += len(mapa)
+            self.estatisticas["bytes_gravados"] += tamanho
+        return versao
+
+    def _resumos_persistidos(self, usuario):
+        with self._lock:
+            resumos = self._resumos.get(usuario)
+        if resumos is None:
+            with self._conexao() as con:
+                mapa, _ = self._mapa_persistido(con, usuario)
+            resumos = {chave: _resumo(blob) for chave, blob in (mapa or {}).items()}
+            with self._lock:
+                self._resumos[usuario] = resumos
+        return resumos
+
+    def salvar_incremental(self, usuario, dados, editadas=()):
+        """Grava só as chaves alteradas desde a última gravação; retorna os bytes gravados.
+
+        Frames que não mudaram de objeto nem de forma não são recodificados;
+        ``editadas`` força a recodificação de chaves alteradas no lugar (ver
+        _serializar_chaves).
+        """
+        mapa = self._serializar_chaves(dados, usuario, editadas)
+        resumos_novos = {chave: _resumo(blob) for chave, blob in mapa.items()}
+        resumos = self._resumos_persistidos(usuario)
+        alteradas = {chave: blob for chave, blob in mapa.items()
+                     if resumos.get(chave) != resumos_novos[chave]}
+        removidas = [chave for chave in resumos if chave not in mapa]
+        evitados = sum(len(blob) for chave, blob in mapa.items() if chave not in alteradas)
+        if not alteradas and not removidas:
+            with self._lock:
+                self.estatisticas["sem_alteracao"] += 1
+                self.estatisticas["chaves_inalteradas"] += len(mapa)
+                self.estatisticas["bytes_evitados"] += evitados
+            return 0
+
+        compactou = False
+        with self._transacao() as con:
+            existe = con.execute("SELECT 1 FROM sessoes WHERE usuario = ?", (usuario,)).fetchone()
+            if not existe:
+                tamanho = self._gravar_base(con, usuario, mapa)
+            else:
+                blob = self.codificador.codificar(alteradas)
+                seq = con.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM deltas WHERE usuario = ?",
+                                  (usuario,)).fetchone()[0]
+                con.execute("INSERT INTO deltas (usuario, seq, alteradas, removidas) VALUES (?, ?, ?, ?)",
+                            (usuario, seq, blob, json.dumps(removidas)))
+                con.execute("UPDATE sessoes SET versao = versao + 1, atualizado = ? WHERE usuario = ?",
+                            (time.time(), usuario))
+                tamanho = len(blob)
+                if seq >= self.compactar_apos:
+                    self._compactar(con, usuario)
+                    compactou = True
+        with self._lock:
+            self._resumos[usuario] = resumos_novos
+            self.estatisticas["gravacoes_delta"] += 1
+            self.estatisticas["chaves_gravadas"] += len(alteradas)
+            self.estatisticas["chaves_inalteradas"] += len(mapa) - len(alteradas)
+            self.estatisticas["bytes_gravados"] += tamanho
+            self.estatisticas["bytes_evitados"] += evitados
+            self.estatisticas["compactacoes"] += compactou
+        return tamanho
+
+    def _compactar(self, con, usuario):
+        mapa, _ = self._mapa_persistido(con, usuario)
+        if mapa is not None:
+            self._gravar_base(con, usuario, mapa)
+
+    def compactar(self, usuario=None):
+        """Incorpora os deltas ao snapshot base (de um usuário ou de todos)."""
+        with self._conexao() as con:
+            usuarios = [usuario] if usuario else [
+                u for (u,) in con.execute("SELECT DISTINCT usuario FROM deltas")]
+        for u in usuarios:
+            with self._transacao() as con:
+                self._compactar(con, u)
+            self._contar("compactacoes")
+        if usuario is None:
+            self.limpar_frames()
+        return len(usuarios)
+
+    def limpar_frames(self, idade_minima=3600):
+        """Remove arquivos Arrow que nenhuma sessão referencia mais.
+
+        Arquivos mais novos que ``idade_minima`` segundos são mantidos: podem
+        pertencer a uma gravação ainda não confirmada.
+        """
+        referenciados = set()
+        with self._conexao() as con:
+            blobs = con.execute("SELECT dados FROM sessoes UNION ALL SELECT alteradas FROM deltas").fetchall()
+        for (blob,) in blobs:
+            for valor in self.codificador.decodificar(blob).values():
+                referenciados |= self.codificador.frames_referenciados(valor)
+        limite = time.time() - idade_minima
+        removidos = 0
+        with os.scandir(self.codificador.pasta_frames) as entradas:
+            for entrada in entradas:
+                resumo, ext = os.path.splitext(entrada.name)
+                if ext != ".arrow" or resumo in referenciados:
+                    continue
+                try:
+                    if entrada.stat().st_mtime < limite:
+                        os.remove(entrada.path)
+                        removidos += 1
+                except FileNotFoundError:
+                    pass
+        if removidos:
+            # Um blob guardado para reaproveitamento pode apontar para um arquivo removido
+            with self._lock:
+                self._codificados.clear()
+        self._contar("frames_removidos", removidos)
+        return removidos
+
+    def remover(self, usuario):
+        with self._transacao() as con:
+            con.execute("DELETE FROM sessoes WHERE usuario = ?", (usuario,))
+            con.execute("DELETE FROM deltas WHERE usuario = ?", (usuario,))
+        with self._lock:
+            self._resumos.pop(usuario, None)
+            self._codificados.pop(usuario, None)
+
+    def expirar(self, idade_maxima=TTL_DISCO):
+        """Remove o estado gravado de quem não salva há ``idade_maxima`` segundos."""
+        limite = time.time() - idade_maxima
+        with self._transacao() as con:
+            usuarios = [u for (u,) in con.execute(
+                "SELECT usuario FROM sessoes WHERE atualizado < ?", (limite,))]
+            con.executemany("DELETE FROM deltas WHERE usuario = ?", [(u,) for u in usuarios])
+            con.execute("DELETE FROM sessoes WHERE atualizado < ?", (limite,))
+        with self._lock:
+            for u in usuarios:
+                self._resumos.pop(u, None)
+                self._codificados.pop(u, None)
+        if usuarios:
+            self.limpar_frames()
+        return usuarios
+
+    def usuarios(self):
+        with self._conexao() as con:
+            return [u for (u,) in con.execute("SELECT usuario FROM sessoes ORDER BY usuario")]
+
+    def fechar(self):
+        with self._lock:
+            conexoes, self._todas = self._todas, []
+        for con in conexoes:
+            con.close()
+        self._livres = queue.LifoQueue()
+
+
+class GravadorSessoes:
+    """Agrupa salvamentos seguidos do mesmo usuário em uma gravação incremental.
+
+    Cada pedido substitui o anterior ainda não gravado; a gravação ocorre
+    em segundo plano depois de ``espera`` segundos sem novos pedidos (ou,
+    com pedidos contínuos, após ``espera_maxima``). O estado é serializado
+    no momento da gravação, portanto grava-se sempre o valor mais recente.
+    """
+
+    def __init__(self, armazem=None, espera=ESPERA_GRAVACAO, espera_maxima=None):
+        self.armazem = armazem or obter_armazem()
+        self.espera = espera
+        self.espera_maxima = espera_maxima if espera_maxima is not None else 5 * espera
+        self._pendentes = {}  # usuario -> [dados, primeiro_pedido, ultimo_pedido, editadas]
+        self._cond = threading.Condition()
+        self._parar = False
+        self.estatisticas = {"pedidos": 0, "agrupados": 0, "gravacoes": 0, "falhas": 0}
+        self._thread = threading.Thread(target=self._executar, name="gravador-sessoes", daemon=True)
+        self._thread.start()
+
+    def agendar(self, usuario, dados, editadas=()):
+        """Agenda a gravação de ``dados``; ``editadas`` lista chaves alteradas no lugar."""
+        agora = time.monotonic()
+        with self._cond:
+            self.estatisticas["pedidos"] += 1
+            pendente = self._pendentes.get(usuario)
+            if pendente is None:
+                self._pendentes[usuario] = [dados, agora, agora, set(editadas)]
+            else:
+                self.estatisticas["agrupados"] += 1
+                pendente[0], pendente[2] = dados, agora
+                pendente[3].update(editadas)
+            self._cond.notify()
+
+    def _gravar(self, usuario, dados, editadas=()):
+        try:
+            self.armazem.salvar_incremental(usuario, dados, editadas)
+        except (sqlite3.Error, OSError, pa.ArrowException) as e:
+            with self._cond:
+                self.estatisticas["falhas"] += 1
+            logger.warning("Erro ao gravar a sessão de %s: %s", usuario, e)
+            return
+        with self._cond:
+            self.estatisticas["gravacoes"] += 1
+
+    def descarregar(self, usuario=None):
+        """Grava já o que estiver pendente (de um usuário ou de todos)."""
+        with self._cond:
+            if usuario is None:
+                itens, self._pendentes = list(self._pendentes.items()), {}
+            else:
+                pendente = self._pendentes.pop(usuario, None)
+                itens = [(usuario, pendente)] if pendente else []
+        for u, (dados, _, _, editadas) in itens:
+            self._gravar(u, dados, editadas)
+
+    def encerrar(self, timeout=10):
+        with self._cond:
+            self._parar = True
+            self._cond.notify()
+        self._thread.join(timeout)
+        self.descarregar()
+
+    def _vencidos(self, agora):
+        vencidos, proximo = [], None
+        for usuario, (_, primeiro, ultimo, _) in self._pendentes.items():
+            prazo = min(ultimo + self.espera, primeiro + self.espera_maxima)
+            if prazo <= agora:
+                vencidos.append(usuario)
+            elif proximo is None or prazo < proximo:
+                proximo = prazo
+        return vencidos, proximo
+
+    def _executar(self):
+        while True:
+            with self._cond:
+                if self._parar:
+                    return
+                vencidos, proximo = self._vencidos(time.monotonic())
+                if not vencidos:
+                    self._cond.wait(None if proximo is None else proximo - time.monotonic())
+                    continue
+                itens = [(u, self._pendentes.pop(u)) for u in vencidos]
+            for usuario, (dados, _, _, editadas) in itens:
+                self._gravar(usuario, dados, editadas)
+
+
+def tamanho_estimado(valor, _vistos=None, _nivel=0):
+    """Bytes ocupados por ``valor`` e pelo que ele contém (estimativa).
+
+    DataFrames/Series usam ``memory_usage(deep=True)`` e arrays ``nbytes``;
+    contêineres são percorridos até alguns níveis, contando cada objeto
+    uma vez só.
+    """
+    vistos = set() if _vistos is None else _vistos
+    if id(valor) in vistos:
+        return 0
+    vistos.add(id(valor))
+    if isinstance(valor, pd.DataFrame):
+        return int(valor.memory_usage(deep=True).sum())
+    if isinstance(valor, pd.Series):
+        return int(valor.memory_usage(deep=True))
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes + sys.getsizeof(valor, 0) if valor.base is None else sys.getsizeof(valor, 0)
+    total = sys.getsizeof(valor, 0)
+    if _nivel >= 8:
+        return total
+    if isinstance(valor, dict):
+        for chave, item in valor.items():
+            total += tamanho_estimado(chave, vistos, _nivel + 1) + tamanho_estimado(item, vistos, _nivel + 1)
+    elif isinstance(valor, (list, tuple, set, frozenset)):
+        for item in valor:
+            total += tamanho_estimado(item, vistos, _nivel + 1)
+    else:
+        if hasattr(valor, "__dict__"):
+            total += tamanho_estimado(vars(valor), vistos, _nivel + 1)
+        for nome in getattr(type(valor), "__slots__", ()):
+            total += tamanho_estimado(getattr(valor, nome, None), vistos, _nivel + 1)
+    return total
+
+
+def familia_chave(chave):
+    """Agrupa chaves geradas em série: ``preco_3`` e ``quiz1_q7`` viram ``preco_#`` e ``quiz#_q#``."""
+    return re.sub(r"\d+", "#", str(chave))
+
+
+def _conteudo(estado, tentativas=3):
+    # O script da própria sessão pode alterar o estado durante a cópia
+    for _ in range(tentativas - 1):
+        try:
+            return estado.filtered_state
+        except RuntimeError:
+            time.sleep(0)
+    return estado.filtered_state
+
+
+def _percentil(valores, p):
+    return valores[min(len(valores) - 1, int(len(valores) * p))] if valores else 0
+
+
+def _remover_chaves(estado, chaves):
+    for chave in chaves:
+        try:
+            del estado[chave]
+        except KeyError:
+            pass
+
+
+class GerenciadorSessoes:
+    """Ciclo de vida do estado das sessões: expiração por inatividade e limites de memória.
+
+    Cada execução de página registra a atividade do usuário (ver
+    ``utils.get_anon_user_id``). Uma thread varre as sessões a cada
+    ``intervalo`` segundos e:
+
+    - descarta o session_state de quem está ocioso há mais de ``ttl``
+      (o que estava pendente no gravador é salvo antes);
+    - em sessões acima de ``limite_sessao`` bytes, descarta as maiores
+      chaves até caber no limite;
+    - acima de ``limite_total`` somando todas as sessões, descarta sessões
+      inteiras, da menos recente para a mais recente;
+    - remove do disco o estado gravado há mais de ``ttl_disco``.
+
+    Sessões com atividade nos últimos ``ociosa_minima`` segundos nunca são
+    mexidas, para não apagar chaves no meio de uma execução do script. O
+    gerenciador não guarda o estado das sessões: cada registro traz uma
+    função que o localiza na hora da varredura e devolve None quando a
+    sessão terminou, e então o registro é esquecido. O armazenamento e o
+    gravador só entram quando alguma página já os usou (ver
+    ``obter_armazem``/``obter_gravador``); até lá não há nada pendente para
+    salvar nem estado em disco para expirar.
+    """
+
+    def __init__(self, armazem=None, gravador=None, ttl=TTL_MEMORIA, ttl_disco=TTL_DISCO,
+                 limite_sessao=LIMITE_SESSAO_MB * 1024 * 1024,
+                 limite_total=LIMITE_TOTAL_MB * 1024 * 1024,
+                 intervalo=INTERVALO_VARREDURA, ociosa_minima=60, protegidas=CHAVES_PROTEGIDAS,
+                 iniciar=True):
+        self.armazem = armazem
+        self.gravador = gravador
+        self.ttl = ttl
+        self.ttl_disco = ttl_disco
+        self.limite_sessao = limite_sessao
+        self.limite_total = limite_total
+        self.intervalo = intervalo
+        self.ociosa_minima = ociosa_minima
+        self.protegidas = frozenset(protegidas)
+        self._sessoes = {}  # usuario -> [obter_estado(), última atividade]
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._ultima_expiracao_disco = 0.0
+        self.estatisticas = {"varreduras": 0, "sessoes_expiradas": 0, "sessoes_por_limite_total": 0,
+                             "chaves_por_limite_sessao": 0, "bytes_liberados": 0,
+                             "sessoes_removidas_disco": 0, "bytes_em_memoria": 0}
+        self._thread = None
+        if iniciar:
+            self._thread = threading.Thread(target=self._executar, name="ciclo-sessoes", daemon=True)
+            self._thread.start()
+
+    def registrar(self, usuario, obter_estado):
+        """Marca atividade do usuário.
+
+        ``obter_estado()`` devolve o session_state da sessão (um mapeamento
+        com ``filtered_state`` e remoção de chaves), ou None se a sessão não
+        existe mais no servidor.
+        """
+        with self._lock:
+            self._sessoes[usuario] = [obter_estado, time.monotonic()]
+
+    def _descartar(self, usuario, estado, chaves):
+        if self.gravador is not None:
+            self.gravador.descarregar(usuario)
+        _remover_chaves(estado, chaves)
+
+    def _varrer_sessao(self, usuario, obter_estado, ociosa):
+        """Aplica TTL e limite por sessão a uma sessão.
+
+        Retorna None se a sessão saiu do gerenciador, ou ``(bytes ocupados,
+        tamanhos por chave, bytes liberados)``; os tamanhos são None quando a
+        sessão não entra no limite total (ativa há pouco).
+        """
+        estado = obter_estado()
+        if estado is None:
+            with self._lock:
+                self._sessoes.pop(usuario, None)
+            return None
+        conteudo = _conteudo(estado)
+        tamanhos = {chave: tamanho_estimado(valor) for chave, valor in conteudo.items()}
+        ocupado = sum(tamanhos.values())
+        if ociosa < self.ociosa_minima:
+            return ocupado, None, 0
+        descartaveis = [c for c in tamanhos if c not in self.protegidas]
+        if ociosa > self.ttl:
+            self._descartar(usuario, estado, descartaveis)
+            with self._lock:
+                self.estatisticas["sessoes_expiradas"] += 1
+                self._sessoes.pop(usuario, None)
+            return 0, None, sum(tamanhos[c] for c in descartaveis)
+        liberado = 0
+        if ocupado > self.limite_sessao:
+            removidas = []
+            for chave in sorted(descartaveis, key=tamanhos.get, reverse=True):
+                if ocupado <= self.limite_sessao:
+                    break
+                removidas.append(chave)
+                ocupado -= tamanhos[chave]
+                liberado += tamanhos[chave]
+            self._descartar(usuario, estado, removidas)
+            with self._lock:
+                self.estatisticas["chaves_por_limite_sessao"] += len(removidas)
+            logger.info("Sessão %s acima do limite de memória: descartadas %s", usuario, removidas)
+            tamanhos = {c: t for c, t in tamanhos.items() if c not in removidas}
+        return ocupado, tamanhos, liberado
+
+    def varrer(self):
+        """Aplica TTLs e limites uma vez; retorna o total de bytes liberados."""
+        agora = time.monotonic()
+        with self._lock:
+            sessoes = list(self._sessoes.items())
+        liberados = 0
+        ativas = []  # (ultima, usuario, estado, bytes)
+        total = 0
+        for usuario, (obter_estado, ultima) in sessoes:
+            try:
+                sessao = self._varrer_sessao(usuario, obter_estado, agora - ultima)
+            except Exception:
+                # Um erro em uma sessão (ex.: estado alterado durante a medição)
+                # não interrompe a varredura das demais; ela é revista na próxima
+                logger.exception("Erro ao varrer a sessão %s", usuario)
+                continue
+            if sessao is None:
+                continue
+            ocupado, tamanhos, liberado = sessao
+            liberados += liberado
+            total += ocupado
+            if tamanhos is not None:
+                ativas.append((ultima, usuario, estado, tamanhos))
+
+        for ultima, usuario, estado, tamanhos in sorted(ativas, key=lambda a: a[0]):
+            if total <= self.limite_total:
+                break
+            descartaveis = [c for c in tamanhos if c not in self.protegidas]
+            try:
+                self._descartar(usuario, estado, descartaveis)
+            except Exception:
+                logger.exception("Erro ao descartar a sessão %s", usuario)
+                continue
+            liberado = sum(tamanhos[c] for c in descartaveis)
+            total -= liberado
+            liberados += liberado
+            with self._lock:
+                self.estatisticas["sessoes_por_limite_total"] += 1
+                self._sessoes.pop(usuario, None)
+
+        if self.armazem is not None and agora - self._ultima_expiracao_disco >= min(self.ttl_disco, 3600):
+            self._ultima_expiracao_disco = agora
+            removidas = self.armazem.expirar(self.ttl_disco)
+            with self._lock:
+                self.estatisticas["sessoes_removidas_disco"] += len(removidas)
+        with self._lock:
+            self.estatisticas["varreduras"] += 1
+            self.estatisticas["bytes_liberados"] += liberados
+            self.estatisticas["bytes_em_memoria"] = total
+        return liberados
+
+    def situacao(self):
+        with self._lock:
+            return {"sessoes": len(self._sessoes), **self.estatisticas}
+
+    def perfil(self, top=15):
+        """Memória ocupada pelas sessões vivas, por sessão, por família de chave e por tipo.
+
+        Mede na hora (tamanho profundo de cada chave) e devolve um dict
+        pronto para JSON, com os ``top`` maiores consumidores de cada visão.
+        """
+        agora = time.monotonic()
+        with self._lock:
+            sessoes = list(self._sessoes.items())
+        por_sessao, por_chave, por_tipo = [], {}, {}
+        for usuario, (obter_estado, ultima) in sessoes:
+            estado = obter_estado()
+            if estado is None:
+                continue
+            try:
+                conteudo = _conteudo(estado)
+            except RuntimeError:
+                continue
+            total = 0
+            for chave, valor in conteudo.items():
+                tamanho = tamanho_estimado(valor)
+                total += tamanho
+                familia = por_chave.setdefault(familia_chave(chave),
+                                               {"bytes": 0, "ocorrencias": 0, "usuarios": set()})
+                familia["bytes"] += tamanho
+                familia["ocorrencias"] += 1
+                familia["usuarios"].add(usuario)
+                tipo = type(valor).__module__.split(".")[0] + "." + type(valor).__qualname__
+                por_tipo[tipo] = por_tipo.get(tipo, 0) + tamanho
+            por_sessao.append({"usuario": usuario, "bytes": total, "chaves": len(conteudo),
+                               "ociosa_s": round(agora - ultima, 1)})
+
+        tamanhos = sorted(s["bytes"] for s in por_sessao)
+        total = sum(tamanhos)
+        return {
+            "medido_em": datetime.datetime.now().isoformat(timespec="seconds"),
+            "sessoes": len(por_sessao),
+            "bytes_total": total,
+            "bytes_medio": total // len(tamanhos) if tamanhos else 0,
+            "bytes_p50": _percentil(tamanhos, 0.5),
+            "bytes_p95": _percentil(tamanhos, 0.95),
+            "bytes_max": tamanhos[-1] if tamanhos else 0,
+            "limite_sessao": self.limite_sessao,
+            "limite_total": self.limite_total,
+            "por_sessao": sorted(por_sessao, key=lambda s: s["bytes"], reverse=True)[:top],
+            "por_chave": sorted(({"chave": chave, "bytes": f["bytes"], "ocorrencias": f["ocorrencias"],
+                                  "sessoes": len(f["usuarios"])} for chave, f in por_chave.items()),
+                                key=lambda f: f["bytes"], reverse=True)[:top],
+            "por_tipo": sorted(({"tipo": tipo, "bytes": b} for tipo, b in por_tipo.items()),
+                               key=lambda t: t["bytes"], reverse=True)[:top],
+        }
+
+    def encerrar(self):
+        self._parar.set()
+
+    def _executar(self):
+        while not self._parar.wait(self.intervalo):
+            try:
+                self.varrer()
+            except Exception:
+                logger.exception("Erro na varredura de sessões")
+
+
+_armazem = None
+_armazem_lock = threading.RLock()
+_gravador = None
+_gerenciador = None
+
+
+def obter_armazem():
+    """Retorna o armazenamento de sessões compartilhado pelo processo."""
+    global _armazem
+    with _armazem_lock:
+        if _armazem is None:
+            _armazem = ArmazemSessoes()
+            if _gerenciador is not None:
+                _gerenciador.armazem = _armazem
+        return _armazem
+
+
+def obter_gravador():
+    """Retorna o gravador de sessões (com agrupamento) compartilhado pelo processo."""
+    global _gravador
+    with _armazem_lock:
+        if _gravador is None:
+            _gravador = GravadorSessoes(armazem=obter_armazem())
+            atexit.register(_gravador.encerrar)
+            if _gerenciador is not None:
+                _gerenciador.gravador = _gravador
+        return _gravador
+
+
+def obter_gerenciador():
+    """Retorna o gerenciador do ciclo de vida das sessões do processo.
+
+    Não abre o armazenamento nem inicia o gravador; eles são ligados ao
+    gerenciador quando criados.
+    """
+    global _gerenciador
+    with _armazem_lock:
+        if _gerenciador is None:
+            _gerenciador = GerenciadorSessoes(armazem=_armazem, gravador=_gravador)
+            atexit.register(_gerenciador.encerrar)
+        return _gerenciador
@@ -1,19 +1,28 @@
-import gtts
-from io import BytesIO
 import streamlit as st
-import base64
-import pandas as pd
-import csv
-import os
-from datetime import datetime
-import gspread
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import uuid
-import pickle
+import time
+import threading
+from collections import deque
+from concurrent.futures import wait
+from functools import partial, wraps
+from audio import obter_cache_audio, tipo_audio
+from diagramas import obter_diagramas
+from graficos import PNG, obter_cache_figuras
+from planilha import obter_recursos
+from quiz import obter_banco
+from registro import Evento, obter_sink
+from sessao import obter_armazem, obter_gerenciador, obter_gravador
 
-DATA_FILE = "session_data.pkl"
+def save_session(imediato=False, editadas=()):
+    """Salva o session_state do usuário atual; só as chaves alteradas são gravadas.
 
-def save_session():
-    """Salva o session_state e os dados em disco."""
+    Salvamentos seguidos são agrupados em uma única gravação em segundo
+    plano; ``imediato=True`` grava na hora. DataFrames que continuam sendo
+    o mesmo objeto não são recodificados: ao alterar um no lugar, informe
+    a chave em ``editadas`` (ex.: ``save_session(editadas=['dados'])``).
+    """
     if 'dados' in st.session_state:
         data_to_save = {
             'dados': st.session_state.dados,
@@ -24,94 +33,72 @@ def save_session():
             'ks_df': st.session_state.get('ks_df'),
             # Adicione outros itens importantes
         }
-        with open(DATA_FILE, "wb") as f:
-            pickle.dump(data_to_save, f)
+        gravador = obter_gravador()
+        gravador.agendar(get_anon_user_id(), data_to_save, editadas)
+        if imediato:
+            gravador.descarregar(get_anon_user_id())
 
 def load_session():
-    """Carrega o session_state salvo do disco."""
-    if os.path.exists(DATA_FILE):
-        with open(DATA_FILE, "rb") as f:
-            data = pickle.load(f)
-        return data
-    return {}
+    """Carrega o session_state salvo do usuário atual (incluindo o que ainda estava pendente).
+
+    DataFrames vêm mapeados do disco e são somente leitura; use ``.copy()``
+    antes de alterá-los no lugar.
+    """
+    usuario = get_anon_user_id()
+    obter_gravador().descarregar(usuario)
+    return obter_armazem().carregar(usuario)
     
 def get_anon_user_id():
     """Gera ou recupera um ID anônimo único por sessão"""
     if 'anon_user_id' not in st.session_state:
         # Gera um ID curto e legível (ex: anon_a1b2c3d4)
         st.session_state.anon_user_id = f"anon_{str(uuid.uuid4())[:8]}"
+    contexto = get_script_run_ctx()
+    if contexto is not None:
+        # Atividade para o ciclo de vida da sessão (expiração e limites de memória)
+        obter_gerenciador().registrar(st.session_state.anon_user_id,
+                                      partial(_estado_sessao, contexto.session_id))
     return st.session_state.anon_user_id
 
+def _estado_sessao(sessao_id):
+    """session_state da sessão ``sessao_id``, ou None se ela não está mais ativa no servidor."""
+    if not runtime.exists():
+        return None
+    # O Runtime não expõe publicamente o estado de outra sessão
+    info = runtime.get_instance()._session_mgr.get_active_session_info(sessao_id)
+    return info.session.session_state if info is not None else None
+
 # Função para conectar ao Google Sheets
 def conectar_planilha():
-    if 'gc' not in st.session_state:
-        try:
-            # Usa os secrets do Streamlit
-            from streamlit import secrets
-            gc = gspread.service_account_from_dict(secrets["gspread"])
-            st.session_state.gc = gc
-        except Exception as e:
-            st.error(f"Erro ao conectar ao Google Sheets: {e}")
-            return None
-    return st.session_state.gc
-
-# Função para logar acessos no Google Sheets
-def log_acesso_google(nome_usuario, pagina, acao):
-    gc = conectar_planilha()
-    if not gc:
-        return
+    """Retorna o cliente gspread compartilhado pelo processo (autenticado uma vez)."""
     try:
-        planilha = gc.open("Logs-gestao-custos")  # Nome da planilha
-        worksheet = planilha.worksheet("Acessos")   # Aba "Acessos"
-
-        worksheet.append_row([
-            nome_usuario,
-            pagina,
-            acao,
-            str(datetime.now())
-        ])
+        return obter_recursos().cliente()
     except Exception as e:
-        st.warning(f"Erro ao salvar no Google Sheets (acesso): {e}")
+        st.error(f"Erro ao conectar ao Google Sheets: {e}")
+        return None
+
+# Função para logar acessos no Google Sheets
+def log_acesso_google(nome_usuario, pagina, acao, **parametros):
+    # O evento vai para o destino configurado; o envio ocorre fora da página
+    obter_sink().emitir(Evento.criar("acesso", nome_usuario, pagina, acao, **parametros))
 
 # Função para logar interações no Google Sheets
-def log_interacao_google(nome, pagina, acao):
-    gc = conectar_planilha()
-    if not gc:
-        return
-    
-    agora = datetime.now()
-    timestamp_str = str(agora)
-    # 🕒 Calcula o tempo desde o último clique
+def log_interacao_google(nome, pagina, acao, **parametros):
+    """Registra uma interação; variações da ação (vídeo, unidade...) vão em ``parametros``."""
+    agora = time.monotonic()
+    # 🕒 Calcula o tempo desde o último clique (relógio monotônico: nunca negativo)
     ultimo_tempo = st.session_state.get('ultimo_clique_tempo')
-    tempo_desde_ultimo = None
-    tempo_segundos = "0"
+    permanencia = agora - ultimo_tempo if isinstance(ultimo_tempo, float) else 0.0  # Primeira ação
 
-    if ultimo_tempo:
-        diff = (agora - ultimo_tempo).total_seconds()
-        tempo_segundos = f"{diff:.1f}"
-    else:
-        tempo_segundos = "0"  # Primeira ação
-
-    # Atualiza o timestamp da última ação
+    # Atualiza o instante da última ação
     st.session_state.ultimo_clique_tempo = agora
 
-    try:
-        planilha = gc.open("Logs-gestao-custos")
-        worksheet = planilha.worksheet("Interações")  # Aba "Interações"
-
-        worksheet.append_row([
-            nome,
-            pagina,
-            acao,
-            timestamp_str,
-            tempo_segundos
-        ])
-    except Exception as e:
-        st.warning(f"Erro ao salvar no Google Sheets (interação): {e}")
+    obter_sink().emitir(Evento.criar("interacao", nome, pagina, acao,
+                                     permanencia=permanencia, **parametros))
 
-def safe_log_interacao(nome, pagina, acao):
+def safe_log_interacao(nome, pagina, acao, **parametros):
     try:
-        log_interacao_google(nome=nome, pagina=pagina, acao=acao)
+        log_interacao_google(nome, pagina, acao, **parametros)
     except Exception:
         # falha silenciosa no log para não interromper o app
         pass
@@ -119,51 +106,183 @@ def safe_log_interacao(nome, pagina, acao):
 def leitor_de_texto(texto, lang='pt-br'):
     """
     Converte texto em áudio e reproduz no navegador
+    O MP3 é servido pelo gerenciador de mídia do Streamlit (URL /media com
+    suporte a Range), sem base64 no HTML nem iframe a cada rerun.
+    Se o áudio ainda não existe, a síntese vai para segundo plano e a
+    página segue; textos longos são divididos em frases sintetizadas em
+    paralelo, e cada trecho toca assim que fica pronto.
     Parâmetros:
     - texto (str): Texto a ser convertido
     - lang (str): Idioma (padrão 'pt-br' para português brasileiro)
     """
     try:
-        # Cria o objeto de conversão texto-para-voz
-        tts = gtts.gTTS(texto, lang=lang)
-        
-        # Salva o áudio em um buffer de memória
-        audio_bytes = BytesIO()
-        tts.write_to_fp(audio_bytes)
-        audio_bytes.seek(0)
-        
-        # Converte para base64 para embed no HTML
-        audio_base64 = base64.b64encode(audio_bytes.read()).decode()
-        audio_html = f"""
-        <audio autoplay controls>
-        <source src="data:audio/mp3;base64,{audio_base64}" type="audio/mp3">
-        Seu navegador não suporta o elemento de áudio.
-        </audio>
-        """
-        
-        # Exibe o player de áudio
-        st.components.v1.html(audio_html, height=50)
+        cache = obter_cache_audio()
+        partes = cache.narracao_pronta(texto, lang)
+        if partes is not None:
+            for i, parte in enumerate(partes):
+                if i:
+                    st.caption(f"Parte {i + 1} de {len(partes)}")
+                st.audio(parte, format=tipo_audio(parte), autoplay=(i == 0))
+        else:
+            _player_em_preparo(cache.agendar_narracao(texto, lang))
         
     except Exception as e:
         st.error(f"Erro ao gerar áudio: {str(e)}")
 
 
+# Intervalo (s) entre as verificações do fragmento que espera o áudio
+ESPERA_AUDIO = 0.5
+
+
+@st.fragment(parallel=True)
+def _player_em_preparo(futuros):
+    """Mostra cada trecho de áudio assim que fica pronto.
+
+    Roda em paralelo com o resto da página e espera os trechos nesta
+    thread, sem reexecuções periódicas: termina quando o último trecho
+    fica pronto. O aviso é reescrito a cada ``ESPERA_AUDIO`` segundos,
+    o que permite ao Streamlit interromper a espera se a página mudar.
+    """
+    for i, futuro in enumerate(futuros):
+        parte = f" (parte {i + 1} de {len(futuros)})" if len(futuros) > 1 else ""
+        lugar = st.empty()
+        while not futuro.done():
+            lugar.caption(f"🎧 Preparando o áudio{parte}...")
+            wait([futuro], timeout=ESPERA_AUDIO)
+        if futuro.exception() is not None:
+            lugar.error(f"Erro ao gerar áudio: {futuro.exception()}")
+            return
+        with lugar.container():
+            if i:
+                st.caption(f"Parte {i + 1} de {len(futuros)}")
+            st.audio(futuro.result(), format=tipo_audio(futuro.result()), autoplay=(i == 0))
+
+
+def estado_quiz(*nomes):
+    """Quiz compilado dos bancos ``nomes`` e o estado do aluno nele (criado na primeira vez)."""
+    quiz = obter_banco().quiz(*nomes)
+    chave = f"quiz_{quiz.nome}"
+    if chave not in st.session_state or len(st.session_state[chave]) != len(quiz):
+        st.session_state[chave] = quiz.novo_estado()
+    return quiz, st.session_state[chave]
+
+def pergunta_quiz(quiz, estado, i, rotulo, key, **kwargs):
+    """Widget da questão i (radio ou número) que registra a resposta no estado do quiz.
+
+    Retorna o texto da opção escolhida (ou o número digitado), ou None.
+    """
+    questao = quiz.questoes[i]
+    if questao.numerica:
+        resposta = st.number_input(rotulo, value=None, key=key, **kwargs)
+        quiz.responder(estado, i, resposta)
+        return resposta
+    escolha = st.radio(rotulo, questao.opcoes, key=key, **{"index": estado.escolha(i), **kwargs})
+    quiz.responder(estado, i, questao.opcoes.index(escolha) if escolha is not None else None)
+    return escolha
+
+def mostrar_figura(nome, construir, entradas, **kwargs):
+    """Mostra a figura ``construir(**entradas)``, construída só uma vez por entradas.
+
+    A figura fica no cache compartilhado entre sessões (``graficos``);
+    ``construir`` deve depender apenas de ``entradas``. Os demais
+    argumentos vão para ``st.plotly_chart`` ou ``st.image``.
+    """
+    figura = obter_cache_figuras().obter(nome, construir, entradas)
+    if figura.tipo == PNG:
+        st.image(figura.dados, **{"width": "stretch", **kwargs})
+    else:
+        st.plotly_chart(figura.plotly(), **{"width": "stretch", **kwargs})
+
+def mostrar_diagrama(grafo, descricao="Diagrama"):
+    """Mostra um ``graphviz.Digraph`` como SVG estático, renderizado uma única vez.
+
+    O navegador guarda o SVG em cache pelo endereço, que muda junto com
+    a definição do diagrama. Sem o Graphviz no servidor, usa
+    ``st.graphviz_chart``.
+    """
+    diagramas = obter_diagramas()
+    nome = diagramas.svg(grafo)
+    if nome is None:
+        st.graphviz_chart(grafo)
+    else:
+        st.markdown(f"![{descricao}]({diagramas.url(nome)})")
+
+def expander_preguicoso(rotulo, chave, expanded=False, **kwargs):
+    """``st.expander`` cujo conteúdo só é gerado depois que o aluno o abre.
+
+    Retorna ``(expander, gerar)``; use ``with expander:`` e ``if gerar:``
+    em volta do conteúdo. Abrir ou fechar o expander reexecuta a página
+    (ou o fragmento em que ele está).
+    """
+    expander = st.expander(rotulo, expanded=expanded, key=chave, on_change="rerun", **kwargs)
+    return expander, _secao_gerada(chave, expander.open)
+
+def abas_preguicosas(rotulos, chave, **kwargs):
+    """``st.tabs`` em que só as abas já visitadas são geradas.
+
+    Retorna uma lista de ``(aba, gerar)``, na ordem de ``rotulos``.
+    """
+    abas = st.tabs(rotulos, key=chave, on_change="rerun", **kwargs)
+    return [(aba, _secao_gerada(f"{chave}/{i}", aba.open)) for i, aba in enumerate(abas)]
+
+def _secao_gerada(chave, aberta):
+    # Uma seção já aberta continua sendo gerada mesmo depois de fechada,
+    # para não perder o estado dos widgets que estão dentro dela
+    abertas = st.session_state.setdefault("secoes_abertas", set())
+    if aberta or aberta is None:
+        abertas.add(chave)
+    return chave in abertas
+
+# Últimas execuções medidas de cada bloco (página inteira ou fragmento)
+AMOSTRAS_TEMPO = 200
+_tempos = {}
+_tempos_lock = threading.Lock()
+
+def cronometrado(nome):
+    """Decorador que mede cada execução de uma página ou de um fragmento.
+
+    Em um fragmento, use por baixo de ``@st.fragment`` para medir só as
+    reexecuções parciais. Os tempos aparecem em ``situacao_tempos()``.
+    """
+    def decorador(funcao):
+        @wraps(funcao)
+        def medida(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                duracao = time.perf_counter() - inicio
+                with _tempos_lock:
+                    _tempos.setdefault(nome, deque(maxlen=AMOSTRAS_TEMPO)).append(duracao)
+        return medida
+    return decorador
+
+def situacao_tempos():
+    """Execuções recentes e tempos (ms) de cada bloco medido com ``cronometrado``."""
+    with _tempos_lock:
+        amostras = {nome: sorted(tempos) for nome, tempos in _tempos.items()}
+    return {
+        nome: {
+            "execucoes": len(tempos),
+            "medio_ms": round(sum(tempos) / len(tempos) * 1e3, 1),
+            "p50_ms": round(tempos[len(tempos) // 2] * 1e3, 1),
+            "p95_ms": round(tempos[min(len(tempos) - 1, int(len(tempos) * 0.95))] * 1e3, 1),
+            "max_ms": round(tempos[-1] * 1e3, 1),
+        }
+        for nome, tempos in amostras.items()
+    }
+
 def formatar_moeda(valor):
     """Formata valores como moeda brasileira"""
     return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
 
 def inicializar_log_interacoes():
-    """Cria o arquivo de log se não existir"""
-    if not os.path.exists("log_interacoes.csv"):
-        with open("log_interacoes.csv", "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["nome", "pagina", "acao", "timestamp"])
-
-def log_interacao(nome, pagina, acao):
-    """Registra uma interação no CSV"""
+    """Prepara o destino de log (o cabeçalho do CSV é criado pelo CsvSink)"""
+    obter_sink()
+
+def log_interacao(nome, pagina, acao, **parametros):
+    """Registra uma interação no destino de log configurado (ex.: CSV)"""
     try:
-        with open("log_interacoes.csv", "a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow([nome, pagina, acao, datetime.now()])
+        log_interacao_google(nome, pagina, acao, **parametros)
     except Exception as e:
         st.warning(f"Erro ao salvar interação: {e}")